@@ -0,0 +1,34 @@
+"""Add (user_id, account_id, reconciliation_date) index to account_reconciliations
+
+Revision ID: 74e4bf444ff1
+Revises: 3f4c9d9a9442
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "74e4bf444ff1"
+down_revision: str | Sequence[str] | None = "3f4c9d9a9442"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_account_reconciliations_user_account_date",
+        "account_reconciliations",
+        ["user_id", "account_id", "reconciliation_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_account_reconciliations_user_account_date", table_name="account_reconciliations"
+    )
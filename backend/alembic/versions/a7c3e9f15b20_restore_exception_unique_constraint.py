@@ -0,0 +1,53 @@
+"""Restore unique constraint on exceptions by transaction and date
+
+Revision ID: a7c3e9f15b20
+Revises: f3a9c2d47e61
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9f15b20"
+down_revision: str | Sequence[str] | None = "f3a9c2d47e61"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Expansion lets the last exception of an occurrence win; keep only that one.
+    # Run `python -m app.cli compact-exceptions` first to also drop unreachable ones.
+    op.execute("""
+        DELETE FROM scheduled_transaction_exceptions
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM scheduled_transaction_exceptions
+            GROUP BY scheduled_transaction_id, exception_date
+        )
+        """)
+    op.create_unique_constraint(
+        "uq_exception_transaction_date",
+        "scheduled_transaction_exceptions",
+        ["scheduled_transaction_id", "exception_date"],
+    )
+    # The constraint's index serves lookups by transaction alone
+    op.drop_index(
+        "ix_scheduled_transaction_exceptions_scheduled_transaction_id",
+        table_name="scheduled_transaction_exceptions",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        "ix_scheduled_transaction_exceptions_scheduled_transaction_id",
+        "scheduled_transaction_exceptions",
+        ["scheduled_transaction_id"],
+        unique=False,
+    )
+    op.drop_constraint(
+        "uq_exception_transaction_date", "scheduled_transaction_exceptions", type_="unique"
+    )
@@ -0,0 +1,173 @@
+"""Add daily_balance_rollups table
+
+Revision ID: b7d2e5a91c03
+Revises: 74e4bf444ff1
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from collections import defaultdict
+from collections.abc import Sequence
+from decimal import Decimal
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e5a91c03"
+down_revision: str | Sequence[str] | None = "74e4bf444ff1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 500
+
+# Account types (enum names, as stored) per rollup column
+LIQUID_TYPES = {"CHECKING", "SAVINGS", "CASH"}
+INVESTMENT_TYPES = {"INVESTMENT", "RETIREMENT"}
+CREDIT_TYPES = {"CREDIT_CARD", "LOAN"}
+
+
+def upgrade() -> None:
+    """Upgrade schema and build the rollup of every existing user."""
+    op.create_table(
+        "daily_balance_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("rollup_date", sa.Date(), nullable=False),
+        sa.Column(
+            "total",
+            sa.Numeric(precision=15, scale=2),
+            nullable=False,
+            comment="Sum of all balance accounts",
+        ),
+        sa.Column(
+            "liquid",
+            sa.Numeric(precision=15, scale=2),
+            nullable=False,
+            comment="Checking, savings and cash",
+        ),
+        sa.Column(
+            "investments",
+            sa.Numeric(precision=15, scale=2),
+            nullable=False,
+            comment="Investment and retirement",
+        ),
+        sa.Column(
+            "credit",
+            sa.Numeric(precision=15, scale=2),
+            nullable=False,
+            comment="Credit cards and loans",
+        ),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "rollup_date", name="uq_daily_balance_rollup_user_date"),
+    )
+    op.create_index(
+        op.f("ix_daily_balance_rollups_id"), "daily_balance_rollups", ["id"], unique=False
+    )
+
+    connection = op.get_bind()
+    last_id = 0
+    while True:
+        user_ids = (
+            connection.execute(
+                sa.text("SELECT id FROM users WHERE id > :last_id ORDER BY id LIMIT :batch_size"),
+                {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+            )
+            .scalars()
+            .all()
+        )
+        if not user_ids:
+            break
+        last_id = user_ids[-1]
+
+        rows = _rollup_rows(connection, list(user_ids))
+        if rows:
+            connection.execute(
+                sa.text(
+                    "INSERT INTO daily_balance_rollups"
+                    " (user_id, rollup_date, total, liquid, investments, credit)"
+                    " VALUES (:user_id, :rollup_date, :total, :liquid, :investments, :credit)"
+                ),
+                rows,
+            )
+
+
+def _rollup_rows(connection: sa.Connection, user_ids: list[int]) -> list[dict]:
+    """
+    Replay the initial balances and reconciliations of a batch of users.
+
+    The same replay as BalanceRollupService.refresh rebuilding everything:
+    active non-PLANNING accounts only, and on the same date an initial
+    balance applies before reconciliations, those in ID order.
+    """
+    accounts = connection.execute(
+        sa.text(
+            "SELECT id, user_id, type, initial_balance, initial_balance_date FROM accounts"
+            " WHERE user_id IN :user_ids AND is_active AND type != 'PLANNING'"
+        ).bindparams(sa.bindparam("user_ids", expanding=True)),
+        {"user_ids": user_ids},
+    ).fetchall()
+    account_types = {account.id: account.type for account in accounts}
+
+    # Each event is (date, order, account_id, balance), per user
+    events: dict[int, list[tuple]] = defaultdict(list)
+    for account in accounts:
+        events[account.user_id].append(
+            (account.initial_balance_date, 0, account.id, account.initial_balance)
+        )
+    reconciliations = connection.execute(
+        sa.text(
+            "SELECT id, user_id, account_id, reconciliation_date, actual_balance"
+            " FROM account_reconciliations WHERE user_id IN :user_ids"
+        ).bindparams(sa.bindparam("user_ids", expanding=True)),
+        {"user_ids": user_ids},
+    ).fetchall()
+    for recon in reconciliations:
+        if recon.account_id in account_types:
+            events[recon.user_id].append(
+                (recon.reconciliation_date, recon.id, recon.account_id, recon.actual_balance)
+            )
+
+    rows: list[dict] = []
+    for user_id, user_events in events.items():
+        user_events.sort(key=lambda x: (x[0], x[1]))
+        account_balance: dict[int, Decimal] = {}
+        totals = dict.fromkeys(("total", "liquid", "investments", "credit"), Decimal("0"))
+        for d, _, account_id, balance in user_events:
+            delta = balance - account_balance.get(account_id, Decimal("0"))
+            account_balance[account_id] = balance
+
+            account_type = account_types[account_id]
+            totals["total"] += delta
+            if account_type in LIQUID_TYPES:
+                totals["liquid"] += delta
+            elif account_type in INVESTMENT_TYPES:
+                totals["investments"] += delta
+            elif account_type in CREDIT_TYPES:
+                totals["credit"] += delta
+
+            # Carried-forward totals: the last change of a date wins
+            if not rows or rows[-1]["user_id"] != user_id or rows[-1]["rollup_date"] != d:
+                rows.append({"user_id": user_id, "rollup_date": d})
+            rows[-1].update(totals)
+    return rows
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_daily_balance_rollups_id"), table_name="daily_balance_rollups")
+    op.drop_table("daily_balance_rollups")
@@ -0,0 +1,80 @@
+"""Add next_occurrence_date to scheduled_transactions
+
+Revision ID: b8d4f2a61c39
+Revises: a7c3e9f15b20
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+from datetime import date
+
+import sqlalchemy as sa
+
+from alembic import op
+from app.services.recurrence_service import RecurrenceService
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d4f2a61c39"
+down_revision: str | Sequence[str] | None = "a7c3e9f15b20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema and compute the next occurrence of every existing rule."""
+    op.add_column(
+        "scheduled_transactions",
+        sa.Column("next_occurrence_date", sa.Date(), nullable=True),
+    )
+    op.create_index(
+        "ix_scheduled_transactions_user_next_occurrence",
+        "scheduled_transactions",
+        ["user_id", "next_occurrence_date"],
+        unique=False,
+    )
+
+    # The rows carry every column the occurrence calculation reads
+    connection = op.get_bind()
+    today = date.today()
+    last_id = 0
+    while True:
+        rules = connection.execute(
+            sa.text("""
+            SELECT id, is_recurring, recurrence_frequency, recurrence_day_of_month,
+                recurrence_month_of_year, recurrence_start_date, recurrence_end_date
+            FROM scheduled_transactions
+            WHERE id > :last_id
+            ORDER BY id
+            LIMIT :batch_size
+        """),
+            {"last_id": last_id, "batch_size": BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not rules:
+            break
+        last_id = rules[-1].id
+
+        # Rules with no occurrences left stay NULL
+        updates = [
+            {"id": rule.id, "next_date": next_date}
+            for rule in rules
+            if (next_date := RecurrenceService.first_occurrence(rule, today)) is not None
+        ]
+        if updates:
+            connection.execute(
+                sa.text(
+                    "UPDATE scheduled_transactions SET next_occurrence_date = :next_date"
+                    " WHERE id = :id"
+                ),
+                updates,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_scheduled_transactions_user_next_occurrence", table_name="scheduled_transactions"
+    )
+    op.drop_column("scheduled_transactions", "next_occurrence_date")
@@ -0,0 +1,38 @@
+"""Add data_version to users
+
+Revision ID: c4a8f1d26e57
+Revises: b7d2e5a91c03
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a8f1d26e57"
+down_revision: str | Sequence[str] | None = "b7d2e5a91c03"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column(
+            "data_version",
+            sa.Integer(),
+            server_default="0",
+            nullable=False,
+            comment="Bumped on every write to the user's data (drives ETags)",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "data_version")
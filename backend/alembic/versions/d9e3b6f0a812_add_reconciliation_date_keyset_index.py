@@ -0,0 +1,32 @@
+"""Add keyset index on reconciliations by date
+
+Revision ID: d9e3b6f0a812
+Revises: c4a8f1d26e57
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9e3b6f0a812"
+down_revision: str | Sequence[str] | None = "c4a8f1d26e57"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_account_reconciliations_user_date_id",
+        "account_reconciliations",
+        ["user_id", "reconciliation_date", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_account_reconciliations_user_date_id", table_name="account_reconciliations")
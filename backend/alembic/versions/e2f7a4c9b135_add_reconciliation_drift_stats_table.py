@@ -0,0 +1,105 @@
+"""Add reconciliation_drift_stats table
+
+Revision ID: e2f7a4c9b135
+Revises: d9e3b6f0a812
+Create Date: 2026-10-19 16:00:00.000000
+
+PostgreSQL only: the backfill groups by date_trunc('month', ...)::date.
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2f7a4c9b135"
+down_revision: str | Sequence[str] | None = "d9e3b6f0a812"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "reconciliation_drift_stats",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("account_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False, comment="First day of the month"),
+        sa.Column("count", sa.Integer(), nullable=False, comment="Number of reconciliations"),
+        sa.Column(
+            "total",
+            sa.Numeric(precision=20, scale=2),
+            nullable=False,
+            comment="Sum of differences",
+        ),
+        sa.Column(
+            "total_squares",
+            sa.Numeric(precision=34, scale=4),
+            nullable=False,
+            comment="Sum of squared differences",
+        ),
+        sa.Column("min_difference", sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column("max_difference", sa.Numeric(precision=15, scale=2), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["account_id"], ["accounts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id", "account_id", "month", name="uq_reconciliation_drift_stat_account_month"
+        ),
+    )
+    op.create_index(
+        op.f("ix_reconciliation_drift_stats_id"),
+        "reconciliation_drift_stats",
+        ["id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_reconciliation_drift_stats_account_id"),
+        "reconciliation_drift_stats",
+        ["account_id"],
+        unique=False,
+    )
+
+    # Backfill from the existing reconciliations (PostgreSQL syntax, like the rest of the chain)
+    op.execute("""
+        INSERT INTO reconciliation_drift_stats (
+            user_id, account_id, month, count, total, total_squares,
+            min_difference, max_difference
+        )
+        SELECT
+            user_id,
+            account_id,
+            date_trunc('month', reconciliation_date)::date,
+            count(*),
+            sum(difference),
+            sum(difference * difference),
+            min(difference),
+            max(difference)
+        FROM account_reconciliations
+        GROUP BY user_id, account_id, date_trunc('month', reconciliation_date)
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_reconciliation_drift_stats_account_id"), table_name="reconciliation_drift_stats"
+    )
+    op.drop_index(op.f("ix_reconciliation_drift_stats_id"), table_name="reconciliation_drift_stats")
+    op.drop_table("reconciliation_drift_stats")
@@ -0,0 +1,35 @@
+"""Add index on exceptions by account and date
+
+Revision ID: f3a9c2d47e61
+Revises: e2f7a4c9b135
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9c2d47e61"
+down_revision: str | Sequence[str] | None = "e2f7a4c9b135"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_scheduled_transaction_exceptions_account_date",
+        "scheduled_transaction_exceptions",
+        ["account_id", "exception_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_scheduled_transaction_exceptions_account_date",
+        table_name="scheduled_transaction_exceptions",
+    )
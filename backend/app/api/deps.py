@@ -1,6 +1,9 @@
 """API dependencies for authentication and database sessions."""
 
-from fastapi import Depends, HTTPException, Request, status
+import hashlib
+from datetime import date
+
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -134,3 +137,46 @@ async def get_current_active_user(
             detail="Inactive user",
         )
     return current_user
+
+
+async def check_not_modified(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user),
+) -> None:
+    """Dependency answering conditional GETs from the user's data version.
+
+    The weak ETag covers the user, their data version, today's date (instance
+    statuses and forecasts depend on it) and the request path and query, so
+    it changes whenever the response could. Runs before the endpoint, so a
+    matching If-None-Match costs only the user lookup.
+
+    Args:
+        request: The incoming HTTP request
+        response: The outgoing response (receives the ETag header)
+        current_user: The authenticated and active user
+
+    Raises:
+        HTTPException: 304 if the client's ETag is still current
+    """
+    fingerprint = "|".join(
+        [
+            str(current_user.id),
+            date.today().isoformat(),
+            request.url.path,
+            "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items())),
+        ]
+    )
+    digest = hashlib.sha256(fingerprint.encode()).hexdigest()[:16]
+    etag = f'W/"{current_user.data_version}-{digest}"'
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    # If-None-Match uses weak comparison: the W/ prefix is ignored
+    client_tags = {
+        tag.strip().removeprefix("W/")
+        for tag in request.headers.get("If-None-Match", "").split(",")
+    }
+    if etag.removeprefix("W/") in client_tags or "*" in client_tags:
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
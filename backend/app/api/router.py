@@ -5,6 +5,8 @@ from app.api.routes import (
     auth,
     categories,
     dashboard,
+    events,
+    export,
     financial_institutions,
     forecast,
     reconciliation,
@@ -57,6 +59,12 @@ api_router.include_router(
     tags=["Financial Institutions"],
 )
 
+# Include change event routes
+api_router.include_router(events.router, prefix="/events", tags=["Events"])
+
+# Include export routes
+api_router.include_router(export.router, prefix="/export", tags=["Export"])
+
 # Include test routes in debug mode
 if settings.DEBUG:
     from app.api.routes import test
@@ -1,14 +1,13 @@
 """Account routes for CRUD operations."""
 
 import logging
-from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
-from app.models.account import Account, AccountType
+from app.api.deps import check_not_modified, get_current_active_user, get_db
+from app.models.account import Account
 from app.models.user import User
 from app.schemas.account import (
     AccountCreate,
@@ -16,12 +15,15 @@ from app.schemas.account import (
     AccountSummary,
     AccountUpdate,
 )
+from app.services.account_summary_service import AccountSummaryService
+from app.services.balance_rollup_service import BalanceRollupService
+from app.services.data_version_service import DataVersionService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-@router.get("/", response_model=list[AccountResponse])
+@router.get("/", response_model=list[AccountResponse], dependencies=[Depends(check_not_modified)])
 async def list_accounts(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
@@ -77,6 +79,11 @@ async def create_account(
     )
 
     db.add(account)
+    await db.flush()
+    await BalanceRollupService.refresh(current_user.id, db, from_date=account.initial_balance_date)
+    await DataVersionService.bump(
+        current_user.id, db, account_ids=[account.id], from_date=account.initial_balance_date
+    )
     await db.commit()
     await db.refresh(account)
 
@@ -167,11 +174,26 @@ async def update_account(
             detail="Not authorized to update this account",
         )
 
+    previous_balance_date = account.initial_balance_date
+
     # Update only provided fields
     update_data = account_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(account, field, value)
 
+    await db.flush()
+
+    # Keep the balance rollup in step with whatever affects balance history
+    changed_from = None
+    if update_data.keys() & {"type", "is_active"}:
+        await BalanceRollupService.refresh(current_user.id, db)
+    elif update_data.keys() & {"initial_balance", "initial_balance_date"}:
+        changed_from = min(previous_balance_date, account.initial_balance_date)
+        await BalanceRollupService.refresh(current_user.id, db, from_date=changed_from)
+
+    await DataVersionService.bump(
+        current_user.id, db, account_ids=[account.id], from_date=changed_from
+    )
     await db.commit()
     await db.refresh(account)
 
@@ -216,6 +238,9 @@ async def delete_account(
         )
 
     account.is_active = False
+    await db.flush()
+    await BalanceRollupService.refresh(current_user.id, db)
+    await DataVersionService.bump(current_user.id, db, account_ids=[account.id])
     await db.commit()
 
     logger.info(
@@ -239,39 +264,12 @@ async def get_account_summary(
     Returns:
         Account summary with totals
     """
-    result = await db.execute(
-        select(Account).where(
-            Account.user_id == current_user.id,
-            Account.is_active == True,  # noqa: E712
-        )
-    )
-    accounts = result.scalars().all()
-
-    # Calculate totals by category
-    liquid_assets = Decimal("0")
-    investments = Decimal("0")
-    credit_used = Decimal("0")
-    loans_receivable = Decimal("0")
-
-    for account in accounts:
-        balance = account.initial_balance
-
-        if account.type in (AccountType.CHECKING, AccountType.SAVINGS, AccountType.CASH):
-            liquid_assets += balance
-        elif account.type in (AccountType.INVESTMENT, AccountType.RETIREMENT):
-            investments += balance
-        elif account.type in (AccountType.CREDIT_CARD, AccountType.LOAN):
-            # Credit accounts have negative balances
-            credit_used += abs(balance)
-        elif account.type == AccountType.LOAN_GIVEN:
-            loans_receivable += balance
-
-    net_worth = liquid_assets + investments + loans_receivable - credit_used
+    summary = await AccountSummaryService.get_summary(current_user.id, db)
 
     return AccountSummary(
-        liquid_assets=liquid_assets,
-        investments=investments,
-        credit_used=credit_used,
-        loans_receivable=loans_receivable,
-        net_worth=net_worth,
+        liquid_assets=summary.liquid_assets,
+        investments=summary.investments,
+        credit_used=summary.credit_used,
+        loans_receivable=summary.loans_receivable,
+        net_worth=summary.net_worth,
     )
@@ -26,6 +26,7 @@ from app.schemas.auth import (
     TokenRefreshResponse,
 )
 from app.schemas.user import PasswordChange, ProfileUpdate, UserResponse
+from app.services.data_version_service import DataVersionService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -339,6 +340,7 @@ async def update_profile(
         current_user.currency = profile_data.currency
 
     current_user.updated_at = datetime.utcnow()
+    await DataVersionService.bump(current_user.id, db)
     await db.commit()
     await db.refresh(current_user)
 
@@ -6,16 +6,17 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import check_not_modified, get_current_active_user, get_db
 from app.models.category import Category
 from app.models.user import User
 from app.schemas.category import CategoryCreate, CategoryResponse, CategoryUpdate
+from app.services.data_version_service import DataVersionService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-@router.get("/", response_model=list[CategoryResponse])
+@router.get("/", response_model=list[CategoryResponse], dependencies=[Depends(check_not_modified)])
 async def list_categories(
     type: str | None = None,
     db: AsyncSession = Depends(get_db),
@@ -91,6 +92,7 @@ async def create_category(
     )
 
     db.add(category)
+    await DataVersionService.bump(current_user.id, db)
     await db.commit()
     await db.refresh(category)
 
@@ -195,6 +197,7 @@ async def update_category(
     for field, value in update_data.items():
         setattr(category, field, value)
 
+    await DataVersionService.bump(current_user.id, db)
     await db.commit()
     await db.refresh(category)
 
@@ -247,6 +250,7 @@ async def delete_category(
         )
 
     await db.delete(category)
+    await DataVersionService.bump(current_user.id, db)
     await db.commit()
 
     logger.info(
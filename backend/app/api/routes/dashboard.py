@@ -3,10 +3,11 @@
 import logging
 from datetime import date
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import check_not_modified, get_current_active_user, get_db
+from app.core.config import settings
 from app.models.user import User
 from app.schemas.dashboard import (
     BalanceTrendPointResponse,
@@ -14,14 +15,16 @@ from app.schemas.dashboard import (
     FinancialSummaryResponse,
     UpcomingTransactionResponse,
 )
-from app.services.dashboard_service import DashboardService
+from app.services.dashboard_service import DashboardCache, DashboardService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-@router.get("/", response_model=DashboardResponse)
+@router.get("/", response_model=DashboardResponse, dependencies=[Depends(check_not_modified)])
 async def get_dashboard(
+    response: Response,
+    history_days: int = Query(60, ge=1, le=1825, description="Days of balance history"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> DashboardResponse:
@@ -31,14 +34,34 @@ async def get_dashboard(
     Returns comprehensive financial overview including:
     - Financial summary (liquid assets, investments, credit, net worth)
     - Upcoming transactions (next 30 days)
-    - Balance trend (next 30 days)
+    - Balance trend (history_days back, next 30 days)
     - Quick stats (account count, scheduled transaction count)
     """
-    # Get dashboard data
-    dashboard = await DashboardService.get_dashboard(
-        user_id=current_user.id,
-        db=db,
-    )
+    if settings.DASHBOARD_STALE_WHILE_REVALIDATE:
+        # Serve the last computed dashboard; a stale one is recomputed in the background
+        cached, is_stale = await DashboardCache.get(
+            user_id=current_user.id,
+            data_version=current_user.data_version,
+            db=db,
+            history_days=history_days,
+        )
+        dashboard = cached.data
+        data_version = cached.data_version
+        today_date = cached.today
+
+        if is_stale:
+            # The ETag describes the current version, not this payload
+            del response.headers["ETag"]
+    else:
+        # Get dashboard data
+        dashboard = await DashboardService.get_dashboard(
+            user_id=current_user.id,
+            db=db,
+            history_days=history_days,
+        )
+        data_version = current_user.data_version
+        today_date = date.today()
+        is_stale = False
 
     # Convert to response format
     financial_summary = FinancialSummaryResponse(
@@ -90,6 +113,7 @@ async def get_dashboard(
             "account_count": dashboard.financial_summary.account_count,
             "upcoming_tx_count": len(upcoming_transactions),
             "trend_points": len(balance_trend),
+            "is_stale": is_stale,
         },
     )
 
@@ -100,6 +124,8 @@ async def get_dashboard(
         liquid_trend=liquid_trend,
         investments_trend=investments_trend,
         credit_trend=credit_trend,
-        today_date=date.today(),
+        today_date=today_date,
         scheduled_transaction_count=dashboard.scheduled_transaction_count,
+        data_version=data_version,
+        is_stale=is_stale,
     )
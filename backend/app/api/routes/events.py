@@ -0,0 +1,91 @@
+"""Event routes for pushing data changes to clients."""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_active_user, get_db
+from app.core.config import settings
+from app.models.user import User
+from app.services.change_event_service import ChangeEvent, ChangeEventService
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+async def change_event_stream(
+    queue: asyncio.Queue[ChangeEvent],
+    data_version: int,
+    subscription: AsyncExitStack,
+    heartbeat_seconds: float,
+) -> AsyncGenerator[str, None]:
+    """
+    Yield SSE messages: the current data version, then each change.
+
+    Args:
+        queue: Subscription queue of the user's change events
+        data_version: The user's data version when the subscription opened
+        subscription: Closes the subscription when the stream ends
+        heartbeat_seconds: Idle time after which a keep-alive comment is sent
+
+    Yields:
+        Server-Sent Events messages
+    """
+    async with subscription:
+        # Clients compare this with the version they last saw to catch up
+        yield (
+            f"id: {data_version}\nevent: version\n"
+            f"data: {json.dumps({'data_version': data_version})}\n\n"
+        )
+        while True:
+            try:
+                change = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if change.data_version > data_version:
+                data_version = change.data_version
+                yield change.to_sse()
+
+
+@router.get("/stream")
+async def stream_changes(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """
+    Stream change events for the current user (Server-Sent Events).
+
+    The first message (`event: version`) carries the current data version.
+    Each committed write then sends an `event: change` message with the new
+    data version and, where known, the affected account IDs and date range
+    (null means unknown / unbounded), so clients refetch only what changed
+    instead of polling.
+    """
+    subscription = AsyncExitStack()
+    queue = await subscription.enter_async_context(
+        ChangeEventService.broker.subscribe(current_user.id)
+    )
+
+    # Read the version after subscribing, so no change falls in between
+    result = await db.execute(select(User.data_version).where(User.id == current_user.id))
+    data_version = result.scalar_one()
+    # End the transaction now: the stream must not hold a pooled connection
+    await db.commit()
+
+    logger.info("Change event stream opened", extra={"user_id": current_user.id})
+
+    return StreamingResponse(
+        change_event_stream(
+            queue, data_version, subscription, settings.CHANGE_EVENTS_HEARTBEAT_SECONDS
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
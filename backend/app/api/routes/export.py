@@ -0,0 +1,95 @@
+"""Export routes for downloading a user's data."""
+
+import logging
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_active_user, get_db
+from app.core.config import settings
+from app.models.user import User
+from app.services.export_service import (
+    EXPORT_SCHEMAS,
+    ExportEntity,
+    ExportFormat,
+    ExportService,
+)
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {ExportFormat.CSV: "text/csv", ExportFormat.JSONL: "application/x-ndjson"}
+
+
+@router.get("/{entity}")
+async def export_data(
+    entity: ExportEntity,
+    export_format: ExportFormat = Query(
+        ExportFormat.CSV, alias="format", description="csv or jsonl"
+    ),
+    compress: bool = Query(False, description="Deliver the file inside a ZIP archive"),
+    from_date: date | None = Query(
+        None,
+        description="Earliest date (required for instances; filters exceptions, reconciliations)",
+    ),
+    to_date: date | None = Query(
+        None,
+        description="Latest date (required for instances; filters exceptions, reconciliations)",
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """
+    Download all of the user's rows of one kind as CSV or JSON Lines.
+
+    The response is streamed while the rows are read, so exports of any
+    size use constant memory. `instances` expands the scheduled
+    transactions over from_date..to_date, applying exceptions.
+    """
+    if from_date is not None and to_date is not None and to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="to_date must be on or after from_date",
+        )
+    if entity == ExportEntity.INSTANCES:
+        if from_date is None or to_date is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="from_date and to_date are required for instances",
+            )
+        max_days = settings.EXPORT_INSTANCES_MAX_DAYS
+        if (to_date - from_date).days > max_days:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Date range too large (max {max_days} days)",
+            )
+
+    filename = f"{entity.value}.{export_format.value}"
+    chunks = ExportService.encode(
+        ExportService.stream_rows(entity, current_user.id, db, from_date, to_date),
+        EXPORT_SCHEMAS[entity],
+        export_format,
+    )
+    media_type = MEDIA_TYPES[export_format]
+    if compress:
+        chunks = ExportService.zip_stream(chunks, filename)
+        filename += ".zip"
+        media_type = "application/zip"
+
+    logger.info(
+        "Data export started",
+        extra={
+            "user_id": current_user.id,
+            "entity": entity.value,
+            "format": export_format.value,
+            "compress": compress,
+        },
+    )
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
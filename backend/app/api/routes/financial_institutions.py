@@ -15,6 +15,7 @@ from app.schemas.financial_institution import (
     FinancialInstitutionResponse,
     FinancialInstitutionUpdate,
 )
+from app.services.data_version_service import DataVersionService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -71,6 +72,7 @@ async def create_financial_institution(
 
     try:
         db.add(institution)
+        await DataVersionService.bump(current_user.id, db)
         await db.commit()
         await db.refresh(institution)
     except IntegrityError as err:
@@ -177,6 +179,7 @@ async def update_financial_institution(
         setattr(institution, field, value)
 
     try:
+        await DataVersionService.bump(current_user.id, db)
         await db.commit()
         await db.refresh(institution)
     except IntegrityError as err:
@@ -232,6 +235,7 @@ async def delete_financial_institution(
         )
 
     await db.delete(institution)
+    await DataVersionService.bump(current_user.id, db)
     await db.commit()
 
     logger.info(
@@ -6,7 +6,7 @@ from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import check_not_modified, get_current_active_user, get_db
 from app.models.user import User
 from app.schemas.forecast import (
     AccountForecastResponse,
@@ -19,7 +19,7 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-@router.get("/", response_model=ForecastResponse)
+@router.get("/", response_model=ForecastResponse, dependencies=[Depends(check_not_modified)])
 async def get_forecast(
     from_date: date = Query(..., description="Start date of forecast"),
     to_date: date = Query(..., description="End date of forecast"),
@@ -1,8 +1,12 @@
 """Reconciliation routes for account balance reconciliation."""
 
+import csv
+import io
 import logging
+from datetime import date
+from decimal import Decimal, InvalidOperation
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,15 +14,32 @@ from app.api.deps import get_current_active_user, get_db
 from app.models.account import Account
 from app.models.user import User
 from app.schemas.reconciliation import (
+    MAX_BULK_RECONCILIATIONS,
+    ReconciliationBulkCreate,
+    ReconciliationBulkResponse,
+    ReconciliationBulkRowResult,
     ReconciliationCreate,
+    ReconciliationDriftResponse,
     ReconciliationResponse,
     ReconciliationSummary,
 )
+from app.services.reconciliation_drift_service import ReconciliationDriftService
 from app.services.reconciliation_service import ReconciliationService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Bulk creates answer 422 (with the per-row results) when every row failed
+BULK_REJECTED_RESPONSES = {
+    status.HTTP_422_UNPROCESSABLE_ENTITY: {
+        "model": ReconciliationBulkResponse,
+        "description": "No row was created; see the per-row errors",
+    },
+}
+
+# Page size when a cursor is passed without a limit
+DEFAULT_PAGE_SIZE = 100
+
 
 @router.post("/", response_model=ReconciliationResponse, status_code=status.HTTP_201_CREATED)
 async def create_reconciliation(
@@ -61,39 +82,264 @@ async def create_reconciliation(
         ) from None
 
 
+@router.post(
+    "/bulk",
+    response_model=ReconciliationBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses=BULK_REJECTED_RESPONSES,
+)
+async def create_reconciliations_bulk(
+    bulk_data: ReconciliationBulkCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> ReconciliationBulkResponse:
+    """
+    Create several reconciliations in one request (e.g. a month-end close).
+
+    Rows are processed in order and committed together; rows with an
+    invalid account are reported in the results and skipped. If no row is
+    created, the response is 422 with the same per-row results.
+    """
+    rows = list(enumerate(bulk_data.items, start=1))
+    return await _create_bulk(rows, current_user, db, response)
+
+
+@router.post(
+    "/bulk/csv",
+    response_model=ReconciliationBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses=BULK_REJECTED_RESPONSES,
+)
+async def import_reconciliations_csv(
+    response: Response,
+    file: UploadFile = File(..., description="CSV with columns account, date, balance[, note]"),
+    create_adjustment: bool = Query(True, description="Create adjustments for differences"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> ReconciliationBulkResponse:
+    """
+    Import reconciliations from a statement CSV.
+
+    Columns: `account` (account ID or name), `date` (YYYY-MM-DD), `balance`,
+    and optionally `note`. Rows that fail to parse are reported by line
+    number alongside the created ones. If no row is created, the response
+    is 422 with the same per-row results.
+    """
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV file must be UTF-8 encoded",
+        ) from None
+
+    result = await db.execute(
+        select(Account).where(Account.user_id == current_user.id, Account.is_active)
+    )
+    accounts_by_name: dict[str, list[int]] = {}
+    for account in result.scalars().all():
+        accounts_by_name.setdefault(account.name.strip().lower(), []).append(account.id)
+
+    rows = _parse_reconciliation_csv(text, accounts_by_name, create_adjustment)
+    return await _create_bulk(rows, current_user, db, response)
+
+
+async def _create_bulk(
+    rows: list[tuple[int, ReconciliationCreate | str]],
+    current_user: User,
+    db: AsyncSession,
+    response: Response,
+) -> ReconciliationBulkResponse:
+    """
+    Create the parsed rows and merge their results with the rows that failed to parse.
+
+    Sets a 422 status when no row was created, so a fully rejected batch is
+    recognisable without reading the per-row errors.
+    """
+    items = [(row, item) for row, item in rows if isinstance(item, ReconciliationCreate)]
+    created = await ReconciliationService.create_reconciliations(
+        current_user.id, [item for _, item in items], db
+    )
+    created_by_row = {row: result for (row, _), result in zip(items, created, strict=True)}
+
+    results = []
+    for row, item in rows:
+        if row not in created_by_row:
+            results.append(ReconciliationBulkRowResult(row=row, error=item))
+            continue
+
+        outcome = created_by_row[row]
+        results.append(
+            ReconciliationBulkRowResult(
+                row=row,
+                account_id=outcome.account_id,
+                reconciliation=(
+                    ReconciliationResponse.model_validate(outcome.reconciliation)
+                    if outcome.reconciliation
+                    else None
+                ),
+                error=outcome.error,
+            )
+        )
+
+    created_count = sum(1 for r in results if r.reconciliation is not None)
+    logger.info(
+        "Reconciliations created in bulk",
+        extra={
+            "user_id": current_user.id,
+            "created_count": created_count,
+            "error_count": len(results) - created_count,
+        },
+    )
+
+    if created_count == 0:
+        response.status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    return ReconciliationBulkResponse(
+        created_count=created_count,
+        error_count=len(results) - created_count,
+        results=results,
+    )
+
+
+def _parse_reconciliation_csv(
+    text: str,
+    accounts_by_name: dict[str, list[int]],
+    create_adjustment: bool,
+) -> list[tuple[int, ReconciliationCreate | str]]:
+    """
+    Parse statement CSV rows.
+
+    Args:
+        text: CSV content with a header row
+        accounts_by_name: The user's account IDs keyed by lowercased name
+        create_adjustment: Whether created rows get adjustments
+
+    Returns:
+        (line number, parsed row or error message) per data row
+
+    Raises:
+        HTTPException: If required columns are missing or there are too many rows
+    """
+    reader = csv.DictReader(io.StringIO(text))
+    columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+    missing = [name for name in ("account", "date", "balance") if name not in columns]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"CSV is missing required columns: {', '.join(missing)}",
+        )
+
+    rows: list[tuple[int, ReconciliationCreate | str]] = []
+    for record in reader:
+        if len(rows) >= MAX_BULK_RECONCILIATIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Too many rows (max {MAX_BULK_RECONCILIATIONS})",
+            )
+
+        fields = {key: (record.get(name) or "").strip() for key, name in columns.items()}
+        account = fields["account"]
+        if not account and not fields["date"] and not fields["balance"]:
+            continue  # Blank line
+
+        line = reader.line_num
+        if account.isdigit():
+            account_id = int(account)
+        else:
+            matches = accounts_by_name.get(account.lower(), [])
+            if len(matches) != 1:
+                problem = "is ambiguous" if matches else "not found"
+                rows.append((line, f"Account '{account}' {problem}"))
+                continue
+            account_id = matches[0]
+
+        try:
+            reconciliation_date = date.fromisoformat(fields["date"])
+        except ValueError:
+            rows.append((line, f"Invalid date '{fields['date']}' (use YYYY-MM-DD)"))
+            continue
+
+        try:
+            actual_balance = Decimal(fields["balance"].replace(",", ""))
+        except InvalidOperation:
+            actual_balance = None
+        if actual_balance is None or not actual_balance.is_finite():
+            rows.append((line, f"Invalid balance '{fields['balance']}'"))
+            continue
+
+        rows.append(
+            (
+                line,
+                ReconciliationCreate(
+                    account_id=account_id,
+                    reconciliation_date=reconciliation_date,
+                    actual_balance=actual_balance,
+                    note=fields.get("note", "")[:500] or None,
+                    create_adjustment=create_adjustment,
+                ),
+            )
+        )
+
+    return rows
+
+
 @router.get("/", response_model=list[ReconciliationSummary])
 async def list_reconciliations(
+    response: Response,
     account_id: int | None = Query(None, description="Filter by account ID"),
+    from_date: date | None = Query(None, description="Only reconciliations on or after"),
+    to_date: date | None = Query(None, description="Only reconciliations on or before"),
+    has_adjustment: bool | None = Query(None, description="Filter by whether adjusted"),
+    cursor: str | None = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int | None = Query(
+        None, ge=1, le=500, description="Maximum rows per page (unpaginated if omitted)"
+    ),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ) -> list[ReconciliationSummary]:
     """
-    List reconciliations for the current user.
+    List reconciliations for the current user, newest first.
 
-    Optionally filter by account ID.
+    Optionally filter by account, date range and whether an adjustment was
+    created. Pagination is opt-in: with `limit` or `cursor` set, at most
+    `limit` rows (default 100) are returned, and when more rows exist the
+    `X-Next-Cursor` response header holds the cursor for the next page.
+    Without either, every matching row is returned.
     """
-    reconciliations = await ReconciliationService.get_reconciliations(
-        user_id=current_user.id,
-        account_id=account_id,
-        db=db,
-    )
+    if cursor is not None and limit is None:
+        limit = DEFAULT_PAGE_SIZE
 
-    # Get account names for summary
-    account_ids = {r.account_id for r in reconciliations}
-    account_result = await db.execute(select(Account).where(Account.id.in_(account_ids)))
-    accounts = {acc.id: acc for acc in account_result.scalars().all()}
+    try:
+        page = await ReconciliationService.list_reconciliations(
+            user_id=current_user.id,
+            db=db,
+            account_id=account_id,
+            from_date=from_date,
+            to_date=to_date,
+            has_adjustment=has_adjustment,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from None
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
 
     # Build summaries
-    summaries = []
-    for reconciliation in reconciliations:
-        account = accounts.get(reconciliation.account_id)
-        summaries.append(
-            ReconciliationSummary(
-                reconciliation=ReconciliationResponse.model_validate(reconciliation),
-                account_name=account.name if account else "Unknown",
-                has_adjustment=reconciliation.adjustment_transaction_id is not None,
-            )
+    summaries = [
+        ReconciliationSummary(
+            reconciliation=ReconciliationResponse.model_validate(reconciliation),
+            account_name=account_name,
+            has_adjustment=reconciliation.adjustment_transaction_id is not None,
         )
+        for reconciliation, account_name in page.items
+    ]
 
     logger.info(
         "Reconciliations listed",
@@ -106,6 +352,34 @@ async def list_reconciliations(
     return summaries
 
 
+@router.get("/analytics/drift", response_model=list[ReconciliationDriftResponse])
+async def get_reconciliation_drift(
+    account_id: int | None = Query(None, description="Filter by account ID"),
+    from_date: date | None = Query(None, description="Only months on or after this date's"),
+    to_date: date | None = Query(None, description="Only months on or before this date's"),
+    worst_months: int = Query(3, ge=0, le=24, description="Worst months to list per account"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> list[ReconciliationDriftResponse]:
+    """
+    Get how far each account's plan drifts from reality.
+
+    Per account: mean, standard deviation, min and max of the reconciliation
+    differences, the monthly trend, and the months with the largest
+    differences.
+    """
+    drift = await ReconciliationDriftService.get_drift(
+        user_id=current_user.id,
+        db=db,
+        account_id=account_id,
+        from_date=from_date,
+        to_date=to_date,
+        worst_month_count=worst_months,
+    )
+
+    return [ReconciliationDriftResponse.model_validate(d) for d in drift]
+
+
 @router.get("/{reconciliation_id}", response_model=ReconciliationResponse)
 async def get_reconciliation(
     reconciliation_id: int,
@@ -1,23 +1,37 @@
 """Scheduled transaction routes for CRUD operations."""
 
+import io
 import logging
-from datetime import date, timedelta
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
 from enum import Enum
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import check_not_modified, get_current_active_user, get_db
+from app.core.config import settings
 from app.models.scheduled_transaction import ScheduledTransaction, ScheduledTransactionException
 from app.models.user import User
 from app.schemas.scheduled_transaction import (
+    ScheduledTransactionBatchRequest,
+    ScheduledTransactionBatchResponse,
+    ScheduledTransactionBatchResult,
     ScheduledTransactionCreate,
     ScheduledTransactionInstance,
     ScheduledTransactionResponse,
     ScheduledTransactionUpdate,
+    TransactionImportResponse,
 )
+from app.services.data_version_service import DataVersionService
+from app.services.import_parsers import detect_format, read_text
+from app.services.next_occurrence_service import NextOccurrenceService
+from app.services.pending_confirmation_service import PendingConfirmationService
 from app.services.recurrence_service import RecurrenceService
+from app.services.scheduled_transaction_batch_service import ScheduledTransactionBatchService
+from app.services.transaction_import_service import TransactionImportService
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -139,6 +153,13 @@ async def create_scheduled_transaction(
     )
 
     db.add(transaction)
+    await DataVersionService.bump(
+        current_user.id,
+        db,
+        account_ids=[transaction.account_id, transaction.to_account_id],
+        from_date=transaction.recurrence_start_date,
+        to_date=transaction.recurrence_end_date,
+    )
     await db.commit()
     await db.refresh(transaction)
 
@@ -154,7 +175,133 @@ async def create_scheduled_transaction(
     return transaction
 
 
-@router.get("/instances", response_model=list[ScheduledTransactionInstance])
+@router.post("/batch", response_model=ScheduledTransactionBatchResponse)
+async def apply_scheduled_transaction_batch(
+    batch: ScheduledTransactionBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> ScheduledTransactionBatchResponse:
+    """
+    Create, update and delete many scheduled transactions in one request.
+
+    Operations apply in order. Updates and deletes act on the whole series.
+    Creates may set `ref` and link to another create of the batch with
+    `link_ref` (e.g. both sides of a transfer). A delete also deletes the
+    rules linked to or from it, listed in its `deleted_ids`. Invalid
+    operations are reported per item and skipped; all the others commit
+    together.
+    """
+    results = await ScheduledTransactionBatchService.apply(current_user.id, batch.operations, db)
+
+    return ScheduledTransactionBatchResponse(
+        applied_count=sum(1 for r in results if r.error is None),
+        error_count=sum(1 for r in results if r.error is not None),
+        results=[
+            ScheduledTransactionBatchResult(
+                index=index,
+                op=result.op,
+                transaction_id=result.transaction_id,
+                transaction=(
+                    ScheduledTransactionResponse.model_validate(result.transaction)
+                    if result.transaction is not None
+                    else None
+                ),
+                deleted_ids=result.deleted_ids,
+                error=result.error,
+            )
+            for index, result in enumerate(results)
+        ],
+    )
+
+
+@router.post("/import", response_model=TransactionImportResponse)
+async def import_transactions(
+    file: UploadFile = File(..., description="Bank export (.csv, .ofx/.qfx or .qif)"),
+    file_format: Literal["csv", "ofx", "qif"] | None = Query(
+        None, description="File format (detected from the file name if omitted)"
+    ),
+    account_id: int | None = Query(
+        None, description="Account for records that name no known account"
+    ),
+    detect_recurring: bool = Query(True, description="Turn regular series into recurring rules"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> TransactionImportResponse:
+    """
+    Import transactions from a bank export.
+
+    The file is read and written incrementally, in committed chunks, so
+    long histories import with bounded memory. Records are matched to
+    accounts and categories by name; series that recur exactly monthly or
+    yearly become recurring rules. Skipped records are reported by line.
+    """
+    file_format = file_format or detect_format(file.filename)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown file format; pass file_format (csv, ofx or qif)",
+        )
+
+    max_bytes = settings.TRANSACTION_IMPORT_MAX_UPLOAD_MB * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large (max {settings.TRANSACTION_IMPORT_MAX_UPLOAD_MB} MB)",
+        )
+
+    # The upload is spooled to a temporary file; the import reads and parses it
+    # from there in a worker thread, a chunk at a time
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        result = await TransactionImportService.import_transactions(
+            current_user.id,
+            read_text(text, file_format),
+            file_format,
+            db,
+            default_account_id=account_id,
+            detect_recurring=detect_recurring,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from None
+    finally:
+        # Leave closing the upload to FastAPI
+        text.detach()
+
+    return TransactionImportResponse.model_validate(result)
+
+
+@router.get(
+    "/upcoming",
+    response_model=list[ScheduledTransactionInstance],
+    dependencies=[Depends(check_not_modified)],
+)
+async def get_upcoming_instances(
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of instances"),
+    days: int | None = Query(
+        None, ge=0, le=3660, description="Only instances within this many days from today"
+    ),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> list[ScheduledTransactionInstance]:
+    """
+    Get the next instances from today on, sorted by date.
+
+    Only the rules that come next are read, in order of their stored next
+    occurrence date, so the cost follows `limit` rather than the number of
+    rules.
+    """
+    to_date = date.today() + timedelta(days=days) if days is not None else None
+    return await NextOccurrenceService.get_upcoming(current_user.id, db, limit, to_date=to_date)
+
+
+@router.get(
+    "/instances",
+    response_model=list[ScheduledTransactionInstance],
+    dependencies=[Depends(check_not_modified)],
+)
 async def get_transaction_instances(
     from_date: date = Query(..., description="Start date of range"),
     to_date: date = Query(..., description="End date of range"),
@@ -191,6 +338,54 @@ async def get_transaction_instances(
     return instances
 
 
+@router.get(
+    "/{transaction_id}/instances",
+    response_model=list[ScheduledTransactionInstance],
+    dependencies=[Depends(check_not_modified)],
+)
+async def get_scheduled_transaction_instances(
+    transaction_id: int,
+    from_date: date = Query(..., description="Start date of range"),
+    to_date: date = Query(..., description="End date of range"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> list[ScheduledTransactionInstance]:
+    """
+    Get the expanded instances of one scheduled transaction.
+
+    Only this transaction and its own exceptions are read.
+    """
+    if to_date < from_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="to_date must be on or after from_date",
+        )
+
+    # Limit range to prevent performance issues
+    max_days = 730  # 2 years
+    if (to_date - from_date).days > max_days:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range too large (max {max_days} days)",
+        )
+
+    result = await db.execute(
+        select(ScheduledTransaction.id).where(
+            ScheduledTransaction.id == transaction_id,
+            ScheduledTransaction.user_id == current_user.id,
+        )
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scheduled transaction not found",
+        )
+
+    return await RecurrenceService.expand_rules(
+        current_user.id, [transaction_id], from_date, to_date, db
+    )
+
+
 @router.get("/{transaction_id}", response_model=ScheduledTransactionResponse)
 async def get_scheduled_transaction(
     transaction_id: int,
@@ -274,6 +469,7 @@ async def update_scheduled_transaction(
         for field, value in update_data.items():
             setattr(transaction, field, value)
 
+        await DataVersionService.bump(current_user.id, db)
         await db.commit()
         await db.refresh(transaction)
 
@@ -285,6 +481,7 @@ async def update_scheduled_transaction(
     elif update_mode == UpdateMode.THIS_ONLY:
         # Create exception for this instance
         exception_data = {}
+        affected_account_ids = {transaction.account_id, transaction.to_account_id}
 
         if transaction_data.amount is not None:
             exception_data["amount"] = transaction_data.amount
@@ -311,6 +508,10 @@ async def update_scheduled_transaction(
         existing_exception = exc_result.scalar_one_or_none()
 
         if existing_exception:
+            affected_account_ids |= {
+                existing_exception.account_id,
+                existing_exception.to_account_id,
+            }
             # Update existing exception
             for field, value in exception_data.items():
                 setattr(existing_exception, field, value)
@@ -323,6 +524,14 @@ async def update_scheduled_transaction(
             )
             db.add(exception)
 
+        await DataVersionService.bump(
+            current_user.id,
+            db,
+            account_ids=affected_account_ids
+            | {exception_data.get("account_id"), exception_data.get("to_account_id")},
+            from_date=instance_date,
+            to_date=instance_date,
+        )
         await db.commit()
         await db.refresh(transaction)
 
@@ -377,6 +586,7 @@ async def update_scheduled_transaction(
         )
 
         db.add(new_transaction)
+        await DataVersionService.bump(current_user.id, db, from_date=instance_date)
         await db.commit()
         await db.refresh(transaction)
 
@@ -445,6 +655,12 @@ async def delete_scheduled_transaction(
     if delete_mode == DeleteMode.ALL:
         # Delete the entire transaction (cascade will delete exceptions)
         await db.delete(transaction)
+        await DataVersionService.bump(
+            current_user.id,
+            db,
+            from_date=transaction.recurrence_start_date,
+            to_date=transaction.recurrence_end_date,
+        )
         await db.commit()
 
         logger.info(
@@ -462,7 +678,12 @@ async def delete_scheduled_transaction(
         )
         existing_exception = exc_result.scalar_one_or_none()
 
+        affected_account_ids = {transaction.account_id, transaction.to_account_id}
         if existing_exception:
+            affected_account_ids |= {
+                existing_exception.account_id,
+                existing_exception.to_account_id,
+            }
             existing_exception.is_deleted = True
         else:
             exception = ScheduledTransactionException(
@@ -472,6 +693,13 @@ async def delete_scheduled_transaction(
             )
             db.add(exception)
 
+        await DataVersionService.bump(
+            current_user.id,
+            db,
+            account_ids=affected_account_ids,
+            from_date=instance_date,
+            to_date=instance_date,
+        )
         await db.commit()
 
         logger.info(
@@ -486,6 +714,7 @@ async def delete_scheduled_transaction(
     elif delete_mode == DeleteMode.THIS_AND_FUTURE:
         # Set end_date to day before instance_date
         transaction.recurrence_end_date = instance_date - timedelta(days=1)
+        await DataVersionService.bump(current_user.id, db, from_date=instance_date)
         await db.commit()
 
         logger.info(
@@ -511,42 +740,7 @@ async def get_pending_confirmations(
     - Account is PLANNING type
     - Status is 'completed' (not yet confirmed)
     """
-    from app.models.account import Account, AccountType
-
-    # Get PLANNING account ID for this user
-    planning_account_result = await db.execute(
-        select(Account.id).where(
-            Account.user_id == current_user.id,
-            Account.type == AccountType.PLANNING,
-            Account.is_active == True,  # noqa: E712
-        )
-    )
-    planning_account = planning_account_result.scalar_one_or_none()
-
-    if not planning_account:
-        # No PLANNING account, return empty list
-        return []
-
-    # Expand instances from past to today
-    today = date.today()
-    from_date = today - timedelta(days=365)  # Look back 1 year
-
-    instances = await RecurrenceService.expand_recurring_transactions(
-        user_id=current_user.id,
-        from_date=from_date,
-        to_date=today,
-        db=db,
-    )
-
-    # Filter for instances that need confirmation
-    pending = [
-        inst
-        for inst in instances
-        if inst.date <= today
-        and inst.account_id == planning_account
-        and not inst.is_deleted
-        and inst.status == "completed"
-    ]
+    pending = await PendingConfirmationService.get_pending(current_user.id, db)
 
     logger.info(
         "Retrieved pending confirmations",
@@ -556,6 +750,24 @@ async def get_pending_confirmations(
     return pending
 
 
+@router.get(
+    "/instances/pending-confirmation/count",
+    dependencies=[Depends(check_not_modified)],
+)
+async def count_pending_confirmations(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+) -> dict:
+    """
+    Count the transaction instances that need account confirmation.
+
+    Cheap enough to poll (e.g. for a navigation badge); answers conditional
+    requests with 304 until the user's data or the date changes.
+    """
+    count = await PendingConfirmationService.count_pending(current_user.id, db)
+    return {"count": count}
+
+
 @router.patch("/instances/bulk-confirm")
 async def bulk_confirm_instances(
     scheduled_transaction_id: int,
@@ -574,8 +786,6 @@ async def bulk_confirm_instances(
         apply_to: 'past' (all past instances), 'all' (entire series), 'specific_dates'
         specific_dates: List of dates in YYYY-MM-DD format (required if apply_to='specific_dates')
     """
-    from datetime import datetime
-
     from app.models.account import Account
 
     # Verify transaction ownership
@@ -610,7 +820,11 @@ async def bulk_confirm_instances(
 
     if apply_to == "all":
         # Update the entire series
+        previous_account_id = transaction.account_id
         transaction.account_id = account_id
+        await DataVersionService.bump(
+            current_user.id, db, account_ids=[previous_account_id, account_id]
+        )
         await db.commit()
 
         logger.info(
@@ -625,53 +839,27 @@ async def bulk_confirm_instances(
         return {"message": "All instances updated", "mode": "all"}
 
     elif apply_to == "past":
-        # Create exceptions for all past instances
+        # Confirm every past (non-deleted) occurrence of this transaction
         today = date.today()
         from_date = today - timedelta(days=365)
 
-        instances = await RecurrenceService.expand_recurring_transactions(
-            user_id=current_user.id,
-            from_date=from_date,
-            to_date=today,
-            db=db,
-        )
-
-        # Filter for this transaction and past dates
-        past_instances = [
-            inst
-            for inst in instances
-            if inst.scheduled_transaction_id == scheduled_transaction_id and inst.date <= today
-        ]
-
-        # Create exceptions for each
-        confirmed_count = 0
-        for inst in past_instances:
-            # Check if exception exists
-            exc_result = await db.execute(
-                select(ScheduledTransactionException).where(
-                    ScheduledTransactionException.scheduled_transaction_id
-                    == scheduled_transaction_id,
-                    ScheduledTransactionException.exception_date == inst.date,
-                )
-            )
-            existing = exc_result.scalar_one_or_none()
-
-            if existing:
-                existing.account_id = account_id
-                existing.status = "confirmed"
-                existing.confirmed_at = datetime.utcnow()
-            else:
-                exception = ScheduledTransactionException(
-                    scheduled_transaction_id=scheduled_transaction_id,
-                    exception_date=inst.date,
-                    account_id=account_id,
-                    status="confirmed",
-                    confirmed_at=datetime.utcnow(),
-                )
-                db.add(exception)
-
-            confirmed_count += 1
+        instances = await RecurrenceService.expand_rules(
+            current_user.id, [scheduled_transaction_id], from_date, today, db
+        )
+        dates_to_update = [inst.date for inst in instances]
 
+        affected_account_ids = await _confirm_instances(
+            transaction, account_id, dates_to_update, db
+        )
+        confirmed_count = len(dates_to_update)
+
+        await DataVersionService.bump(
+            current_user.id,
+            db,
+            account_ids=affected_account_ids,
+            from_date=min(dates_to_update, default=today),
+            to_date=today,
+        )
         await db.commit()
 
         logger.info(
@@ -693,46 +881,29 @@ async def bulk_confirm_instances(
                 detail="specific_dates is required when apply_to='specific_dates'",
             )
 
-        # Parse dates
-        dates_to_update = []
+        # Parse dates (a date given twice is confirmed once)
+        dates_to_update = set()
         for date_str in specific_dates:
             try:
-                parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                dates_to_update.append(parsed_date)
+                dates_to_update.add(datetime.strptime(date_str, "%Y-%m-%d").date())
             except ValueError as e:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Invalid date format: {date_str}. Use YYYY-MM-DD",
                 ) from e
 
-        # Create exceptions for specific dates
-        confirmed_count = 0
-        for target_date in dates_to_update:
-            exc_result = await db.execute(
-                select(ScheduledTransactionException).where(
-                    ScheduledTransactionException.scheduled_transaction_id
-                    == scheduled_transaction_id,
-                    ScheduledTransactionException.exception_date == target_date,
-                )
-            )
-            existing = exc_result.scalar_one_or_none()
-
-            if existing:
-                existing.account_id = account_id
-                existing.status = "confirmed"
-                existing.confirmed_at = datetime.utcnow()
-            else:
-                exception = ScheduledTransactionException(
-                    scheduled_transaction_id=scheduled_transaction_id,
-                    exception_date=target_date,
-                    account_id=account_id,
-                    status="confirmed",
-                    confirmed_at=datetime.utcnow(),
-                )
-                db.add(exception)
-
-            confirmed_count += 1
-
+        affected_account_ids = await _confirm_instances(
+            transaction, account_id, dates_to_update, db
+        )
+        confirmed_count = len(dates_to_update)
+
+        await DataVersionService.bump(
+            current_user.id,
+            db,
+            account_ids=affected_account_ids,
+            from_date=min(dates_to_update),
+            to_date=max(dates_to_update),
+        )
         await db.commit()
 
         logger.info(
@@ -749,3 +920,69 @@ async def bulk_confirm_instances(
             "message": f"Updated {confirmed_count} instances",
             "mode": "specific_dates",
         }
+
+
+async def _confirm_instances(
+    transaction: ScheduledTransaction,
+    account_id: int,
+    dates: Iterable[date],
+    db: AsyncSession,
+) -> set[int | None]:
+    """
+    Confirm the account of a transaction's instances on the given dates.
+
+    Existing exceptions are read with one range query and updated with one
+    statement, and the missing ones inserted with another, however many
+    dates there are. Nothing is committed.
+
+    Args:
+        transaction: The scheduled transaction
+        account_id: The confirmed account ID
+        dates: Instance dates to confirm
+        db: Database session
+
+    Returns:
+        Accounts whose instances change (previous and confirmed accounts)
+    """
+    dates = set(dates)
+    affected_account_ids = {transaction.account_id, account_id}
+    if not dates:
+        return affected_account_ids
+
+    exceptions = await RecurrenceService.fetch_exceptions(
+        [transaction.id], min(dates), max(dates), db
+    )
+    existing_ids = []
+    existing_dates = set()
+    for exc in exceptions:
+        if exc.exception_date in dates:
+            existing_ids.append(exc.id)
+            existing_dates.add(exc.exception_date)
+            affected_account_ids.add(exc.account_id)
+
+    confirmed_at = datetime.utcnow()
+    if existing_ids:
+        await db.execute(
+            update(ScheduledTransactionException)
+            .where(ScheduledTransactionException.id.in_(existing_ids))
+            .values(account_id=account_id, status="confirmed", confirmed_at=confirmed_at)
+        )
+
+    new_dates = sorted(dates - existing_dates)
+    if new_dates:
+        await db.execute(
+            insert(ScheduledTransactionException),
+            [
+                {
+                    "scheduled_transaction_id": transaction.id,
+                    "exception_date": d,
+                    "account_id": account_id,
+                    "status": "confirmed",
+                    "confirmed_at": confirmed_at,
+                    "is_deleted": False,
+                }
+                for d in new_dates
+            ],
+        )
+
+    return affected_account_ids
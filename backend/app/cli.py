@@ -0,0 +1,218 @@
+"""
+Maintenance commands.
+
+Usage (from the backend directory):
+    python -m app.cli rebuild-balance-rollups
+    python -m app.cli rebuild-balance-rollups --user-id 42
+    python -m app.cli precompute-dashboards --concurrency 8 --priority cost
+    python -m app.cli import-transactions --user-id 42 --file export.ofx --account-id 7
+    python -m app.cli compact-exceptions --dry-run
+    python -m app.cli refresh-next-occurrences --all
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal, engine
+from app.models.user import User
+from app.services.balance_rollup_service import BalanceRollupService
+from app.services.dashboard_precompute_service import DashboardPrecomputeService
+from app.services.exception_compaction_service import ExceptionCompactionService
+from app.services.import_parsers import detect_format, read_text
+from app.services.next_occurrence_service import NextOccurrenceService
+from app.services.transaction_import_service import ImportProgress, TransactionImportService
+
+logger = logging.getLogger(__name__)
+
+
+async def rebuild_balance_rollups(user_id: int | None) -> None:
+    """Rebuild the daily balance rollup for one user, or for every user."""
+    async with AsyncSessionLocal() as db:
+        query = select(User.id).order_by(User.id)
+        if user_id is not None:
+            query = query.where(User.id == user_id)
+        user_ids = list((await db.execute(query)).scalars().all())
+
+    # One transaction per user, so a failure leaves the others rebuilt
+    for uid in user_ids:
+        async with AsyncSessionLocal() as db:
+            await BalanceRollupService.refresh(uid, db)
+            await db.commit()
+
+    logger.info("Balance rollups rebuilt", extra={"user_count": len(user_ids)})
+    print(f"Rebuilt balance rollups for {len(user_ids)} user(s)")
+
+
+async def precompute_dashboards(concurrency: int | None, priority: str | None) -> None:
+    """Run one dashboard precompute pass over recently active users."""
+    started = time.perf_counter()
+    warmed = await DashboardPrecomputeService.run_pass(concurrency=concurrency, priority=priority)
+    print(f"Precomputed dashboards for {warmed} user(s) in {time.perf_counter() - started:.2f}s")
+
+
+async def import_transactions(
+    user_id: int,
+    path: str,
+    file_format: str | None,
+    account_id: int | None,
+    detect_recurring: bool,
+    chunk_size: int | None,
+) -> None:
+    """Import a bank export file for one user, printing progress per chunk."""
+    file_format = file_format or detect_format(path)
+    if file_format is None:
+        raise SystemExit("Unknown file format; pass --format (csv, ofx or qif)")
+
+    def report(progress: ImportProgress) -> None:
+        print(
+            f"  {progress.rows_read} read, {progress.imported_count} imported, "
+            f"{progress.error_count} skipped"
+        )
+
+    with open(path, encoding="utf-8-sig", errors="replace", newline="") as file:
+        async with AsyncSessionLocal() as db:
+            try:
+                result = await TransactionImportService.import_transactions(
+                    user_id,
+                    read_text(file, file_format),
+                    file_format,
+                    db,
+                    default_account_id=account_id,
+                    detect_recurring=detect_recurring,
+                    chunk_size=chunk_size,
+                    progress=report,
+                )
+            except ValueError as e:
+                raise SystemExit(str(e)) from None
+
+    for error in result.errors:
+        print(f"  line {error.line}: {error.message}")
+    print(
+        f"Imported {result.imported_count} of {result.rows_read} record(s) in "
+        f"{result.elapsed_seconds:.2f}s; {result.recurring_count} recurring rule(s) replace "
+        f"{result.consolidated_count} of them, {result.error_count} skipped"
+    )
+
+
+async def compact_exceptions(user_id: int | None, dry_run: bool) -> None:
+    """Delete unreachable and duplicate exceptions for one user, or for every user."""
+    async with AsyncSessionLocal() as db:
+        result = await ExceptionCompactionService.compact(db, user_id=user_id, dry_run=dry_run)
+
+    action = "Would delete" if dry_run else "Deleted"
+    print(
+        f"{action} {result.unreachable_count} unreachable and {result.duplicate_count} "
+        f"duplicate exception(s) of {result.rule_count} rule(s) in {result.elapsed_seconds:.2f}s"
+    )
+
+
+async def refresh_next_occurrences(recompute_all: bool, user_id: int | None) -> None:
+    """Advance passed next occurrence dates, or recompute every one."""
+    async with AsyncSessionLocal() as db:
+        refreshed = await NextOccurrenceService.refresh(
+            db, stale_only=not recompute_all, user_id=user_id
+        )
+    print(f"Refreshed next occurrence dates of {refreshed} scheduled transaction(s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = subparsers.add_parser(
+        "rebuild-balance-rollups",
+        help="Recompute daily balance rollups from scratch",
+    )
+    rebuild.add_argument("--user-id", type=int, default=None, help="Only rebuild this user")
+
+    precompute = subparsers.add_parser(
+        "precompute-dashboards",
+        help="Recompute dashboards for recently active users (one pass)",
+    )
+    precompute.add_argument(
+        "--concurrency", type=int, default=None, help="Dashboards computed at once"
+    )
+    precompute.add_argument(
+        "--priority", choices=["recent", "cost"], default=None, help="Order users are processed in"
+    )
+
+    import_parser = subparsers.add_parser(
+        "import-transactions",
+        help="Import a bank export (CSV, OFX or QIF) for one user",
+    )
+    import_parser.add_argument("--user-id", type=int, required=True, help="Owner of the import")
+    import_parser.add_argument("--file", required=True, help="Path of the export file")
+    import_parser.add_argument(
+        "--format",
+        choices=["csv", "ofx", "qif"],
+        default=None,
+        help="File format (detected from the extension if omitted)",
+    )
+    import_parser.add_argument(
+        "--account-id",
+        type=int,
+        default=None,
+        help="Account for records that name no known account",
+    )
+    import_parser.add_argument(
+        "--no-detect-recurring",
+        action="store_true",
+        help="Keep every record as a one-time transaction",
+    )
+    import_parser.add_argument(
+        "--chunk-size", type=int, default=None, help="Records written per transaction"
+    )
+
+    compact = subparsers.add_parser(
+        "compact-exceptions",
+        help="Delete exceptions no occurrence uses (unreachable or duplicate)",
+    )
+    compact.add_argument("--user-id", type=int, default=None, help="Only compact this user")
+    compact.add_argument("--dry-run", action="store_true", help="Only count what would be deleted")
+
+    next_occurrences = subparsers.add_parser(
+        "refresh-next-occurrences",
+        help="Advance passed next occurrence dates (what the daily job does)",
+    )
+    next_occurrences.add_argument(
+        "--all",
+        action="store_true",
+        help="Recompute every rule, not only passed or missing dates",
+    )
+    next_occurrences.add_argument(
+        "--user-id", type=int, default=None, help="Only refresh this user"
+    )
+
+    args = parser.parse_args()
+
+    async def run() -> None:
+        try:
+            if args.command == "rebuild-balance-rollups":
+                await rebuild_balance_rollups(args.user_id)
+            elif args.command == "precompute-dashboards":
+                await precompute_dashboards(args.concurrency, args.priority)
+            elif args.command == "import-transactions":
+                await import_transactions(
+                    args.user_id,
+                    args.file,
+                    args.format,
+                    args.account_id,
+                    not args.no_detect_recurring,
+                    args.chunk_size,
+                )
+            elif args.command == "compact-exceptions":
+                await compact_exceptions(args.user_id, args.dry_run)
+            elif args.command == "refresh-next-occurrences":
+                await refresh_next_occurrences(args.all, args.user_id)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,6 +21,59 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Dashboard
+    # Run independent dashboard queries concurrently on separate sessions.
+    # Each dashboard request then holds several pooled connections at once, so this
+    # only pays off with a remote database and a large enough pool - measure with
+    # benchmarks/benchmark_dashboard.py before enabling.
+    DASHBOARD_PARALLEL_LOAD: bool = False
+    # Serve the last computed dashboard immediately after a write (marked stale) and
+    # recompute it in the background. Cached per process, per user and history window.
+    DASHBOARD_STALE_WHILE_REVALIDATE: bool = False
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 10000
+    # Recompute cached dashboards for recently active users shortly after midnight,
+    # so the first request of the day isn't the one paying for the date change.
+    # Only takes effect together with DASHBOARD_STALE_WHILE_REVALIDATE.
+    DASHBOARD_PRECOMPUTE_ENABLED: bool = False
+    DASHBOARD_PRECOMPUTE_DELAY_SECONDS: int = 60
+    DASHBOARD_PRECOMPUTE_CONCURRENCY: int = 4
+    # Users with a refresh token issued within this many days count as active
+    DASHBOARD_PRECOMPUTE_ACTIVE_DAYS: int = 7
+    # "recent": most recently signed in first; "cost": slowest dashboards first
+    DASHBOARD_PRECOMPUTE_PRIORITY: Literal["recent", "cost"] = "recent"
+
+    # Next occurrence dates: advance the ones that have passed shortly after midnight.
+    # Idempotent, and stale dates only cost speed, so one process running it is enough.
+    NEXT_OCCURRENCE_REFRESH_ENABLED: bool = True
+    NEXT_OCCURRENCE_REFRESH_DELAY_SECONDS: int = 30
+    NEXT_OCCURRENCE_REFRESH_BATCH_SIZE: int = 1000
+
+    # Rule index: per-process interval index over each user's rule lifetimes, so
+    # window queries expand only the rules that can occur in the window
+    RULE_INDEX_MAX_USERS: int = 10000
+
+    # Change events (Server-Sent Events at /events/stream)
+    # Comment line sent on idle streams so proxies don't close them
+    CHANGE_EVENTS_HEARTBEAT_SECONDS: int = 15
+    # Undelivered events kept per connection before they collapse into one
+    CHANGE_EVENTS_QUEUE_SIZE: int = 100
+
+    # Transaction import (CSV/OFX/QIF)
+    # Rows written and committed per chunk; bounds memory and transaction size
+    TRANSACTION_IMPORT_CHUNK_SIZE: int = 1000
+    # Largest accepted upload; the CLI has no limit
+    TRANSACTION_IMPORT_MAX_UPLOAD_MB: int = 50
+
+    # Data export (/export)
+    # Rows fetched per round trip from the server-side cursor; bounds memory
+    EXPORT_BATCH_SIZE: int = 1000
+    # Longest range of expanded instances one export may cover
+    EXPORT_INSTANCES_MAX_DAYS: int = 3660
+
+    # Exception compaction (python -m app.cli compact-exceptions)
+    # Rules whose exceptions are checked and cleaned up per transaction
+    EXCEPTION_COMPACTION_BATCH_SIZE: int = 500
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = ["http://localhost:4200", "http://localhost:3000"]
 
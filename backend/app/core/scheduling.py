@@ -0,0 +1,36 @@
+"""Scheduling for background jobs that run once a day."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+
+def seconds_until_next_run(now: datetime, delay_seconds: int) -> float:
+    """Seconds from now until delay_seconds past the next local midnight."""
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (next_midnight - now).total_seconds() + delay_seconds
+
+
+async def run_daily(job: Callable[[], Awaitable[object]], delay_seconds: int, name: str) -> None:
+    """
+    Run a job shortly after every date change, until cancelled.
+
+    Args:
+        job: Coroutine function to run
+        delay_seconds: How long after local midnight to run it
+        name: Job name for logs
+    """
+    last_run: date | None = None
+    while True:
+        await asyncio.sleep(seconds_until_next_run(datetime.now(), delay_seconds))
+        # Guard against waking early (clock adjustments) and running twice a day
+        if date.today() == last_run:
+            continue
+        last_run = date.today()
+        try:
+            await job()
+        except Exception:
+            logger.exception("Daily job failed", extra={"job": name})
@@ -6,6 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.category import Category, CategoryType
+from app.services.category_service import CategoryService
 
 logger = logging.getLogger(__name__)
 
@@ -198,6 +199,9 @@ async def seed_categories(db: AsyncSession) -> None:
 
     await db.commit()
 
+    # Warm the process-wide system category cache
+    await CategoryService.load_system_categories(db)
+
     logger.info(
         f"System categories seeding completed: {seeded_count} created, {skipped_count} skipped"
     )
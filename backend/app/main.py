@@ -1,3 +1,5 @@
+import asyncio
+import contextlib
 import logging
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -20,6 +22,8 @@ from app.core.errors import (
 from app.core.exceptions import AppException
 from app.core.logging import setup_logging
 from app.core.seed_categories import seed_categories
+from app.services.dashboard_precompute_service import DashboardPrecomputeService
+from app.services.next_occurrence_service import NextOccurrenceService
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +40,26 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     async with AsyncSessionLocal() as db:
         await seed_categories(db)
 
+    # Precomputed dashboards are only ever served from the stale-while-revalidate cache
+    precompute_task = None
+    if settings.DASHBOARD_PRECOMPUTE_ENABLED and settings.DASHBOARD_STALE_WHILE_REVALIDATE:
+        precompute_task = asyncio.create_task(DashboardPrecomputeService.run_scheduler())
+        logger.info("Dashboard precompute scheduler started")
+
+    next_occurrence_task = None
+    if settings.NEXT_OCCURRENCE_REFRESH_ENABLED:
+        next_occurrence_task = asyncio.create_task(NextOccurrenceService.run_scheduler())
+        logger.info("Next occurrence refresh scheduler started")
+
     yield
 
     # Shutdown
     logger.info(f"Shutting down {settings.PROJECT_NAME}")
+    for task in (precompute_task, next_occurrence_task):
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
 
 
 app = FastAPI(
@@ -58,6 +78,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Headers browsers must be allowed to read: pagination cursors, export file names
+    expose_headers=["X-Next-Cursor", "Content-Disposition"],
 )
 
 # Register exception handlers
@@ -1,8 +1,10 @@
 from app.models.account import Account, AccountType
+from app.models.balance_rollup import DailyBalanceRollup
 from app.models.base import BaseModel
 from app.models.category import Category, CategoryType
 from app.models.financial_institution import FinancialInstitution
 from app.models.reconciliation import AccountReconciliation
+from app.models.reconciliation_drift import ReconciliationDriftStat
 from app.models.refresh_token import RefreshToken
 from app.models.scheduled_transaction import (
     RecurrenceFrequency,
@@ -24,4 +26,6 @@ __all__ = [
     "ScheduledTransactionException",
     "RecurrenceFrequency",
     "AccountReconciliation",
+    "DailyBalanceRollup",
+    "ReconciliationDriftStat",
 ]
@@ -0,0 +1,34 @@
+"""Daily balance rollup model."""
+
+from sqlalchemy import Column, Date, ForeignKey, Integer, Numeric, UniqueConstraint
+
+from app.models.base import BaseModel
+
+
+class DailyBalanceRollup(BaseModel):
+    """
+    Per-user balance totals as of a date, maintained on write.
+
+    A row exists for every date on which any of the user's balance accounts
+    (active, non-PLANNING) changed balance - an initial balance or a
+    reconciliation. Totals are carried forward, so the row with the latest
+    date on or before a given day holds that day's totals.
+    """
+
+    __tablename__ = "daily_balance_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    rollup_date = Column(Date, nullable=False)
+
+    total = Column(Numeric(15, 2), nullable=False, comment="Sum of all balance accounts")
+    liquid = Column(Numeric(15, 2), nullable=False, comment="Checking, savings and cash")
+    investments = Column(Numeric(15, 2), nullable=False, comment="Investment and retirement")
+    credit = Column(Numeric(15, 2), nullable=False, comment="Credit cards and loans")
+
+    # Also serves (user_id, date range) reads
+    __table_args__ = (
+        UniqueConstraint("user_id", "rollup_date", name="uq_daily_balance_rollup_user_date"),
+    )
+
+    def __repr__(self):
+        return f"<DailyBalanceRollup(user_id={self.user_id}, date={self.rollup_date}, total={self.total})>"
@@ -1,6 +1,6 @@
 """Account reconciliation model."""
 
-from sqlalchemy import Column, Date, ForeignKey, Integer, Numeric, Text
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, Numeric, Text
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -49,5 +49,22 @@ class AccountReconciliation(BaseModel):
         "ScheduledTransaction", foreign_keys=[adjustment_transaction_id]
     )
 
+    # Serves per-account "latest before date" lookups and date-range reads,
+    # and keyset pagination of the history across all accounts
+    __table_args__ = (
+        Index(
+            "ix_account_reconciliations_user_account_date",
+            "user_id",
+            "account_id",
+            "reconciliation_date",
+        ),
+        Index(
+            "ix_account_reconciliations_user_date_id",
+            "user_id",
+            "reconciliation_date",
+            "id",
+        ),
+    )
+
     def __repr__(self):
         return f"<AccountReconciliation(id={self.id}, account_id={self.account_id}, date={self.reconciliation_date}, diff={self.difference})>"
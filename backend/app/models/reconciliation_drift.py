@@ -0,0 +1,40 @@
+"""Reconciliation drift statistics model."""
+
+from sqlalchemy import Column, Date, ForeignKey, Integer, Numeric, UniqueConstraint
+
+from app.models.base import BaseModel
+
+
+class ReconciliationDriftStat(BaseModel):
+    """
+    Running aggregates of reconciliation differences per account and month.
+
+    Maintained on write as reconciliations are created and deleted, so drift
+    analytics read one row per account and month instead of every
+    reconciliation. Mean and variance follow from count, total and
+    total_squares.
+    """
+
+    __tablename__ = "reconciliation_drift_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    account_id = Column(
+        Integer, ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    month = Column(Date, nullable=False, comment="First day of the month")
+
+    count = Column(Integer, nullable=False, comment="Number of reconciliations")
+    total = Column(Numeric(20, 2), nullable=False, comment="Sum of differences")
+    total_squares = Column(Numeric(34, 4), nullable=False, comment="Sum of squared differences")
+    min_difference = Column(Numeric(15, 2), nullable=False)
+    max_difference = Column(Numeric(15, 2), nullable=False)
+
+    # Also serves (user_id, account_id) and (user_id) reads
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "account_id", "month", name="uq_reconciliation_drift_stat_account_month"
+        ),
+    )
+
+    def __repr__(self):
+        return f"<ReconciliationDriftStat(account_id={self.account_id}, month={self.month}, count={self.count})>"
@@ -1,6 +1,7 @@
 """Scheduled transaction models for recurring and one-time transactions."""
 
 import enum
+from datetime import date
 
 from sqlalchemy import (
     Boolean,
@@ -10,10 +11,13 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
+    UniqueConstraint,
+    event,
 )
 from sqlalchemy.orm import relationship
 
@@ -70,6 +74,11 @@ class ScheduledTransaction(BaseModel):
     )  # Start date for both one-time and recurring
     recurrence_end_date = Column(Date, nullable=True)  # NULL = infinite, only for recurring
 
+    # First occurrence on or after the day it was computed; NULL = no occurrences left.
+    # Set on every ORM write and advanced daily (see NextOccurrenceService), so it is
+    # never later than the true next occurrence.
+    next_occurrence_date = Column(Date, nullable=True)
+
     # Relationships
     user = relationship("User", backref="scheduled_transactions")
     account = relationship(
@@ -108,12 +117,28 @@ class ScheduledTransaction(BaseModel):
             "recurrence_end_date IS NULL OR recurrence_end_date >= recurrence_start_date",
             name="check_end_date_after_start",
         ),
+        # "What's next" for a user: ORDER BY next_occurrence_date LIMIT n
+        Index(
+            "ix_scheduled_transactions_user_next_occurrence",
+            "user_id",
+            "next_occurrence_date",
+        ),
     )
 
     def __repr__(self):
         return f"<ScheduledTransaction(id={self.id}, name={self.name}, is_recurring={self.is_recurring})>"
 
 
+@event.listens_for(ScheduledTransaction, "before_insert")
+@event.listens_for(ScheduledTransaction, "before_update")
+def set_next_occurrence_date(mapper, connection, target: ScheduledTransaction) -> None:
+    """Keep next_occurrence_date current on every ORM write, wherever it comes from."""
+    # Imported here: the recurrence service imports these models
+    from app.services.recurrence_service import RecurrenceService
+
+    target.next_occurrence_date = RecurrenceService.first_occurrence(target, date.today())
+
+
 class ScheduledTransactionException(BaseModel):
     """
     Exception model for instance-specific modifications to recurring transactions.
@@ -124,11 +149,11 @@ class ScheduledTransactionException(BaseModel):
 
     __tablename__ = "scheduled_transaction_exceptions"
 
+    # Indexed by the (scheduled_transaction_id, exception_date) unique constraint
     scheduled_transaction_id = Column(
         Integer,
         ForeignKey("scheduled_transactions.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     exception_date = Column(Date, nullable=False)
 
@@ -158,6 +183,15 @@ class ScheduledTransactionException(BaseModel):
         # Removed check_exception_amount_positive to allow negative amounts for expenses
         # Unique constraint: one exception per (transaction, date) pair
         # This prevents multiple modifications for the same occurrence
+        UniqueConstraint(
+            "scheduled_transaction_id", "exception_date", name="uq_exception_transaction_date"
+        ),
+        # Finds occurrences moved onto an account (e.g. PLANNING) in a date range
+        Index(
+            "ix_scheduled_transaction_exceptions_account_date",
+            "account_id",
+            "exception_date",
+        ),
     )
 
     def __repr__(self):
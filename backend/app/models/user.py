@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import Boolean, Column, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.models.base import BaseModel
@@ -14,6 +14,13 @@ class User(BaseModel):
     full_name = Column(String(255), nullable=True)
     currency = Column(String(3), nullable=False, default="USD")
     is_active = Column(Boolean, default=True, nullable=False)
+    data_version = Column(
+        Integer,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Bumped on every write to the user's data (drives ETags)",
+    )
 
     # Relationships
     accounts = relationship(
@@ -65,5 +65,9 @@ class DashboardResponse(BaseModel):
     )
     today_date: date_type = Field(..., description="Today's date for chart marker")
     scheduled_transaction_count: int = Field(..., description="Total scheduled transaction count")
+    data_version: int = Field(..., description="User data version the dashboard was computed at")
+    is_stale: bool = Field(
+        default=False, description="True if newer data exists and is being recomputed"
+    )
 
     model_config = {"from_attributes": True}
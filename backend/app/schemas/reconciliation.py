@@ -57,3 +57,72 @@ class ReconciliationSummary(BaseModel):
     has_adjustment: bool = Field(..., description="Whether adjustment was created")
 
     model_config = {"from_attributes": True}
+
+
+# Rows accepted by one bulk reconciliation request (JSON or CSV)
+MAX_BULK_RECONCILIATIONS = 500
+
+
+class ReconciliationBulkCreate(BaseModel):
+    """Schema for creating several reconciliations at once."""
+
+    items: list[ReconciliationCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BULK_RECONCILIATIONS,
+        description="Reconciliations to create, processed in order",
+    )
+
+
+class ReconciliationBulkRowResult(BaseModel):
+    """Result of one row of a bulk reconciliation."""
+
+    row: int = Field(..., description="Item number (JSON, from 1) or line number (CSV)")
+    account_id: int | None = Field(None, description="Account ID, if the row named a known one")
+    reconciliation: ReconciliationResponse | None = Field(
+        None, description="Created reconciliation"
+    )
+    error: str | None = Field(None, description="Why the row was not created")
+
+
+class ReconciliationBulkResponse(BaseModel):
+    """Schema for bulk reconciliation response."""
+
+    created_count: int = Field(..., description="Number of reconciliations created")
+    error_count: int = Field(..., description="Number of rows rejected")
+    results: list[ReconciliationBulkRowResult] = Field(..., description="Per-row results")
+
+
+class ReconciliationDriftMonth(BaseModel):
+    """Drift of an account within one month."""
+
+    month: date_type = Field(..., description="First day of the month")
+    count: int = Field(..., description="Number of reconciliations")
+    mean_difference: Decimal = Field(..., description="Mean difference (actual - expected)")
+    min_difference: Decimal = Field(..., description="Smallest difference")
+    max_difference: Decimal = Field(..., description="Largest difference")
+    max_abs_difference: Decimal = Field(..., description="Largest difference by magnitude")
+
+    model_config = {"from_attributes": True}
+
+
+class ReconciliationDriftResponse(BaseModel):
+    """Drift between planned and actual balance of one account."""
+
+    account_id: int = Field(..., description="Account ID")
+    account_name: str = Field(..., description="Account name")
+    count: int = Field(..., description="Number of reconciliations")
+    mean_difference: Decimal = Field(..., description="Mean difference (actual - expected)")
+    stddev_difference: Decimal | None = Field(
+        None, description="Sample standard deviation of the difference (needs 2+ reconciliations)"
+    )
+    min_difference: Decimal = Field(..., description="Smallest difference")
+    max_difference: Decimal = Field(..., description="Largest difference")
+    trend_per_month: Decimal | None = Field(
+        None, description="Change in the monthly mean difference per month (needs 2+ months)"
+    )
+    worst_months: list[ReconciliationDriftMonth] = Field(
+        ..., description="Months with the largest differences, worst first"
+    )
+
+    model_config = {"from_attributes": True}
@@ -3,6 +3,7 @@
 from datetime import date as date_type
 from datetime import datetime
 from decimal import Decimal
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
@@ -241,3 +242,109 @@ class ScheduledTransactionExceptionResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+# Operations accepted by one batch request
+MAX_BATCH_OPERATIONS = 500
+
+
+class ScheduledTransactionBatchCreate(BaseModel):
+    """Batch operation creating a scheduled transaction."""
+
+    op: Literal["create"]
+    ref: str | None = Field(
+        None, max_length=64, description="Client reference other operations can link to"
+    )
+    link_ref: str | None = Field(
+        None,
+        max_length=64,
+        description="ref of a create in the same batch to set as linked_transaction_id",
+    )
+    data: ScheduledTransactionCreate
+
+
+class ScheduledTransactionBatchUpdate(BaseModel):
+    """Batch operation updating a whole scheduled transaction series."""
+
+    op: Literal["update"]
+    id: int = Field(..., description="Scheduled transaction ID")
+    data: ScheduledTransactionUpdate
+
+
+class ScheduledTransactionBatchDelete(BaseModel):
+    """Batch operation deleting a whole scheduled transaction series."""
+
+    op: Literal["delete"]
+    id: int = Field(..., description="Scheduled transaction ID")
+
+
+ScheduledTransactionBatchOperation = Annotated[
+    ScheduledTransactionBatchCreate
+    | ScheduledTransactionBatchUpdate
+    | ScheduledTransactionBatchDelete,
+    Field(discriminator="op"),
+]
+
+
+class ScheduledTransactionBatchRequest(BaseModel):
+    """Schema for applying several scheduled transaction operations at once."""
+
+    operations: list[ScheduledTransactionBatchOperation] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_OPERATIONS,
+        description="Operations, applied in order",
+    )
+
+
+class ScheduledTransactionBatchResult(BaseModel):
+    """Result of one batch operation."""
+
+    index: int = Field(..., description="Position of the operation in the request (from 0)")
+    op: str = Field(..., description="Operation: create, update or delete")
+    transaction_id: int | None = Field(None, description="Scheduled transaction ID")
+    transaction: ScheduledTransactionResponse | None = Field(
+        None, description="Created or updated transaction"
+    )
+    deleted_ids: list[int] = Field(
+        default_factory=list,
+        description="Deleted transaction IDs, including the ones linked to or from it",
+    )
+    error: str | None = Field(None, description="Why the operation was not applied")
+
+
+class ScheduledTransactionBatchResponse(BaseModel):
+    """Schema for batch operation response."""
+
+    applied_count: int = Field(..., description="Number of operations applied")
+    error_count: int = Field(..., description="Number of operations rejected")
+    results: list[ScheduledTransactionBatchResult] = Field(
+        ..., description="Per-operation results, in request order"
+    )
+
+
+class TransactionImportRowError(BaseModel):
+    """A record of an imported file that was skipped."""
+
+    line: int = Field(..., description="Line number where the record starts")
+    message: str = Field(..., description="Why the record was skipped")
+
+    model_config = {"from_attributes": True}
+
+
+class TransactionImportResponse(BaseModel):
+    """Schema for transaction import response."""
+
+    rows_read: int = Field(..., description="Records read from the file")
+    imported_count: int = Field(..., description="Records written as one-time transactions")
+    recurring_count: int = Field(..., description="Recurring rules created from regular series")
+    consolidated_count: int = Field(
+        ..., description="Imported one-time transactions replaced by those rules"
+    )
+    error_count: int = Field(..., description="Records skipped")
+    errors: list[TransactionImportRowError] = Field(
+        ..., description="Skipped records (the first 100)"
+    )
+    elapsed_seconds: float = Field(..., description="Import duration")
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,92 @@
+"""Service for account balance totals."""
+
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account import Account, AccountType
+from app.services.balance_rollup_service import CREDIT_TYPES, INVESTMENT_TYPES, LIQUID_TYPES
+
+
+class FinancialSummary:
+    """Financial summary with account balances by category."""
+
+    def __init__(
+        self,
+        liquid_assets: Decimal,
+        investments: Decimal,
+        credit_used: Decimal,
+        loans_receivable: Decimal,
+        net_worth: Decimal,
+        account_count: int,
+    ):
+        self.liquid_assets = liquid_assets
+        self.investments = investments
+        self.credit_used = credit_used
+        self.loans_receivable = loans_receivable
+        self.net_worth = net_worth
+        self.account_count = account_count
+
+
+class AccountSummaryService:
+    """Service for summarizing a user's account balances by category."""
+
+    @staticmethod
+    async def get_summary(user_id: int, db: AsyncSession) -> FinancialSummary:
+        """
+        Get a user's balance totals by category (active, non-PLANNING accounts).
+
+        The totals are aggregated per account type in the database, so only
+        one row per type is read however many accounts the user has.
+
+        Args:
+            user_id: User ID
+            db: Database session
+
+        Returns:
+            FinancialSummary
+        """
+        result = await db.execute(
+            select(
+                Account.type,
+                func.sum(Account.initial_balance).label("balance"),
+                # Credit/loans are typically negative; they count as credit used
+                func.sum(func.abs(Account.initial_balance)).label("abs_balance"),
+                func.count(Account.id).label("account_count"),
+            )
+            .where(
+                Account.user_id == user_id,
+                Account.is_active,
+                Account.type != AccountType.PLANNING,
+            )
+            .group_by(Account.type)
+        )
+
+        liquid_assets = Decimal("0")
+        investments = Decimal("0")
+        credit_used = Decimal("0")
+        loans_receivable = Decimal("0")
+        account_count = 0
+
+        for row in result:
+            account_count += row.account_count
+            if row.type in LIQUID_TYPES:
+                liquid_assets += row.balance
+            elif row.type in INVESTMENT_TYPES:
+                investments += row.balance
+            elif row.type in CREDIT_TYPES:
+                credit_used += row.abs_balance
+            elif row.type == AccountType.LOAN_GIVEN:
+                loans_receivable += row.balance
+
+        net_worth = liquid_assets + investments - credit_used + loans_receivable
+
+        return FinancialSummary(
+            liquid_assets=liquid_assets,
+            investments=investments,
+            credit_used=credit_used,
+            loans_receivable=loans_receivable,
+            net_worth=net_worth,
+            account_count=account_count,
+        )
@@ -0,0 +1,194 @@
+"""Service for maintaining per-user daily balance rollups."""
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account import Account, AccountType
+from app.models.balance_rollup import DailyBalanceRollup
+from app.models.reconciliation import AccountReconciliation
+
+LIQUID_TYPES = (AccountType.CHECKING, AccountType.SAVINGS, AccountType.CASH)
+INVESTMENT_TYPES = (AccountType.INVESTMENT, AccountType.RETIREMENT)
+CREDIT_TYPES = (AccountType.CREDIT_CARD, AccountType.LOAN)
+
+
+class BalanceRollupService:
+    """
+    Service for the daily balance rollup.
+
+    Balances change on initial balance dates and on reconciliations. Whenever
+    one of those changes, the rollup rows from the affected date onwards are
+    recomputed; earlier rows cannot depend on it and are left alone.
+    """
+
+    @staticmethod
+    async def refresh(user_id: int, db: AsyncSession, from_date: date | None = None) -> None:
+        """
+        Recompute a user's rollup rows dated on or after from_date.
+
+        Call this after flushing a change to the user's accounts or
+        reconciliations, within the same transaction. Nothing is committed.
+
+        Args:
+            user_id: User ID
+            db: Database session
+            from_date: Earliest date affected by the change (None rebuilds everything)
+        """
+        result = await db.execute(
+            select(Account).where(
+                Account.user_id == user_id,
+                Account.is_active,
+                Account.type != AccountType.PLANNING,
+            )
+        )
+        accounts = {acc.id: acc for acc in result.scalars().all()}
+
+        # Each event is (date, order, account_id, balance); on the same date an
+        # initial balance applies before reconciliations, and those in ID order
+        events: list[tuple[date, int, int, Decimal]] = []
+        account_balance: dict[int, Decimal] = {}
+
+        for account in accounts.values():
+            d = account.initial_balance_date
+            if from_date is None or d >= from_date:
+                events.append((d, 0, account.id, account.initial_balance))
+            else:
+                account_balance[account.id] = account.initial_balance
+
+        reconciliations = await BalanceRollupService._load_reconciliations(user_id, from_date, db)
+        for recon in reconciliations:
+            if recon.account_id not in accounts:
+                continue
+            if from_date is not None and recon.reconciliation_date < from_date:
+                # Latest reconciliation before the change: the balance carried in,
+                # unless a later initial balance superseded it
+                if recon.reconciliation_date >= accounts[recon.account_id].initial_balance_date:
+                    account_balance[recon.account_id] = recon.actual_balance
+            else:
+                events.append(
+                    (recon.reconciliation_date, recon.id, recon.account_id, recon.actual_balance)
+                )
+
+        events.sort(key=lambda x: (x[0], x[1]))
+
+        # Totals carried into from_date
+        total = Decimal("0")
+        liquid = Decimal("0")
+        investments = Decimal("0")
+        credit = Decimal("0")
+        for acc_id, balance in account_balance.items():
+            account_type = accounts[acc_id].type
+            total += balance
+            if account_type in LIQUID_TYPES:
+                liquid += balance
+            elif account_type in INVESTMENT_TYPES:
+                investments += balance
+            elif account_type in CREDIT_TYPES:
+                credit += balance
+
+        rows: list[DailyBalanceRollup] = []
+        for d, _, acc_id, balance in events:
+            # Running totals are adjusted by the delta of each balance change
+            delta = balance - account_balance.get(acc_id, Decimal("0"))
+            account_balance[acc_id] = balance
+
+            account_type = accounts[acc_id].type
+            total += delta
+            if account_type in LIQUID_TYPES:
+                liquid += delta
+            elif account_type in INVESTMENT_TYPES:
+                investments += delta
+            elif account_type in CREDIT_TYPES:
+                credit += delta
+
+            if rows and rows[-1].rollup_date == d:
+                row = rows[-1]
+            else:
+                row = DailyBalanceRollup(user_id=user_id, rollup_date=d)
+                rows.append(row)
+            row.total = total
+            row.liquid = liquid
+            row.investments = investments
+            row.credit = credit
+
+        stale = delete(DailyBalanceRollup).where(DailyBalanceRollup.user_id == user_id)
+        if from_date is not None:
+            stale = stale.where(DailyBalanceRollup.rollup_date >= from_date)
+        await db.execute(stale)
+
+        db.add_all(rows)
+        await db.flush()
+
+    @staticmethod
+    async def _load_reconciliations(
+        user_id: int, from_date: date | None, db: AsyncSession
+    ) -> list[AccountReconciliation]:
+        """
+        Load the reconciliations a refresh from from_date needs.
+
+        That is every reconciliation on or after from_date plus, per account,
+        the latest one before it (the balance carried in). Older rows cannot
+        affect the recomputed rows, so they are not read.
+        """
+        query = select(AccountReconciliation).where(AccountReconciliation.user_id == user_id)
+
+        if from_date is not None:
+            latest_before = (
+                select(
+                    AccountReconciliation.account_id,
+                    func.max(AccountReconciliation.reconciliation_date).label(
+                        "reconciliation_date"
+                    ),
+                )
+                .where(
+                    AccountReconciliation.user_id == user_id,
+                    AccountReconciliation.reconciliation_date < from_date,
+                )
+                .group_by(AccountReconciliation.account_id)
+                .subquery()
+            )
+            query = query.outerjoin(
+                latest_before,
+                AccountReconciliation.account_id == latest_before.c.account_id,
+            ).where(
+                or_(
+                    AccountReconciliation.reconciliation_date >= from_date,
+                    AccountReconciliation.reconciliation_date
+                    == latest_before.c.reconciliation_date,
+                )
+            )
+
+        result = await db.execute(
+            query.order_by(AccountReconciliation.reconciliation_date, AccountReconciliation.id)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_rollups(
+        user_id: int, from_date: date, to_date: date, db: AsyncSession
+    ) -> list[DailyBalanceRollup]:
+        """
+        Get a user's rollup rows within [from_date, to_date), oldest first.
+
+        Args:
+            user_id: User ID
+            from_date: Start date (inclusive)
+            to_date: End date (exclusive)
+            db: Database session
+
+        Returns:
+            List of rollup rows
+        """
+        result = await db.execute(
+            select(DailyBalanceRollup)
+            .where(
+                DailyBalanceRollup.user_id == user_id,
+                DailyBalanceRollup.rollup_date >= from_date,
+                DailyBalanceRollup.rollup_date < to_date,
+            )
+            .order_by(DailyBalanceRollup.rollup_date)
+        )
+        return list(result.scalars().all())
@@ -0,0 +1,118 @@
+"""Service for category lookups."""
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category, CategoryType
+
+
+class CategoryInfo:
+    """Read-only snapshot of a category, safe to share across sessions."""
+
+    def __init__(
+        self,
+        id: int,
+        name: str,
+        type: CategoryType,
+        icon: str | None,
+        color: str | None,
+        is_system: bool,
+    ):
+        self.id = id
+        self.name = name
+        self.type = type
+        self.icon = icon
+        self.color = color
+        self.is_system = is_system
+
+    @classmethod
+    def from_model(cls, category: Category) -> "CategoryInfo":
+        """Snapshot a Category model."""
+        return cls(
+            id=category.id,
+            name=category.name,
+            type=category.type,
+            icon=category.icon,
+            color=category.color,
+            is_system=category.is_system,
+        )
+
+
+class CategoryService:
+    """
+    Service for looking up categories by ID.
+
+    System categories are shared by all users and cannot be modified through
+    the API, so they are cached for the life of the process. User categories
+    are always read from the database, and only for the IDs asked for.
+    """
+
+    # Process-wide cache of system categories keyed by ID (None until loaded)
+    _system_categories: dict[int, CategoryInfo] | None = None
+
+    @staticmethod
+    async def load_system_categories(db: AsyncSession) -> dict[int, CategoryInfo]:
+        """
+        (Re)load the system category cache from the database.
+
+        Args:
+            db: Database session
+
+        Returns:
+            System categories keyed by ID
+        """
+        result = await db.execute(select(Category).where(Category.is_system.is_(True)))
+        CategoryService._system_categories = {
+            cat.id: CategoryInfo.from_model(cat) for cat in result.scalars().all()
+        }
+        return CategoryService._system_categories
+
+    @staticmethod
+    def invalidate_system_categories() -> None:
+        """Drop the system category cache; the next lookup reloads it."""
+        CategoryService._system_categories = None
+
+    @staticmethod
+    async def get_categories(
+        user_id: int, category_ids: set[int], db: AsyncSession
+    ) -> dict[int, CategoryInfo]:
+        """
+        Get the categories with the given IDs visible to a user.
+
+        System categories come from the cache; the database is only queried
+        for IDs the cache doesn't know. System categories found that way
+        (created since the cache was loaded) are added to it.
+
+        Args:
+            user_id: User ID
+            category_ids: Category IDs to look up
+            db: Database session
+
+        Returns:
+            Found categories keyed by ID (unknown or foreign IDs are omitted)
+        """
+        system_categories = CategoryService._system_categories
+        if system_categories is None:
+            system_categories = await CategoryService.load_system_categories(db)
+
+        categories = {
+            cat_id: system_categories[cat_id]
+            for cat_id in category_ids
+            if cat_id in system_categories
+        }
+
+        missing = category_ids - categories.keys()
+        if missing:
+            result = await db.execute(
+                select(Category).where(
+                    Category.id.in_(missing),
+                    or_(Category.user_id == user_id, Category.is_system.is_(True)),
+                )
+            )
+            for cat in result.scalars().all():
+                info = CategoryInfo.from_model(cat)
+                categories[cat.id] = info
+                if info.is_system:
+                    system_categories[cat.id] = info
+
+        return categories
@@ -0,0 +1,222 @@
+"""Service for publishing per-user change events."""
+
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from datetime import date
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Session.info key holding the events of the open transaction
+_PENDING_KEY = "pending_change_events"
+
+
+class ChangeEvent:
+    """
+    A committed change to a user's data.
+
+    account_ids and the date range say what the change can have affected,
+    so a client can refetch only that. None means unknown: account_ids=None
+    may affect any account, and a missing bound leaves the range open.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        data_version: int,
+        account_ids: set[int] | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ):
+        self.user_id = user_id
+        self.data_version = data_version
+        self.account_ids = account_ids
+        self.from_date = from_date
+        self.to_date = to_date
+
+    def merge(self, other: "ChangeEvent") -> "ChangeEvent":
+        """Combine two changes of the same user into one covering both."""
+        account_ids = None
+        if self.account_ids is not None and other.account_ids is not None:
+            account_ids = self.account_ids | other.account_ids
+
+        from_date = None
+        if self.from_date is not None and other.from_date is not None:
+            from_date = min(self.from_date, other.from_date)
+
+        to_date = None
+        if self.to_date is not None and other.to_date is not None:
+            to_date = max(self.to_date, other.to_date)
+
+        return ChangeEvent(
+            self.user_id,
+            max(self.data_version, other.data_version),
+            account_ids,
+            from_date,
+            to_date,
+        )
+
+    def to_dict(self) -> dict:
+        """JSON-serializable payload (without the user ID)."""
+        return {
+            "data_version": self.data_version,
+            "account_ids": sorted(self.account_ids) if self.account_ids is not None else None,
+            "from_date": self.from_date.isoformat() if self.from_date else None,
+            "to_date": self.to_date.isoformat() if self.to_date else None,
+        }
+
+    def to_sse(self) -> str:
+        """Format as a Server-Sent Events message."""
+        return f"id: {self.data_version}\nevent: change\ndata: {json.dumps(self.to_dict())}\n\n"
+
+
+class ChangeBroker(ABC):
+    """
+    Fans change events out to the subscribers of a user.
+
+    The default InMemoryChangeBroker only reaches subscribers connected to
+    the same process. A multi-node deployment implements publish() on a
+    shared channel (e.g. Redis pub/sub) and feeds each node's subscriber
+    queues from it.
+    """
+
+    @abstractmethod
+    async def publish(self, change: ChangeEvent) -> None:
+        """Deliver an event to every subscriber of change.user_id."""
+
+    @abstractmethod
+    def subscribe(self, user_id: int) -> AbstractAsyncContextManager[asyncio.Queue[ChangeEvent]]:
+        """Async context manager yielding a queue of the user's events."""
+
+
+class InMemoryChangeBroker(ChangeBroker):
+    """Broker delivering events to subscribers in this process."""
+
+    def __init__(self, queue_size: int | None = None):
+        self.queue_size = queue_size or settings.CHANGE_EVENTS_QUEUE_SIZE
+        self._subscribers: dict[int, set[asyncio.Queue[ChangeEvent]]] = defaultdict(set)
+
+    async def publish(self, change: ChangeEvent) -> None:
+        for queue in self._subscribers.get(change.user_id, ()):
+            if queue.full():
+                # Slow client: collapse its backlog into one catch-all event
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(ChangeEvent(change.user_id, change.data_version))
+            else:
+                queue.put_nowait(change)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue[ChangeEvent]]:
+        queue: asyncio.Queue[ChangeEvent] = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[user_id].discard(queue)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def subscriber_count(self, user_id: int) -> int:
+        """Number of open subscriptions for a user."""
+        return len(self._subscribers.get(user_id, ()))
+
+
+class ChangeEventService:
+    """
+    Service for change events.
+
+    Writes record an event on their session (DataVersionService.bump does
+    this); it is published only once the transaction commits, and dropped
+    if it rolls back.
+    """
+
+    broker: ChangeBroker = InMemoryChangeBroker()
+
+    # Publish tasks in flight, kept referenced until they finish
+    _tasks: set[asyncio.Task] = set()
+
+    @staticmethod
+    def set_broker(broker: ChangeBroker) -> None:
+        """Replace the process-wide broker (call once at startup)."""
+        ChangeEventService.broker = broker
+
+    @staticmethod
+    def record(
+        db: AsyncSession,
+        user_id: int,
+        data_version: int,
+        account_ids: Iterable[int | None] | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> None:
+        """
+        Record a change to publish when the session's transaction commits.
+
+        Several changes to the same user within one transaction are merged.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            data_version: The user's data version after the change
+            account_ids: Affected accounts (None entries are ignored; None if unknown)
+            from_date: Earliest affected date (None if unbounded)
+            to_date: Latest affected date (None if unbounded)
+        """
+        change = ChangeEvent(
+            user_id,
+            data_version,
+            {a for a in account_ids if a is not None} if account_ids is not None else None,
+            from_date,
+            to_date,
+        )
+        pending: dict[int, ChangeEvent] = db.sync_session.info.setdefault(_PENDING_KEY, {})
+        if user_id in pending:
+            change = pending[user_id].merge(change)
+        pending[user_id] = change
+
+    @staticmethod
+    def has_pending(db: AsyncSession, user_id: int) -> bool:
+        """Whether the session's open transaction has recorded a change for the user."""
+        return user_id in db.sync_session.info.get(_PENDING_KEY, {})
+
+    @staticmethod
+    def _publish_pending(session: Session) -> None:
+        pending: dict[int, ChangeEvent] = session.info.pop(_PENDING_KEY, {})
+        if not pending:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Committed outside the event loop (e.g. a sync script): nobody is listening
+            return
+
+        for change in pending.values():
+            task = loop.create_task(ChangeEventService.broker.publish(change))
+            ChangeEventService._tasks.add(task)
+            task.add_done_callback(ChangeEventService._publish_done)
+
+    @staticmethod
+    def _publish_done(task: asyncio.Task) -> None:
+        ChangeEventService._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Publishing change event failed", exc_info=task.exception())
+
+    @staticmethod
+    def _discard_pending(session: Session) -> None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+event.listen(Session, "after_commit", ChangeEventService._publish_pending)
+event.listen(Session, "after_rollback", ChangeEventService._discard_pending)
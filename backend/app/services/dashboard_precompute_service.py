@@ -0,0 +1,145 @@
+"""Service for recomputing dashboards ahead of the date change."""
+
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.scheduling import run_daily
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.dashboard_service import DashboardCache
+
+logger = logging.getLogger(__name__)
+
+
+class ActiveUser:
+    """A recently active user, as the precompute pass orders them."""
+
+    def __init__(self, user_id: int, data_version: int, last_seen: datetime):
+        self.user_id = user_id
+        self.data_version = data_version
+        self.last_seen = last_seen
+
+
+class DashboardPrecomputeService:
+    """
+    Service for warming the dashboard cache after midnight.
+
+    Every dashboard (history, forecast trend, upcoming transactions) is
+    relative to today, so the first request of a new day can never be
+    served from the cache. A pass recomputes the dashboards of recently
+    active users up front, a few at a time, in priority order.
+    """
+
+    @staticmethod
+    async def get_active_users(active_days: int, db: AsyncSession) -> list[ActiveUser]:
+        """
+        Get users who signed in within the last active_days days.
+
+        Args:
+            active_days: How far back a sign-in counts as active
+            db: Database session
+
+        Returns:
+            Active users, most recently seen first
+        """
+        since = datetime.now(UTC) - timedelta(days=active_days)
+        last_seen = func.max(RefreshToken.created_at).label("last_seen")
+
+        result = await db.execute(
+            select(User.id, User.data_version, last_seen)
+            .join(RefreshToken, RefreshToken.user_id == User.id)
+            .where(User.is_active, RefreshToken.created_at >= since)
+            .group_by(User.id, User.data_version)
+            .order_by(last_seen.desc(), User.id)
+        )
+        return [ActiveUser(row.id, row.data_version, row.last_seen) for row in result]
+
+    @staticmethod
+    def prioritize(users: list[ActiveUser], priority: str) -> list[ActiveUser]:
+        """
+        Order users for a pass.
+
+        Args:
+            users: Active users, most recently seen first
+            priority: "recent" keeps that order; "cost" puts the users whose
+                cached dashboards took longest to compute first
+
+        Returns:
+            Users in the order they should be recomputed
+        """
+        if priority == "cost":
+            # Stable sort: equal (e.g. never cached) users stay most recent first
+            return sorted(users, key=lambda u: DashboardCache.cost(u.user_id), reverse=True)
+        return users
+
+    @staticmethod
+    async def run_pass(
+        concurrency: int | None = None,
+        priority: str | None = None,
+        bind: AsyncEngine | None = None,
+    ) -> int:
+        """
+        Recompute the cached dashboards of all recently active users.
+
+        Args:
+            concurrency: Dashboards computed at once (defaults to the setting)
+            priority: "recent" or "cost" (defaults to the setting)
+            bind: Engine to compute on (defaults to the application engine)
+
+        Returns:
+            Number of users whose dashboards were recomputed
+        """
+        concurrency = concurrency or settings.DASHBOARD_PRECOMPUTE_CONCURRENCY
+        priority = priority or settings.DASHBOARD_PRECOMPUTE_PRIORITY
+        bind = bind or engine
+
+        started = time.perf_counter()
+        async with AsyncSession(bind) as db:
+            users = await DashboardPrecomputeService.get_active_users(
+                settings.DASHBOARD_PRECOMPUTE_ACTIVE_DAYS, db
+            )
+        queue: asyncio.Queue[ActiveUser] = asyncio.Queue()
+        for user in DashboardPrecomputeService.prioritize(users, priority):
+            queue.put_nowait(user)
+
+        warmed = 0
+
+        async def worker() -> None:
+            nonlocal warmed
+            while not queue.empty():
+                user = queue.get_nowait()
+                try:
+                    await DashboardCache.warm(user.user_id, user.data_version, bind)
+                    warmed += 1
+                except Exception:
+                    # Already logged by the cache; the user is computed on demand instead
+                    pass
+
+        await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(users))))))
+
+        logger.info(
+            "Dashboard precompute pass finished",
+            extra={
+                "user_count": len(users),
+                "warmed_count": warmed,
+                "priority": priority,
+                "elapsed_seconds": round(time.perf_counter() - started, 3),
+            },
+        )
+        return warmed
+
+    @staticmethod
+    async def run_scheduler() -> None:
+        """Run a pass shortly after every date change, until cancelled."""
+        await run_daily(
+            DashboardPrecomputeService.run_pass,
+            settings.DASHBOARD_PRECOMPUTE_DELAY_SECONDS,
+            "dashboard_precompute",
+        )
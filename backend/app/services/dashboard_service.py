@@ -1,36 +1,32 @@
 """Service for dashboard data aggregation."""
 
+import asyncio
+import logging
+import time
+from collections import OrderedDict
 from datetime import date, timedelta
 from decimal import Decimal
 
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
+from app.core.config import settings
 from app.models.account import Account, AccountType
-from app.models.reconciliation import AccountReconciliation
-from app.models.scheduled_transaction import ScheduledTransaction
+from app.models.balance_rollup import DailyBalanceRollup
+from app.models.scheduled_transaction import ScheduledTransaction, ScheduledTransactionException
+from app.schemas.scheduled_transaction import ScheduledTransactionInstance
+from app.services.account_summary_service import AccountSummaryService, FinancialSummary
+from app.services.balance_rollup_service import (
+    CREDIT_TYPES,
+    INVESTMENT_TYPES,
+    LIQUID_TYPES,
+    BalanceRollupService,
+)
+from app.services.category_service import CategoryInfo, CategoryService
 from app.services.forecast_service import ForecastService
 from app.services.recurrence_service import RecurrenceService
 
-
-class FinancialSummary:
-    """Financial summary with account balances by category."""
-
-    def __init__(
-        self,
-        liquid_assets: Decimal,
-        investments: Decimal,
-        credit_used: Decimal,
-        loans_receivable: Decimal,
-        net_worth: Decimal,
-        account_count: int,
-    ):
-        self.liquid_assets = liquid_assets
-        self.investments = investments
-        self.credit_used = credit_used
-        self.loans_receivable = loans_receivable
-        self.net_worth = net_worth
-        self.account_count = account_count
+logger = logging.getLogger(__name__)
 
 
 class UpcomingTransaction:
@@ -101,36 +97,178 @@ class DashboardData:
         self.scheduled_transaction_count = scheduled_transaction_count
 
 
+class DashboardContext:
+    """
+    Per-request snapshot of the data every dashboard section needs.
+
+    Accounts, scheduled transactions, exceptions, balance rollups and categories
+    are loaded once and shared, so sections never query the database themselves.
+    """
+
+    def __init__(
+        self,
+        today: date,
+        accounts: list[Account],
+        transactions: list[ScheduledTransaction],
+        exceptions: list[ScheduledTransactionException],
+        instances: list[ScheduledTransactionInstance],
+        balance_rollups: list[DailyBalanceRollup],
+        categories: dict[int, CategoryInfo],
+    ):
+        self.today = today
+        self.accounts = accounts
+        self.transactions = transactions
+        self.exceptions = exceptions
+        self.instances = instances
+        self.balance_rollups = balance_rollups
+        self.categories = categories
+
+    @property
+    def accounts_by_id(self) -> dict[int, Account]:
+        """All of the user's accounts keyed by ID (for name lookup)."""
+        return {acc.id: acc for acc in self.accounts}
+
+    @property
+    def balance_accounts(self) -> list[Account]:
+        """Active, non-PLANNING accounts that contribute to balances."""
+        return [acc for acc in self.accounts if acc.is_active and acc.type != AccountType.PLANNING]
+
+    @classmethod
+    async def load(
+        cls, user_id: int, db: AsyncSession, window_days: int = 30, history_days: int = 60
+    ) -> "DashboardContext":
+        """
+        Load the dashboard snapshot for a user.
+
+        The independent queries run concurrently, each on its own session bound
+        to the same engine as ``db``, unless DASHBOARD_PARALLEL_LOAD is disabled.
+
+        Args:
+            user_id: User ID
+            db: Database session
+            window_days: Days ahead to expand scheduled transactions for
+            history_days: Days back the historical trend covers
+
+        Returns:
+            DashboardContext with all data loaded
+        """
+        today = date.today()
+        window_end = today + timedelta(days=window_days)
+        history_start = today - timedelta(days=history_days)
+
+        loaders = (
+            lambda session: cls._load_accounts(user_id, session),
+            lambda session: cls._load_transactions(user_id, session),
+            lambda session: cls._load_exceptions(user_id, today, window_end, session),
+            lambda session: BalanceRollupService.get_rollups(
+                user_id, history_start, today, session
+            ),
+        )
+
+        if settings.DASHBOARD_PARALLEL_LOAD and db.bind is not None:
+            session_factory = async_sessionmaker(
+                db.bind, class_=AsyncSession, expire_on_commit=False
+            )
+
+            async def run_in_own_session(loader):
+                async with session_factory() as session:
+                    return await loader(session)
+
+            results = await asyncio.gather(*(run_in_own_session(loader) for loader in loaders))
+        else:
+            results = [await loader(db) for loader in loaders]
+
+        accounts, transactions, exceptions, balance_rollups = results
+
+        # Only the categories the user's transactions reference, mostly from cache
+        categories = await CategoryService.get_categories(
+            user_id, {t.category_id for t in transactions}, db
+        )
+
+        instances = RecurrenceService.expand_transactions(
+            transactions, exceptions, today, window_end
+        )
+
+        return cls(
+            today=today,
+            accounts=accounts,
+            transactions=transactions,
+            exceptions=exceptions,
+            instances=instances,
+            balance_rollups=balance_rollups,
+            categories=categories,
+        )
+
+    @staticmethod
+    async def _load_accounts(user_id: int, db: AsyncSession) -> list[Account]:
+        """Load all of the user's accounts."""
+        result = await db.execute(select(Account).where(Account.user_id == user_id))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def _load_transactions(user_id: int, db: AsyncSession) -> list[ScheduledTransaction]:
+        """Load all of the user's scheduled transactions."""
+        result = await db.execute(
+            select(ScheduledTransaction).where(ScheduledTransaction.user_id == user_id)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def _load_exceptions(
+        user_id: int, from_date: date, to_date: date, db: AsyncSession
+    ) -> list[ScheduledTransactionException]:
+        """Load exceptions of the user's scheduled transactions within a date range."""
+        result = await db.execute(
+            select(ScheduledTransactionException)
+            .join(
+                ScheduledTransaction,
+                ScheduledTransactionException.scheduled_transaction_id == ScheduledTransaction.id,
+            )
+            .where(
+                ScheduledTransaction.user_id == user_id,
+                ScheduledTransactionException.exception_date >= from_date,
+                ScheduledTransactionException.exception_date <= to_date,
+            )
+        )
+        return list(result.scalars().all())
+
+
 class DashboardService:
     """Service for dashboard data aggregation."""
 
     @staticmethod
-    async def get_dashboard(user_id: int, db: AsyncSession) -> DashboardData:
+    async def get_dashboard(
+        user_id: int, db: AsyncSession, history_days: int = 60
+    ) -> DashboardData:
         """
         Get complete dashboard data for user.
 
         Args:
             user_id: User ID
             db: Database session
+            history_days: Days back the historical trend covers
 
         Returns:
             DashboardData with financial summary, upcoming transactions, and trends
         """
-        # Get financial summary
-        financial_summary = await DashboardService._get_financial_summary(user_id, db)
-
-        # Get upcoming transactions (next 30 days)
-        upcoming_transactions = await DashboardService._get_upcoming_transactions(
-            user_id, db, days=30
+        # Load everything once; sections below work on the shared snapshot
+        context = await DashboardContext.load(
+            user_id, db, window_days=30, history_days=history_days
         )
 
-        # Get balance trends (history + forecast)
-        balance_trends = await DashboardService._get_balance_trends(
-            user_id, db, history_days=60, forecast_days=30
+        # Get balance trends (history + forecast) off the event loop - this is the
+        # CPU-heavy section, so other requests keep being served meanwhile
+        balance_trends_task = asyncio.ensure_future(
+            asyncio.to_thread(DashboardService._get_balance_trends, context, forecast_days=30)
         )
 
-        # Get scheduled transaction count
-        scheduled_tx_count = await DashboardService._get_scheduled_transaction_count(user_id, db)
+        # Get financial summary (aggregated in the database)
+        financial_summary = await AccountSummaryService.get_summary(user_id, db)
+
+        # Get upcoming transactions (next 30 days)
+        upcoming_transactions = DashboardService._get_upcoming_transactions(context, days=30)
+
+        balance_trends = await balance_trends_task
 
         return DashboardData(
             financial_summary=financial_summary,
@@ -139,83 +277,29 @@ class DashboardService:
             liquid_trend=balance_trends.liquid_trend,
             investments_trend=balance_trends.investments_trend,
             credit_trend=balance_trends.credit_trend,
-            scheduled_transaction_count=scheduled_tx_count,
-        )
-
-    @staticmethod
-    async def _get_financial_summary(user_id: int, db: AsyncSession) -> FinancialSummary:
-        """Calculate financial summary from accounts (excluding PLANNING)."""
-        result = await db.execute(
-            select(Account).where(
-                Account.user_id == user_id,
-                Account.is_active,
-                Account.type != AccountType.PLANNING,
-            )
-        )
-        accounts = result.scalars().all()
-
-        liquid_assets = Decimal("0")
-        investments = Decimal("0")
-        credit_used = Decimal("0")
-        loans_receivable = Decimal("0")
-
-        for account in accounts:
-            balance = account.initial_balance
-
-            if account.type in (
-                AccountType.CHECKING,
-                AccountType.SAVINGS,
-                AccountType.CASH,
-            ):
-                liquid_assets += balance
-            elif account.type in (AccountType.INVESTMENT, AccountType.RETIREMENT):
-                investments += balance
-            elif account.type in (AccountType.CREDIT_CARD, AccountType.LOAN):
-                credit_used += abs(balance)  # Credit/loans are typically negative
-            elif account.type == AccountType.LOAN_GIVEN:
-                loans_receivable += balance
-
-        net_worth = liquid_assets + investments - credit_used + loans_receivable
-
-        return FinancialSummary(
-            liquid_assets=liquid_assets,
-            investments=investments,
-            credit_used=credit_used,
-            loans_receivable=loans_receivable,
-            net_worth=net_worth,
-            account_count=len(accounts),
+            scheduled_transaction_count=len(context.transactions),
         )
 
     @staticmethod
-    async def _get_upcoming_transactions(
-        user_id: int, db: AsyncSession, days: int = 30
+    def _get_upcoming_transactions(
+        context: DashboardContext, days: int = 30
     ) -> list[UpcomingTransaction]:
-        """Get upcoming scheduled transactions for next N days."""
-        from datetime import date
-
-        from app.models.category import Category
-
-        from_date = date.today()
-        to_date = from_date + timedelta(days=days)
-
-        # Get expanded instances
-        instances = await RecurrenceService.expand_recurring_transactions(
-            user_id=user_id,
-            from_date=from_date,
-            to_date=to_date,
-            db=db,
+        """Get the next 50 scheduled transactions within the next N days."""
+        # Merge each rule's next occurrences rather than sorting the whole window
+        instances = RecurrenceService.next_instances(
+            context.transactions,
+            context.exceptions,
+            context.today,
+            limit=50,
+            to_date=context.today + timedelta(days=days),
         )
 
-        # Fetch accounts and categories for name lookup
-        accounts_result = await db.execute(select(Account).where(Account.user_id == user_id))
-        accounts = {acc.id: acc for acc in accounts_result.scalars().all()}
-
-        categories_result = await db.execute(select(Category))
-        categories = {cat.id: cat for cat in categories_result.scalars().all()}
+        accounts = context.accounts_by_id
+        categories = context.categories
 
         # Convert to UpcomingTransaction objects
         upcoming = []
-        for instance in instances[:50]:  # Limit to 50 transactions
+        for instance in instances:
             account = accounts.get(instance.account_id)
             category = categories.get(instance.category_id)
 
@@ -234,127 +318,39 @@ class DashboardService:
         return upcoming
 
     @staticmethod
-    async def _get_balance_trends(
-        user_id: int, db: AsyncSession, history_days: int = 60, forecast_days: int = 30
-    ) -> BalanceTrends:
+    def _get_balance_trends(context: DashboardContext, forecast_days: int = 30) -> BalanceTrends:
         """
         Get balance trends combining historical data and forecast.
 
-        Historical data comes from initial balances and reconciliation records.
-        Uses forward-fill: each account's balance is carried forward until updated.
+        Historical data is read from the daily balance rollup, which already
+        carries each account's balance forward until it is updated.
         Forecast is calculated from scheduled transactions.
         """
-        today = date.today()
-        history_start = today - timedelta(days=history_days)
+        today = context.today
         forecast_end = today + timedelta(days=forecast_days)
 
         # Get all accounts to know their types
-        result = await db.execute(
-            select(Account).where(
-                Account.user_id == user_id,
-                Account.is_active,
-                Account.type != AccountType.PLANNING,
-            )
-        )
-        accounts = {acc.id: acc for acc in result.scalars().all()}
-
-        # Define account type categories
-        liquid_types = (AccountType.CHECKING, AccountType.SAVINGS, AccountType.CASH)
-        investment_types = (AccountType.INVESTMENT, AccountType.RETIREMENT)
-        credit_types = (AccountType.CREDIT_CARD, AccountType.LOAN)
-
-        # --- COLLECT HISTORICAL EVENTS ---
-        # Each event is (date, account_id, balance)
-        historical_events: list[tuple[date, int, Decimal]] = []
-
-        # Add initial balances as events
-        for account in accounts.values():
-            d = account.initial_balance_date
-            if d and d <= today:
-                historical_events.append((d, account.id, account.initial_balance))
-
-        # Add reconciliations as events
-        reconciliations_result = await db.execute(
-            select(AccountReconciliation)
-            .where(
-                AccountReconciliation.user_id == user_id,
-                AccountReconciliation.reconciliation_date <= today,
-            )
-            .order_by(AccountReconciliation.reconciliation_date)
-        )
-        reconciliations = reconciliations_result.scalars().all()
+        accounts = {acc.id: acc for acc in context.balance_accounts}
 
-        for recon in reconciliations:
-            if recon.account_id in accounts:
-                historical_events.append(
-                    (recon.reconciliation_date, recon.account_id, recon.actual_balance)
-                )
-
-        # Sort events by date
-        historical_events.sort(key=lambda x: x[0])
-
-        # --- BUILD HISTORICAL DATA with forward-fill ---
-        # Track last known balance for each account
-        account_last_balance: dict[int, Decimal] = {}
-        # Track which dates have any historical data
-        historical_dates: set[date] = set()
-
-        # Process events to build account state at each event date
-        for event_date, account_id, balance in historical_events:
-            account_last_balance[account_id] = balance
-            if history_start <= event_date < today:
-                historical_dates.add(event_date)
-
-        # Now build daily totals for historical period using forward-fill
-        # For each date in history, sum up last known balances of all accounts
-        # that had data by that date
+        # --- HISTORICAL DATA ---
+        # Rollup rows were loaded for the history window, one per balance change date
         total_by_date: dict[date, Decimal] = {}
         liquid_by_date: dict[date, Decimal] = {}
         investments_by_date: dict[date, Decimal] = {}
         credit_by_date: dict[date, Decimal] = {}
 
-        # Track account balance state as we iterate through dates
-        account_balance_at_date: dict[int, Decimal] = {}
-
-        # Build account state at each event date
-        event_idx = 0
-        for d in sorted(historical_dates):
-            # Apply all events up to and including this date
-            while event_idx < len(historical_events) and historical_events[event_idx][0] <= d:
-                _, acc_id, balance = historical_events[event_idx]
-                account_balance_at_date[acc_id] = balance
-                event_idx += 1
-
-            # Calculate totals for this date from all accounts with known balances
-            total = Decimal("0")
-            liquid = Decimal("0")
-            investments = Decimal("0")
-            credit = Decimal("0")
-
-            for acc_id, balance in account_balance_at_date.items():
-                account = accounts.get(acc_id)
-                if not account:
-                    continue
-
-                total += balance
-                if account.type in liquid_types:
-                    liquid += balance
-                elif account.type in investment_types:
-                    investments += balance
-                elif account.type in credit_types:
-                    credit += balance
-
-            total_by_date[d] = total
-            liquid_by_date[d] = liquid
-            investments_by_date[d] = investments
-            credit_by_date[d] = credit
+        for rollup in context.balance_rollups:
+            total_by_date[rollup.rollup_date] = rollup.total
+            liquid_by_date[rollup.rollup_date] = rollup.liquid
+            investments_by_date[rollup.rollup_date] = rollup.investments
+            credit_by_date[rollup.rollup_date] = rollup.credit
 
         # --- FORECAST DATA ---
-        forecasts = await ForecastService.calculate_forecast(
-            user_id=user_id,
-            from_date=today,
-            to_date=forecast_end,
-            db=db,
+        forecasts = ForecastService.build_forecasts(
+            list(accounts.values()),
+            [inst for inst in context.instances if inst.date <= forecast_end],
+            today,
+            forecast_end,
         )
 
         # Helper to add forecast balance to date dictionaries
@@ -367,11 +363,11 @@ class DashboardService:
 
             total_by_date[d] += balance
 
-            if account_type in liquid_types:
+            if account_type in LIQUID_TYPES:
                 liquid_by_date[d] += balance
-            elif account_type in investment_types:
+            elif account_type in INVESTMENT_TYPES:
                 investments_by_date[d] += balance
-            elif account_type in credit_types:
+            elif account_type in CREDIT_TYPES:
                 credit_by_date[d] += balance
 
         for forecast in forecasts:
@@ -399,12 +395,139 @@ class DashboardService:
             credit_trend=credit_trend,
         )
 
+
+class CachedDashboard:
+    """A computed dashboard, the data version and day it reflects, and its cost."""
+
+    def __init__(self, data: DashboardData, data_version: int, today: date, compute_seconds: float):
+        self.data = data
+        self.data_version = data_version
+        self.today = today
+        self.compute_seconds = compute_seconds
+
+
+class DashboardCache:
+    """
+    Stale-while-revalidate cache of computed dashboards.
+
+    Entries are kept per process, keyed by (user_id, history_days) and bounded
+    to DASHBOARD_CACHE_MAX_ENTRIES (least recently used first out). An entry
+    is current while the user's data version and the date are unchanged.
+    Recomputation is single-flight: concurrent requests for the same key
+    share one computation instead of starting their own.
+    """
+
+    _entries: OrderedDict[tuple[int, int], CachedDashboard] = OrderedDict()
+    _in_flight: dict[tuple[int, int], asyncio.Task] = {}
+
     @staticmethod
-    async def _get_scheduled_transaction_count(user_id: int, db: AsyncSession) -> int:
-        """Get total count of scheduled transactions."""
-        result = await db.execute(
-            select(func.count(ScheduledTransaction.id)).where(
-                ScheduledTransaction.user_id == user_id
+    async def get(
+        user_id: int, data_version: int, db: AsyncSession, history_days: int = 60
+    ) -> tuple[CachedDashboard, bool]:
+        """
+        Get a user's dashboard, serving a stale one while it is recomputed.
+
+        Args:
+            user_id: User ID
+            data_version: The user's current data version
+            db: Database session (its engine is used for recomputation)
+            history_days: Days back the historical trend covers
+
+        Returns:
+            Tuple of (cached dashboard, whether it is stale)
+        """
+        key = (user_id, history_days)
+        entry = DashboardCache._entries.get(key)
+
+        if entry is not None:
+            DashboardCache._entries.move_to_end(key)
+            if entry.data_version == data_version and entry.today == date.today():
+                return entry, False
+
+        task = DashboardCache._refresh(key, data_version, db.bind)
+
+        if entry is not None:
+            # Serve what we have; the task updates the entry in the background
+            return entry, True
+
+        # Nothing to serve yet - wait for the (possibly shared) computation
+        return await asyncio.shield(task), False
+
+    @staticmethod
+    async def warm(user_id: int, data_version: int, bind: AsyncEngine) -> list[CachedDashboard]:
+        """
+        Recompute every history window cached for a user (at least the default).
+
+        Args:
+            user_id: User ID
+            data_version: The user's current data version
+            bind: Engine to open the computing sessions on
+
+        Returns:
+            The recomputed entries
+        """
+        history_windows = {60} | {
+            history_days for uid, history_days in DashboardCache._entries if uid == user_id
+        }
+        return [
+            await asyncio.shield(
+                DashboardCache._refresh((user_id, history_days), data_version, bind)
             )
+            for history_days in sorted(history_windows)
+        ]
+
+    @staticmethod
+    def cost(user_id: int) -> float:
+        """Seconds the user's cached dashboards last took to compute (0 if none)."""
+        return sum(
+            entry.compute_seconds
+            for (uid, _), entry in DashboardCache._entries.items()
+            if uid == user_id
         )
-        return result.scalar() or 0
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drop all cached dashboards."""
+        DashboardCache._entries.clear()
+
+    @staticmethod
+    def _refresh(key: tuple[int, int], data_version: int, bind: AsyncEngine) -> asyncio.Task:
+        """Start recomputing an entry, or join the computation already running."""
+        task = DashboardCache._in_flight.get(key)
+        if task is not None:
+            return task
+
+        user_id, history_days = key
+        session_factory = async_sessionmaker(bind, class_=AsyncSession, expire_on_commit=False)
+
+        async def compute() -> CachedDashboard:
+            try:
+                started = time.perf_counter()
+                # Own session: the request's session is closed once it responds
+                async with session_factory() as session:
+                    data = await DashboardService.get_dashboard(
+                        user_id, session, history_days=history_days
+                    )
+
+                entry = CachedDashboard(
+                    data, data_version, date.today(), time.perf_counter() - started
+                )
+                DashboardCache._entries[key] = entry
+                DashboardCache._entries.move_to_end(key)
+                while len(DashboardCache._entries) > settings.DASHBOARD_CACHE_MAX_ENTRIES:
+                    DashboardCache._entries.popitem(last=False)
+                return entry
+            except Exception:
+                logger.exception(
+                    "Dashboard recomputation failed",
+                    extra={"user_id": user_id, "history_days": history_days},
+                )
+                raise
+            finally:
+                DashboardCache._in_flight.pop(key, None)
+
+        task = asyncio.ensure_future(compute())
+        # Background failures are logged above; don't also warn about unretrieved errors
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        DashboardCache._in_flight[key] = task
+        return task
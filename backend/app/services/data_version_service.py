@@ -0,0 +1,54 @@
+"""Service for the per-user data version."""
+
+from collections.abc import Iterable
+from datetime import date
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user import User
+from app.services.change_event_service import ChangeEventService
+
+
+class DataVersionService:
+    """
+    Service for the per-user data version.
+
+    Every write to a user's data bumps users.data_version inside the same
+    transaction, so read endpoints can derive ETags from it without
+    looking at the data itself. Each bump also records a change event,
+    pushed to the user's connected clients once the transaction commits.
+    """
+
+    @staticmethod
+    async def bump(
+        user_id: int,
+        db: AsyncSession,
+        account_ids: Iterable[int | None] | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> int:
+        """
+        Increment a user's data version. Nothing is committed.
+
+        Args:
+            user_id: User ID
+            db: Database session
+            account_ids: Accounts the write affects (None if unknown or not account-specific)
+            from_date: Earliest date the write affects (None if unbounded)
+            to_date: Latest date the write affects (None if unbounded)
+
+        Returns:
+            The new data version
+        """
+        # Incremented in SQL so concurrent writes never reuse a version
+        result = await db.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(data_version=User.data_version + 1)
+            .returning(User.data_version)
+        )
+        data_version = result.scalar_one()
+
+        ChangeEventService.record(db, user_id, data_version, account_ids, from_date, to_date)
+        return data_version
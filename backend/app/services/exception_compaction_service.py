@@ -0,0 +1,161 @@
+"""Service for removing scheduled transaction exceptions that no longer matter."""
+
+import logging
+import time
+from datetime import date
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.scheduled_transaction import ScheduledTransaction, ScheduledTransactionException
+from app.services.data_version_service import DataVersionService
+from app.services.recurrence_service import RecurrenceService
+
+logger = logging.getLogger(__name__)
+
+
+class ExceptionCompactionResult:
+    """Outcome of a compaction run."""
+
+    def __init__(self):
+        self.rule_count = 0
+        self.unreachable_count = 0
+        self.duplicate_count = 0
+        self.elapsed_seconds = 0.0
+
+
+class ExceptionCompactionService:
+    """
+    Service for compacting the scheduled transaction exception table.
+
+    Exceptions are only ever read for occurrences their rule generates, so
+    two kinds are dead weight that every expansion still has to scan:
+
+    - Unreachable: the rule no longer occurs on the exception's date, e.g.
+      exceptions past the recurrence_end_date set by a THIS_AND_FUTURE
+      split, or left behind when the schedule was edited.
+    - Duplicates: more than one exception for the same occurrence, from
+      before the unique constraint was restored. Expansion applies the
+      newest one, so the others never show.
+
+    Rules are processed in batches of EXCEPTION_COMPACTION_BATCH_SIZE, each
+    batch in its own transaction, so a run over all users stays bounded.
+    """
+
+    @staticmethod
+    async def compact(
+        db: AsyncSession,
+        user_id: int | None = None,
+        dry_run: bool = False,
+        batch_size: int | None = None,
+    ) -> ExceptionCompactionResult:
+        """
+        Delete unreachable and duplicate exceptions. Commits after every batch.
+
+        Args:
+            db: Database session
+            user_id: Only compact this user's rules (all users if None)
+            dry_run: Count what would be deleted without deleting it
+            batch_size: Rules per batch (defaults to the setting)
+
+        Returns:
+            ExceptionCompactionResult
+        """
+        batch_size = batch_size or settings.EXCEPTION_COMPACTION_BATCH_SIZE
+        started = time.perf_counter()
+        result = ExceptionCompactionResult()
+        last_id = 0
+
+        while True:
+            # Only rules with exceptions, by keyset so deletes don't shift the pages
+            query = (
+                select(ScheduledTransaction)
+                .where(
+                    ScheduledTransaction.id > last_id,
+                    exists().where(
+                        ScheduledTransactionException.scheduled_transaction_id
+                        == ScheduledTransaction.id
+                    ),
+                )
+                .order_by(ScheduledTransaction.id)
+                .limit(batch_size)
+            )
+            if user_id is not None:
+                query = query.where(ScheduledTransaction.user_id == user_id)
+            rules = list((await db.execute(query)).scalars().all())
+            if not rules:
+                break
+            last_id = rules[-1].id
+
+            await ExceptionCompactionService._compact_batch(rules, result, dry_run, db)
+            # Release the batch, so a long run doesn't accumulate loaded rules
+            db.expunge_all()
+
+        result.elapsed_seconds = round(time.perf_counter() - started, 3)
+        logger.info(
+            "Scheduled transaction exceptions compacted",
+            extra={
+                "user_id": user_id,
+                "dry_run": dry_run,
+                "rule_count": result.rule_count,
+                "unreachable_count": result.unreachable_count,
+                "duplicate_count": result.duplicate_count,
+                "elapsed_seconds": result.elapsed_seconds,
+            },
+        )
+        return result
+
+    @staticmethod
+    async def _compact_batch(
+        rules: list[ScheduledTransaction],
+        result: ExceptionCompactionResult,
+        dry_run: bool,
+        db: AsyncSession,
+    ) -> None:
+        """Find and delete the dead exceptions of one batch of rules, then commit."""
+        rules_by_id = {rule.id: rule for rule in rules}
+        # Newest first, so the first exception seen per occurrence is the one kept
+        exception_rows = await db.execute(
+            select(
+                ScheduledTransactionException.id,
+                ScheduledTransactionException.scheduled_transaction_id,
+                ScheduledTransactionException.exception_date,
+            )
+            .where(ScheduledTransactionException.scheduled_transaction_id.in_(rules_by_id))
+            .order_by(
+                ScheduledTransactionException.scheduled_transaction_id,
+                ScheduledTransactionException.exception_date,
+                ScheduledTransactionException.id.desc(),
+            )
+        )
+
+        dead_ids: list[int] = []
+        # Duplicates were visible (if only nondeterministically); tell clients
+        duplicate_dates: dict[int, list[date]] = {}
+        kept: set[tuple[int, date]] = set()
+        for exception_id, rule_id, exception_date in exception_rows:
+            rule = rules_by_id[rule_id]
+            if not RecurrenceService.is_occurrence(rule, exception_date):
+                dead_ids.append(exception_id)
+                result.unreachable_count += 1
+            elif (rule_id, exception_date) in kept:
+                dead_ids.append(exception_id)
+                result.duplicate_count += 1
+                duplicate_dates.setdefault(rule.user_id, []).append(exception_date)
+            else:
+                kept.add((rule_id, exception_date))
+
+        result.rule_count += len(rules)
+        if dry_run or not dead_ids:
+            return
+
+        await db.execute(
+            delete(ScheduledTransactionException).where(
+                ScheduledTransactionException.id.in_(dead_ids)
+            )
+        )
+        for owner_id, dates in duplicate_dates.items():
+            # Dropped duplicates may have overridden any account
+            await DataVersionService.bump(owner_id, db, from_date=min(dates), to_date=max(dates))
+        await db.commit()
@@ -0,0 +1,257 @@
+"""Service for streaming a user's data out as CSV or JSON Lines."""
+
+import csv
+import io
+import json
+import zipfile
+from collections.abc import AsyncIterator
+from datetime import date
+from enum import StrEnum
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.reconciliation import AccountReconciliation
+from app.models.scheduled_transaction import ScheduledTransaction, ScheduledTransactionException
+from app.schemas.reconciliation import ReconciliationResponse
+from app.schemas.scheduled_transaction import (
+    ScheduledTransactionExceptionResponse,
+    ScheduledTransactionInstance,
+    ScheduledTransactionResponse,
+)
+from app.services.recurrence_service import RecurrenceService
+
+# Encoded output is handed on in pieces of about this size
+WRITE_BUFFER_BYTES = 64 * 1024
+
+
+class ExportEntity(StrEnum):
+    """Kinds of data that can be exported."""
+
+    SCHEDULED_TRANSACTIONS = "scheduled_transactions"
+    EXCEPTIONS = "exceptions"
+    INSTANCES = "instances"
+    RECONCILIATIONS = "reconciliations"
+
+
+class ExportFormat(StrEnum):
+    """Export file formats."""
+
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+# Row schema per entity; also the CSV columns, in order
+EXPORT_SCHEMAS: dict[ExportEntity, type[BaseModel]] = {
+    ExportEntity.SCHEDULED_TRANSACTIONS: ScheduledTransactionResponse,
+    ExportEntity.EXCEPTIONS: ScheduledTransactionExceptionResponse,
+    ExportEntity.INSTANCES: ScheduledTransactionInstance,
+    ExportEntity.RECONCILIATIONS: ReconciliationResponse,
+}
+
+
+class _ZipSink:
+    """Write-only file for zipfile that hands written bytes back to the caller."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ExportService:
+    """
+    Service for full-data exports.
+
+    Rows are read through server-side cursors (stream_scalars with
+    yield_per), so only EXPORT_BATCH_SIZE rows are held at a time, and are
+    encoded and handed on as they arrive. Instances are expanded rule by
+    rule, reading exceptions once per batch of rules. Memory stays flat
+    however much data the user has.
+    """
+
+    @staticmethod
+    async def stream_rows(
+        entity: ExportEntity,
+        user_id: int,
+        db: AsyncSession,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> AsyncIterator[BaseModel]:
+        """
+        Stream the user's rows of one entity.
+
+        Args:
+            entity: What to export
+            user_id: User ID
+            db: Database session
+            from_date: Earliest exception, instance or reconciliation date
+                (required for instances)
+            to_date: Latest exception, instance or reconciliation date
+                (required for instances)
+
+        Yields:
+            One row schema per row; instances by scheduled transaction, then
+            date, everything else by ID
+        """
+        if entity == ExportEntity.INSTANCES:
+            async for instance in ExportService._stream_instances(user_id, from_date, to_date, db):
+                yield instance
+            return
+
+        schema = EXPORT_SCHEMAS[entity]
+        query = ExportService._query(entity, user_id, from_date, to_date)
+        result = await db.stream_scalars(
+            query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for row in result:
+            yield schema.model_validate(row)
+
+    @staticmethod
+    def _query(
+        entity: ExportEntity,
+        user_id: int,
+        from_date: date | None,
+        to_date: date | None,
+    ) -> Select:
+        """Build the select for a stored entity."""
+        if entity == ExportEntity.SCHEDULED_TRANSACTIONS:
+            return (
+                select(ScheduledTransaction)
+                .where(ScheduledTransaction.user_id == user_id)
+                .order_by(ScheduledTransaction.id)
+            )
+
+        if entity == ExportEntity.EXCEPTIONS:
+            query = (
+                select(ScheduledTransactionException)
+                .join(
+                    ScheduledTransaction,
+                    ScheduledTransaction.id
+                    == ScheduledTransactionException.scheduled_transaction_id,
+                )
+                .where(ScheduledTransaction.user_id == user_id)
+                .order_by(ScheduledTransactionException.id)
+            )
+            column = ScheduledTransactionException.exception_date
+        else:
+            query = (
+                select(AccountReconciliation)
+                .where(AccountReconciliation.user_id == user_id)
+                .order_by(AccountReconciliation.id)
+            )
+            column = AccountReconciliation.reconciliation_date
+
+        if from_date is not None:
+            query = query.where(column >= from_date)
+        if to_date is not None:
+            query = query.where(column <= to_date)
+        return query
+
+    @staticmethod
+    async def _stream_instances(
+        user_id: int,
+        from_date: date | None,
+        to_date: date | None,
+        db: AsyncSession,
+    ) -> AsyncIterator[ScheduledTransactionInstance]:
+        """Expand the user's rules in the range, one batch of rules at a time."""
+        if from_date is None or to_date is None:
+            raise ValueError("from_date and to_date are required for instances")
+
+        result = await db.stream_scalars(
+            select(ScheduledTransaction)
+            .where(
+                ScheduledTransaction.user_id == user_id,
+                ScheduledTransaction.recurrence_start_date <= to_date,
+            )
+            .order_by(ScheduledTransaction.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        async for rules in result.partitions():
+            exceptions = await RecurrenceService.fetch_exceptions(
+                [r.id for r in rules], from_date, to_date, db
+            )
+            exceptions_by_rule: dict[int, list[ScheduledTransactionException]] = {}
+            for exc in exceptions:
+                exceptions_by_rule.setdefault(exc.scheduled_transaction_id, []).append(exc)
+
+            for rule in rules:
+                for instance in RecurrenceService.expand_transactions(
+                    [rule], exceptions_by_rule.get(rule.id, []), from_date, to_date
+                ):
+                    yield instance
+
+    @staticmethod
+    async def encode(
+        rows: AsyncIterator[BaseModel],
+        schema: type[BaseModel],
+        export_format: ExportFormat,
+    ) -> AsyncIterator[bytes]:
+        """
+        Encode rows as CSV (with a header row) or JSON Lines.
+
+        Args:
+            rows: Row schemas
+            schema: Schema of the rows (gives the CSV columns)
+            export_format: CSV or JSON Lines
+
+        Yields:
+            UTF-8 encoded output in pieces of about WRITE_BUFFER_BYTES
+        """
+        buffer = io.StringIO()
+        writer = None
+        if export_format == ExportFormat.CSV:
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(schema.model_fields)
+
+        async for row in rows:
+            data = row.model_dump(mode="json")
+            if writer is not None:
+                writer.writerow(data.values())
+            else:
+                buffer.write(json.dumps(data))
+                buffer.write("\n")
+
+            if buffer.tell() >= WRITE_BUFFER_BYTES:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    async def zip_stream(chunks: AsyncIterator[bytes], filename: str) -> AsyncIterator[bytes]:
+        """
+        Compress a stream into a single-file ZIP archive, as it arrives.
+
+        Args:
+            chunks: Content of the file
+            filename: Name of the file within the archive
+
+        Yields:
+            The archive, piece by piece
+        """
+        sink = _ZipSink()
+        # An unseekable target makes zipfile write sizes after the data
+        archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED)
+        with archive, archive.open(filename, "w", force_zip64=True) as entry:
+            async for chunk in chunks:
+                entry.write(chunk)
+                data = sink.drain()
+                if data:
+                    yield data
+        yield sink.drain()
@@ -7,6 +7,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.account import Account, AccountType
+from app.schemas.scheduled_transaction import ScheduledTransactionInstance
 from app.services.recurrence_service import RecurrenceService
 
 
@@ -84,6 +85,27 @@ class ForecastService:
             db=db,
         )
 
+        return ForecastService.build_forecasts(list(accounts), instances, from_date, to_date)
+
+    @staticmethod
+    def build_forecasts(
+        accounts: list[Account],
+        instances: list[ScheduledTransactionInstance],
+        from_date: date,
+        to_date: date,
+    ) -> list[AccountForecast]:
+        """
+        Build forecasts from already-loaded accounts and expanded instances.
+
+        Args:
+            accounts: Accounts to forecast
+            instances: Expanded transaction instances covering the date range
+            from_date: Start date for forecast
+            to_date: End date for forecast
+
+        Returns:
+            List of AccountForecast objects with time-series data
+        """
         # Group transactions by date and account
         # Structure: {account_id: {date: [transactions]}}
         # Note: Amount already has the correct sign (positive for income, negative for expenses)
@@ -0,0 +1,328 @@
+"""Incremental parsers for bank export files (CSV, OFX, QIF)."""
+
+import csv
+import re
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from functools import partial
+from typing import TextIO
+
+
+class ParsedTransaction:
+    """One transaction read from an export file."""
+
+    def __init__(
+        self,
+        line: int,
+        transaction_date: date,
+        amount: Decimal,
+        description: str,
+        account: str | None = None,
+        category: str | None = None,
+        note: str | None = None,
+    ):
+        self.line = line
+        self.transaction_date = transaction_date
+        self.amount = amount
+        self.description = description
+        self.account = account
+        self.category = category
+        self.note = note
+
+
+class RowError:
+    """A record of an export file that could not be read."""
+
+    def __init__(self, line: int, message: str):
+        self.line = line
+        self.message = message
+
+
+ParsedRow = ParsedTransaction | RowError
+
+# Tried in order; day-first dotted dates are unambiguous, slashed dates are US order
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%d.%m.%Y", "%Y%m%d")
+
+
+def parse_date(value: str) -> date:
+    """
+    Parse a date as bank exports write it.
+
+    Raises:
+        ValueError: If the value matches none of the known formats
+    """
+    # QIF writes years after 1999 as 1/ 5'24
+    value = value.strip().replace("'", "/").replace(" ", "")
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid date: {value}")
+
+
+def parse_amount(value: str) -> Decimal:
+    """
+    Parse an amount, allowing currency symbols, thousands separators and (negative).
+
+    Raises:
+        ValueError: If the value is not a number
+    """
+    text = value.strip()
+    negative = text.startswith("(") and text.endswith(")")
+    text = re.sub(r"[^0-9.\-+]", "", text.strip("()"))
+    try:
+        amount = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {value}") from None
+    return -amount if negative else amount
+
+
+# Accepted CSV header names per field (compared lowercased)
+_CSV_COLUMNS = {
+    "date": ("date", "transaction date", "booking date", "posted", "posting date"),
+    "amount": ("amount",),
+    "debit": ("debit", "withdrawal"),
+    "credit": ("credit", "deposit"),
+    "description": ("description", "name", "payee"),
+    "account": ("account",),
+    "category": ("category",),
+    "note": ("note", "memo"),
+}
+
+
+def parse_csv(lines: Iterable[str]) -> Iterator[ParsedRow]:
+    """
+    Read transactions from CSV lines, one row at a time.
+
+    The header needs a date and a description column, and either an amount
+    column or debit/credit columns. Account, category and note are optional.
+
+    Args:
+        lines: Lines of the file (with line endings, as from a text file)
+
+    Yields:
+        A ParsedTransaction or RowError per data row
+
+    Raises:
+        ValueError: If the header lacks a required column
+    """
+    reader = csv.DictReader(lines)
+    header = {name.strip().lower(): name for name in reader.fieldnames or [] if name}
+    columns = {
+        field: next((header[alias] for alias in aliases if alias in header), None)
+        for field, aliases in _CSV_COLUMNS.items()
+    }
+    has_amount = columns["amount"] or (columns["debit"] and columns["credit"])
+    if not columns["date"] or not columns["description"] or not has_amount:
+        raise ValueError(
+            "CSV header must include date, description and amount (or debit and credit) columns"
+        )
+
+    for row in reader:
+        fields = {
+            field: (row.get(column) or "").strip() if column else ""
+            for field, column in columns.items()
+        }
+        try:
+            transaction_date = parse_date(fields["date"])
+            if columns["amount"]:
+                amount = parse_amount(fields["amount"])
+            else:
+                amount = parse_amount(fields["credit"] or "0") - parse_amount(
+                    fields["debit"] or "0"
+                )
+        except ValueError as e:
+            yield RowError(reader.line_num, str(e))
+            continue
+
+        if not fields["description"]:
+            yield RowError(reader.line_num, "Missing description")
+            continue
+
+        yield ParsedTransaction(
+            line=reader.line_num,
+            transaction_date=transaction_date,
+            amount=amount,
+            description=fields["description"],
+            account=fields["account"] or None,
+            category=fields["category"] or None,
+            note=fields["note"] or None,
+        )
+
+
+_OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+def parse_ofx(lines: Iterable[str]) -> Iterator[ParsedRow]:
+    """
+    Read transactions from OFX (SGML or XML) text, one STMTTRN at a time.
+
+    Tags are scanned as the text arrives. Fed fixed-size chunks (as
+    read_text does), files that put everything on one line are never held
+    whole; fed lines, each line is.
+
+    Args:
+        lines: Chunks or lines of the file
+
+    Yields:
+        A ParsedTransaction or RowError per STMTTRN, with the account set to
+        the statement's ACCTID
+    """
+    account: str | None = None
+    transaction: dict[str, str] | None = None
+    start_line = 0
+    line = 1
+    buffer = ""
+
+    def handle(closing: str, tag: str, value: str) -> Iterator[ParsedRow]:
+        nonlocal account, transaction, start_line
+        if tag == "STMTTRN":
+            if not closing:
+                transaction = {}
+                start_line = line
+            elif transaction is not None:
+                yield _ofx_transaction(start_line, transaction, account)
+                transaction = None
+        elif not closing and value:
+            if tag == "ACCTID":
+                account = value
+            elif transaction is not None:
+                transaction[tag] = value
+
+    for text in lines:
+        buffer += text
+        # Everything before the last "<" holds only complete tags and values
+        cut = buffer.rfind("<")
+        if cut <= 0:
+            continue
+        position = 0
+        for match in _OFX_TAG.finditer(buffer, 0, cut):
+            line += buffer.count("\n", position, match.start())
+            position = match.start()
+            yield from handle(match[1], match[2].upper(), match[3].strip())
+        line += buffer.count("\n", position, cut)
+        buffer = buffer[cut:]
+
+    for match in _OFX_TAG.finditer(buffer):
+        yield from handle(match[1], match[2].upper(), match[3].strip())
+
+
+def _ofx_transaction(line: int, fields: dict[str, str], account: str | None) -> ParsedRow:
+    try:
+        # DTPOSTED is YYYYMMDD, optionally followed by a time and zone
+        transaction_date = parse_date(fields.get("DTPOSTED", "")[:8])
+        amount = parse_amount(fields.get("TRNAMT", ""))
+    except ValueError as e:
+        return RowError(line, str(e))
+
+    name = fields.get("NAME") or fields.get("PAYEE")
+    memo = fields.get("MEMO")
+    if not name and not memo:
+        return RowError(line, "Missing description")
+
+    return ParsedTransaction(
+        line=line,
+        transaction_date=transaction_date,
+        amount=amount,
+        description=name or memo,
+        account=account,
+        note=memo if name else None,
+    )
+
+
+def parse_qif(lines: Iterable[str]) -> Iterator[ParsedRow]:
+    """
+    Read transactions from QIF lines, one record at a time.
+
+    Args:
+        lines: Lines of the file
+
+    Yields:
+        A ParsedTransaction or RowError per record, with the account set from
+        the preceding !Account block, if any
+    """
+    account: str | None = None
+    in_account_block = False
+    record: dict[str, str] = {}
+    start_line = 0
+
+    for line_number, raw in enumerate(lines, start=1):
+        text = raw.rstrip("\r\n")
+        if not text.strip():
+            continue
+
+        if text.startswith("!"):
+            in_account_block = text.lower().startswith("!account")
+            continue
+
+        code, value = text[0], text[1:].strip()
+        if in_account_block:
+            if code == "N":
+                account = value
+            elif code == "^":
+                in_account_block = False
+            continue
+
+        if code == "^":
+            if record:
+                yield _qif_transaction(start_line, record, account)
+            record = {}
+            continue
+
+        if not record:
+            start_line = line_number
+        record[code] = value
+
+    if record:
+        yield _qif_transaction(start_line, record, account)
+
+
+def _qif_transaction(line: int, fields: dict[str, str], account: str | None) -> ParsedRow:
+    try:
+        transaction_date = parse_date(fields.get("D", ""))
+        amount = parse_amount(fields.get("T") or fields.get("U", ""))
+    except ValueError as e:
+        return RowError(line, str(e))
+
+    payee = fields.get("P")
+    memo = fields.get("M")
+    if not payee and not memo:
+        return RowError(line, "Missing description")
+
+    # [Account] categories are transfers, which have no category here
+    category = fields.get("L")
+    if category and category.startswith("["):
+        category = None
+
+    return ParsedTransaction(
+        line=line,
+        transaction_date=transaction_date,
+        amount=amount,
+        description=payee or memo,
+        account=account,
+        category=category or None,
+        note=memo if payee else None,
+    )
+
+
+PARSERS = {"csv": parse_csv, "ofx": parse_ofx, "qif": parse_qif}
+
+# OFX need not have line breaks, so it is read in pieces of this many characters
+OFX_READ_CHARS = 64 * 1024
+
+
+def read_text(file: TextIO, file_format: str) -> Iterable[str]:
+    """Iterate a file the way its parser reads it: by line, or by fixed-size chunk for OFX."""
+    if file_format == "ofx":
+        return iter(partial(file.read, OFX_READ_CHARS), "")
+    return file
+
+
+def detect_format(filename: str | None) -> str | None:
+    """Guess the file format from its extension (.csv, .ofx/.qfx, .qif)."""
+    if not filename or "." not in filename:
+        return None
+    extension = filename.rsplit(".", 1)[1].lower()
+    return {"csv": "csv", "ofx": "ofx", "qfx": "ofx", "qif": "qif"}.get(extension)
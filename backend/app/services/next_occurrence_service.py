@@ -0,0 +1,213 @@
+"""Service for the persisted next occurrence date of scheduled transactions."""
+
+import logging
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.scheduling import run_daily
+from app.models.scheduled_transaction import ScheduledTransaction
+from app.schemas.scheduled_transaction import ScheduledTransactionInstance
+from app.services.recurrence_service import RecurrenceService
+
+logger = logging.getLogger(__name__)
+
+
+class NextOccurrenceService:
+    """
+    Service for scheduled_transactions.next_occurrence_date.
+
+    The column holds a rule's first occurrence on or after the day it was
+    computed. It is set whenever a rule is inserted or updated through the
+    ORM (bulk Core inserts set it themselves) and advanced shortly after
+    midnight for rules whose date has passed; that pass also fills in rules
+    that are missing it but have not ended. Between those, a stored date
+    can only be early, never late, which is all get_upcoming needs to answer
+    "what's next" from an ORDER BY ... LIMIT query.
+    """
+
+    @staticmethod
+    def compute(transaction: ScheduledTransaction, today: date | None = None) -> date | None:
+        """
+        Compute a rule's next occurrence date.
+
+        Args:
+            transaction: The scheduled transaction
+            today: Reference date (defaults to today)
+
+        Returns:
+            First occurrence on or after today, or None if the rule has ended
+        """
+        return RecurrenceService.first_occurrence(transaction, today or date.today())
+
+    @staticmethod
+    async def refresh(
+        db: AsyncSession,
+        stale_only: bool = True,
+        user_id: int | None = None,
+        today: date | None = None,
+        batch_size: int | None = None,
+    ) -> int:
+        """
+        Recompute stored next occurrence dates. Commits after every batch.
+
+        Args:
+            db: Database session
+            stale_only: Only rules whose stored date has passed, or is
+                missing although the rule has not ended (the daily job);
+                False recomputes every rule
+            user_id: Only this user's rules (all users if None)
+            today: Reference date (defaults to today)
+            batch_size: Rules per batch (defaults to the setting)
+
+        Returns:
+            Number of rules recomputed
+        """
+        today = today or date.today()
+        batch_size = batch_size or settings.NEXT_OCCURRENCE_REFRESH_BATCH_SIZE
+        started = time.perf_counter()
+        refreshed = 0
+        last_id = 0
+
+        while True:
+            query = (
+                select(ScheduledTransaction)
+                .where(ScheduledTransaction.id > last_id)
+                .order_by(ScheduledTransaction.id)
+                .limit(batch_size)
+            )
+            if stale_only:
+                query = query.where(NextOccurrenceService._stale(today))
+            if user_id is not None:
+                query = query.where(ScheduledTransaction.user_id == user_id)
+            rules = list((await db.execute(query)).scalars().all())
+            if not rules:
+                break
+            last_id = rules[-1].id
+
+            # Bulk UPDATE by primary key: one statement per batch, no ORM events
+            await db.execute(
+                update(ScheduledTransaction),
+                [
+                    {
+                        "id": rule.id,
+                        "next_occurrence_date": NextOccurrenceService.compute(rule, today),
+                    }
+                    for rule in rules
+                ],
+            )
+            await db.commit()
+            db.expunge_all()
+            refreshed += len(rules)
+
+        logger.info(
+            "Next occurrence dates refreshed",
+            extra={
+                "stale_only": stale_only,
+                "user_id": user_id,
+                "refreshed_count": refreshed,
+                "elapsed_seconds": round(time.perf_counter() - started, 3),
+            },
+        )
+        return refreshed
+
+    @staticmethod
+    def _stale(today: date):
+        """Rules whose stored date has passed, or is missing although they may still occur."""
+        next_date = ScheduledTransaction.next_occurrence_date
+        return or_(
+            next_date < today,
+            and_(
+                next_date.is_(None),
+                or_(
+                    and_(
+                        ScheduledTransaction.is_recurring,
+                        or_(
+                            ScheduledTransaction.recurrence_end_date.is_(None),
+                            ScheduledTransaction.recurrence_end_date >= today,
+                        ),
+                    ),
+                    and_(
+                        ~ScheduledTransaction.is_recurring,
+                        ScheduledTransaction.recurrence_start_date >= today,
+                    ),
+                ),
+            ),
+        )
+
+    @staticmethod
+    async def get_upcoming(
+        user_id: int,
+        db: AsyncSession,
+        limit: int,
+        to_date: date | None = None,
+        today: date | None = None,
+    ) -> list[ScheduledTransactionInstance]:
+        """
+        Get a user's next instances, reading only the rules that come next.
+
+        Rules are read in next_occurrence_date order, k at a time. Every rule
+        after the first k has a stored (and so a true) next occurrence no
+        earlier than the k-th one's, so instances before that date are
+        complete. If they are fewer than limit (or exceptions skipped some),
+        k doubles.
+
+        Args:
+            user_id: User ID
+            db: Database session
+            limit: Maximum number of instances to return
+            to_date: Optional latest instance date
+            today: Earliest instance date (defaults to today)
+
+        Returns:
+            Up to `limit` instances, sorted by date
+        """
+        today = today or date.today()
+        batch = limit * 2
+
+        while True:
+            query = (
+                select(ScheduledTransaction)
+                .where(
+                    ScheduledTransaction.user_id == user_id,
+                    ScheduledTransaction.next_occurrence_date.is_not(None),
+                )
+                .order_by(ScheduledTransaction.next_occurrence_date, ScheduledTransaction.id)
+                .limit(batch)
+            )
+            if to_date is not None:
+                query = query.where(ScheduledTransaction.next_occurrence_date <= to_date)
+            rules = list((await db.execute(query)).scalars().all())
+
+            complete = len(rules) < batch
+            horizon = to_date or date.max
+            if not complete:
+                horizon = min(horizon, rules[-1].next_occurrence_date - timedelta(days=1))
+
+            exceptions = await RecurrenceService.fetch_exceptions(
+                [r.id for r in rules], today, horizon, db
+            )
+            instances = RecurrenceService.next_instances(
+                rules, exceptions, today, limit, to_date=horizon
+            )
+            if complete or len(instances) >= limit:
+                return instances
+            batch *= 2
+
+    @staticmethod
+    async def run_scheduler() -> None:
+        """Advance passed next occurrence dates shortly after every date change, until cancelled."""
+        await run_daily(
+            NextOccurrenceService._run_refresh,
+            settings.NEXT_OCCURRENCE_REFRESH_DELAY_SECONDS,
+            "next_occurrence_refresh",
+        )
+
+    @staticmethod
+    async def _run_refresh() -> None:
+        async with AsyncSessionLocal() as db:
+            await NextOccurrenceService.refresh(db)
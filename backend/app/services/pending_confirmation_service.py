@@ -0,0 +1,146 @@
+"""Service for instances waiting for account confirmation."""
+
+from datetime import date, timedelta
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account import Account, AccountType
+from app.models.scheduled_transaction import ScheduledTransaction, ScheduledTransactionException
+from app.schemas.scheduled_transaction import ScheduledTransactionInstance
+from app.services.recurrence_service import RecurrenceService
+
+# How far back unconfirmed instances are looked for
+LOOKBACK_DAYS = 365
+
+
+class PendingConfirmationService:
+    """
+    Service for past instances booked on the PLANNING account.
+
+    An instance needs confirmation when it is dated today or earlier, lands
+    on the user's PLANNING account and its status is still 'completed'. Only
+    rules that can produce such an instance are read: those on the PLANNING
+    account, and those with an exception moving an occurrence onto it.
+    """
+
+    @staticmethod
+    async def _load(
+        user_id: int,
+        db: AsyncSession,
+    ) -> tuple[int | None, list[ScheduledTransaction], list[ScheduledTransactionException]]:
+        """
+        Load the PLANNING account ID and the candidate rules with their exceptions.
+
+        Returns:
+            (planning account ID or None, rules, exceptions within the lookback window)
+        """
+        planning_result = await db.execute(
+            select(Account.id).where(
+                Account.user_id == user_id,
+                Account.type == AccountType.PLANNING,
+                Account.is_active,
+            )
+        )
+        planning_account_id = planning_result.scalar_one_or_none()
+        if planning_account_id is None:
+            return None, [], []
+
+        today = date.today()
+        from_date = today - timedelta(days=LOOKBACK_DAYS)
+
+        moved_to_planning = select(ScheduledTransactionException.scheduled_transaction_id).where(
+            ScheduledTransactionException.account_id == planning_account_id,
+            ScheduledTransactionException.exception_date >= from_date,
+            ScheduledTransactionException.exception_date <= today,
+        )
+        rule_result = await db.execute(
+            select(ScheduledTransaction).where(
+                ScheduledTransaction.user_id == user_id,
+                or_(
+                    ScheduledTransaction.account_id == planning_account_id,
+                    ScheduledTransaction.id.in_(moved_to_planning),
+                ),
+            )
+        )
+        rules = list(rule_result.scalars().all())
+
+        exceptions = await RecurrenceService.fetch_exceptions(
+            [r.id for r in rules], from_date, today, db
+        )
+        return planning_account_id, rules, exceptions
+
+    @staticmethod
+    async def get_pending(user_id: int, db: AsyncSession) -> list[ScheduledTransactionInstance]:
+        """
+        Get the instances that need account confirmation.
+
+        Args:
+            user_id: User ID
+            db: Database session
+
+        Returns:
+            Pending instances, sorted by date
+        """
+        planning_account_id, rules, exceptions = await PendingConfirmationService._load(user_id, db)
+        if planning_account_id is None:
+            return []
+
+        today = date.today()
+        instances = RecurrenceService.expand_transactions(
+            rules, exceptions, today - timedelta(days=LOOKBACK_DAYS), today
+        )
+        return [
+            inst
+            for inst in instances
+            if inst.account_id == planning_account_id and inst.status == "completed"
+        ]
+
+    @staticmethod
+    async def count_pending(user_id: int, db: AsyncSession) -> int:
+        """
+        Count the instances that need account confirmation.
+
+        Same result as len(get_pending(...)), but occurrences are counted in
+        closed form and only the exceptions are looked at one by one, so the
+        cost does not grow with how often the rules recur.
+
+        Args:
+            user_id: User ID
+            db: Database session
+
+        Returns:
+            Number of pending instances
+        """
+        planning_account_id, rules, exceptions = await PendingConfirmationService._load(user_id, db)
+        if planning_account_id is None:
+            return 0
+
+        today = date.today()
+        from_date = today - timedelta(days=LOOKBACK_DAYS)
+
+        # One exception per occurrence; the last one wins, as in expansion
+        exceptions_by_key = {(e.scheduled_transaction_id, e.exception_date): e for e in exceptions}
+        exceptions_by_rule: dict[int, list[ScheduledTransactionException]] = {}
+        for exc in exceptions_by_key.values():
+            exceptions_by_rule.setdefault(exc.scheduled_transaction_id, []).append(exc)
+
+        count = 0
+        for rule in rules:
+            on_planning = rule.account_id == planning_account_id
+            if on_planning:
+                # Without exceptions every past occurrence is pending
+                count += RecurrenceService.count_occurrences(rule, from_date, today)
+
+            for exc in exceptions_by_rule.get(rule.id, []):
+                if not RecurrenceService.is_occurrence(rule, exc.exception_date):
+                    continue
+                account_id = exc.account_id if exc.account_id is not None else rule.account_id
+                pending = (
+                    not exc.is_deleted
+                    and account_id == planning_account_id
+                    and (exc.status or "completed") == "completed"
+                )
+                count += int(pending) - int(on_planning)
+
+        return count
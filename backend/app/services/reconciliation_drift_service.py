@@ -0,0 +1,328 @@
+"""Service for reconciliation drift statistics."""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import case, delete, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account import Account
+from app.models.reconciliation import AccountReconciliation
+from app.models.reconciliation_drift import ReconciliationDriftStat
+
+CENT = Decimal("0.01")
+
+
+class DriftMonth:
+    """Drift of one account within one month."""
+
+    def __init__(
+        self,
+        month: date,
+        count: int,
+        mean_difference: Decimal,
+        min_difference: Decimal,
+        max_difference: Decimal,
+    ):
+        self.month = month
+        self.count = count
+        self.mean_difference = mean_difference
+        self.min_difference = min_difference
+        self.max_difference = max_difference
+
+    @property
+    def max_abs_difference(self) -> Decimal:
+        """Largest difference in the month, by magnitude."""
+        return max(abs(self.min_difference), abs(self.max_difference))
+
+
+class AccountDrift:
+    """Drift statistics of one account over a range of months."""
+
+    def __init__(
+        self,
+        account_id: int,
+        account_name: str,
+        count: int,
+        mean_difference: Decimal,
+        stddev_difference: Decimal | None,
+        min_difference: Decimal,
+        max_difference: Decimal,
+        trend_per_month: Decimal | None,
+        worst_months: list[DriftMonth],
+    ):
+        self.account_id = account_id
+        self.account_name = account_name
+        self.count = count
+        self.mean_difference = mean_difference
+        self.stddev_difference = stddev_difference
+        self.min_difference = min_difference
+        self.max_difference = max_difference
+        self.trend_per_month = trend_per_month
+        self.worst_months = worst_months
+
+
+class ReconciliationDriftService:
+    """
+    Service for drift between planned and actual balances.
+
+    Each reconciliation's difference is folded into a running aggregate of
+    its account and month (count, sum, sum of squares, min, max) when it is
+    created, and taken out again when it is deleted. Reads combine those
+    aggregates and never scan the reconciliations themselves.
+    """
+
+    @staticmethod
+    def _month(d: date) -> date:
+        return d.replace(day=1)
+
+    @staticmethod
+    async def add(reconciliations: Iterable[AccountReconciliation], db: AsyncSession) -> None:
+        """
+        Fold new reconciliations into the drift statistics.
+
+        Call this within the transaction that creates them. Nothing is committed.
+
+        Args:
+            reconciliations: Newly created reconciliations
+            db: Database session
+        """
+        buckets: dict[tuple[int, int, date], list[Decimal]] = defaultdict(list)
+        for recon in reconciliations:
+            key = (
+                recon.user_id,
+                recon.account_id,
+                ReconciliationDriftService._month(recon.reconciliation_date),
+            )
+            buckets[key].append(recon.difference)
+
+        for (user_id, account_id, month), differences in buckets.items():
+            count = len(differences)
+            total = sum(differences, Decimal("0"))
+            total_squares = sum((d * d for d in differences), Decimal("0"))
+            low = min(differences)
+            high = max(differences)
+
+            # One upsert, so concurrent writes to the same month add up, and two
+            # first writes for it cannot both insert
+            stat = ReconciliationDriftStat.__table__
+            insert = (
+                postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+            )
+            statement = insert(stat).values(
+                user_id=user_id,
+                account_id=account_id,
+                month=month,
+                count=count,
+                total=total,
+                total_squares=total_squares,
+                min_difference=low,
+                max_difference=high,
+            )
+            excluded = statement.excluded
+            await db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[stat.c.user_id, stat.c.account_id, stat.c.month],
+                    set_={
+                        "count": stat.c.count + excluded.count,
+                        "total": stat.c.total + excluded.total,
+                        "total_squares": stat.c.total_squares + excluded.total_squares,
+                        "min_difference": case(
+                            (
+                                stat.c.min_difference > excluded.min_difference,
+                                excluded.min_difference,
+                            ),
+                            else_=stat.c.min_difference,
+                        ),
+                        "max_difference": case(
+                            (
+                                stat.c.max_difference < excluded.max_difference,
+                                excluded.max_difference,
+                            ),
+                            else_=stat.c.max_difference,
+                        ),
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+
+        await db.flush()
+
+    @staticmethod
+    async def remove(reconciliation: AccountReconciliation, db: AsyncSession) -> None:
+        """
+        Take a deleted reconciliation out of the drift statistics.
+
+        Call this after flushing the delete, within the same transaction.
+        Nothing is committed.
+
+        Args:
+            reconciliation: The deleted reconciliation
+            db: Database session
+        """
+        month = ReconciliationDriftService._month(reconciliation.reconciliation_date)
+        difference = reconciliation.difference
+        bucket = (
+            ReconciliationDriftStat.user_id == reconciliation.user_id,
+            ReconciliationDriftStat.account_id == reconciliation.account_id,
+            ReconciliationDriftStat.month == month,
+        )
+
+        result = await db.execute(
+            update(ReconciliationDriftStat)
+            .where(*bucket)
+            .values(
+                count=ReconciliationDriftStat.count - 1,
+                total=ReconciliationDriftStat.total - difference,
+                total_squares=ReconciliationDriftStat.total_squares - difference * difference,
+            )
+            .returning(
+                ReconciliationDriftStat.count,
+                ReconciliationDriftStat.min_difference,
+                ReconciliationDriftStat.max_difference,
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return
+
+        if row.count <= 0:
+            await db.execute(delete(ReconciliationDriftStat).where(*bucket))
+        elif difference in (row.min_difference, row.max_difference):
+            # Min and max cannot be taken back; rescan the rest of this month only
+            next_month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+            extremes = await db.execute(
+                select(
+                    func.min(AccountReconciliation.difference),
+                    func.max(AccountReconciliation.difference),
+                ).where(
+                    AccountReconciliation.user_id == reconciliation.user_id,
+                    AccountReconciliation.account_id == reconciliation.account_id,
+                    AccountReconciliation.reconciliation_date >= month,
+                    AccountReconciliation.reconciliation_date < next_month,
+                )
+            )
+            low, high = extremes.one()
+            await db.execute(
+                update(ReconciliationDriftStat)
+                .where(*bucket)
+                .values(min_difference=low, max_difference=high)
+            )
+
+    @staticmethod
+    async def get_drift(
+        user_id: int,
+        db: AsyncSession,
+        account_id: int | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        worst_month_count: int = 3,
+    ) -> list[AccountDrift]:
+        """
+        Get drift statistics per account.
+
+        Args:
+            user_id: User ID
+            db: Database session
+            account_id: Optional account to limit the statistics to
+            from_date: Only months on or after the month of this date
+            to_date: Only months on or before the month of this date
+            worst_month_count: Number of worst months to report per account
+
+        Returns:
+            One AccountDrift per account with reconciliations, by account name
+        """
+        query = (
+            select(ReconciliationDriftStat, Account.name)
+            .join(Account, Account.id == ReconciliationDriftStat.account_id)
+            .where(ReconciliationDriftStat.user_id == user_id)
+        )
+        if account_id is not None:
+            query = query.where(ReconciliationDriftStat.account_id == account_id)
+        if from_date is not None:
+            query = query.where(
+                ReconciliationDriftStat.month >= ReconciliationDriftService._month(from_date)
+            )
+        if to_date is not None:
+            query = query.where(
+                ReconciliationDriftStat.month <= ReconciliationDriftService._month(to_date)
+            )
+        query = query.order_by(Account.name, Account.id, ReconciliationDriftStat.month)
+
+        result = await db.execute(query)
+
+        by_account: dict[int, tuple[str, list[ReconciliationDriftStat]]] = {}
+        for stat, account_name in result:
+            by_account.setdefault(stat.account_id, (account_name, []))[1].append(stat)
+
+        return [
+            ReconciliationDriftService._combine(acc_id, name, stats, worst_month_count)
+            for acc_id, (name, stats) in by_account.items()
+        ]
+
+    @staticmethod
+    def _combine(
+        account_id: int,
+        account_name: str,
+        stats: list[ReconciliationDriftStat],
+        worst_month_count: int,
+    ) -> AccountDrift:
+        """Combine an account's monthly aggregates (in month order) into its drift."""
+        count = sum(s.count for s in stats)
+        total = sum((Decimal(s.total) for s in stats), Decimal("0"))
+        total_squares = sum((Decimal(s.total_squares) for s in stats), Decimal("0"))
+
+        mean = total / count
+        stddev = None
+        if count > 1:
+            # Sample variance from the running sums; rounding can dip just below zero
+            variance = (total_squares - total * total / count) / (count - 1)
+            stddev = max(variance, Decimal("0")).sqrt().quantize(CENT)
+
+        months = [
+            DriftMonth(
+                month=s.month,
+                count=s.count,
+                mean_difference=(Decimal(s.total) / s.count).quantize(CENT),
+                min_difference=s.min_difference,
+                max_difference=s.max_difference,
+            )
+            for s in stats
+        ]
+
+        return AccountDrift(
+            account_id=account_id,
+            account_name=account_name,
+            count=count,
+            mean_difference=mean.quantize(CENT),
+            stddev_difference=stddev,
+            min_difference=min(s.min_difference for s in stats),
+            max_difference=max(s.max_difference for s in stats),
+            trend_per_month=ReconciliationDriftService._trend(months),
+            worst_months=sorted(months, key=lambda m: m.max_abs_difference, reverse=True)[
+                :worst_month_count
+            ],
+        )
+
+    @staticmethod
+    def _trend(months: list[DriftMonth]) -> Decimal | None:
+        """
+        Least-squares slope of the monthly mean difference, per month.
+
+        A positive trend means reality is pulling ahead of the plan over time.
+        None with fewer than two months.
+        """
+        if len(months) < 2:
+            return None
+
+        xs = [Decimal(m.month.year * 12 + m.month.month) for m in months]
+        ys = [m.mean_difference for m in months]
+        x_mean = sum(xs) / len(xs)
+        y_mean = sum(ys) / len(ys)
+
+        covariance = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys, strict=True))
+        spread = sum((x - x_mean) ** 2 for x in xs)
+        return (covariance / spread).quantize(CENT)
@@ -1,16 +1,47 @@
 """Service for account reconciliation."""
 
+import base64
 from datetime import date
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import or_, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.account import Account
+from app.models.account import Account, AccountType
 from app.models.category import Category
 from app.models.reconciliation import AccountReconciliation
-from app.models.scheduled_transaction import ScheduledTransaction
-from app.services.forecast_service import ForecastService
+from app.models.scheduled_transaction import ScheduledTransaction, ScheduledTransactionException
+from app.schemas.reconciliation import ReconciliationCreate
+from app.services.balance_rollup_service import BalanceRollupService
+from app.services.data_version_service import DataVersionService
+from app.services.reconciliation_drift_service import ReconciliationDriftService
+from app.services.recurrence_service import RecurrenceService
+
+
+class BulkReconciliationResult:
+    """Outcome of one row of a bulk reconciliation."""
+
+    def __init__(
+        self,
+        account_id: int,
+        reconciliation: AccountReconciliation | None = None,
+        error: str | None = None,
+    ):
+        self.account_id = account_id
+        self.reconciliation = reconciliation
+        self.error = error
+
+
+class ReconciliationPage:
+    """One page of the reconciliation history."""
+
+    def __init__(
+        self,
+        items: list[tuple[AccountReconciliation, str]],
+        next_cursor: str | None,
+    ):
+        self.items = items  # (reconciliation, account name), newest first
+        self.next_cursor = next_cursor
 
 
 class ReconciliationService:
@@ -44,57 +75,140 @@ class ReconciliationService:
         Raises:
             ValueError: If account not found or not owned by user
         """
-        # Verify account ownership
+        [result] = await ReconciliationService.create_reconciliations(
+            user_id,
+            [
+                ReconciliationCreate(
+                    account_id=account_id,
+                    reconciliation_date=reconciliation_date,
+                    actual_balance=actual_balance,
+                    create_adjustment=create_adjustment,
+                    note=note,
+                )
+            ],
+            db,
+        )
+        if result.error:
+            raise ValueError(result.error)
+        return result.reconciliation
+
+    @staticmethod
+    async def create_reconciliations(
+        user_id: int,
+        items: list[ReconciliationCreate],
+        db: AsyncSession,
+    ) -> list[BulkReconciliationResult]:
+        """
+        Create several reconciliations in one transaction.
+
+        Accounts, rules and exceptions are loaded once for all rows, and each
+        expected balance is computed from that shared data. Adjustments created
+        for earlier rows count towards later rows of the same account, exactly
+        as if the rows had been submitted one at a time in order. Rows whose
+        account is invalid are reported and skipped; the rest commit together.
+
+        Args:
+            user_id: User ID
+            items: Reconciliations to create
+            db: Database session
+
+        Returns:
+            One result per item, in the same order
+        """
+        account_ids = {item.account_id for item in items}
         account_result = await db.execute(
             select(Account).where(
-                Account.id == account_id,
+                Account.id.in_(account_ids),
                 Account.user_id == user_id,
                 Account.is_active,
             )
         )
-        account = account_result.scalar_one_or_none()
-        if not account:
-            raise ValueError("Account not found or not owned by user")
-
-        # Calculate expected balance using forecast
-        expected_balance = await ReconciliationService._calculate_expected_balance(
-            user_id=user_id,
-            account_id=account_id,
-            target_date=reconciliation_date,
-            db=db,
-        )
+        accounts = {acc.id: acc for acc in account_result.scalars().all()}
+
+        valid_items = [item for item in items if item.account_id in accounts]
+        rules: list[ScheduledTransaction] = []
+        exceptions: list[ScheduledTransactionException] = []
+        if valid_items:
+            rules, exceptions = await ReconciliationService._load_rule_data(
+                user_id,
+                set(accounts),
+                min(
+                    min(accounts[i.account_id].initial_balance_date, i.reconciliation_date)
+                    for i in valid_items
+                ),
+                max(i.reconciliation_date for i in valid_items),
+                db,
+            )
 
-        # Calculate difference
-        difference = actual_balance - expected_balance
+        adjustment_category: Category | None = None
+        results: list[BulkReconciliationResult] = []
+        reconciliations: list[AccountReconciliation] = []
+
+        for item in items:
+            account = accounts.get(item.account_id)
+            if account is None:
+                results.append(
+                    BulkReconciliationResult(
+                        item.account_id, error="Account not found or not owned by user"
+                    )
+                )
+                continue
+
+            expected_balance = ReconciliationService._expected_balance(
+                account, item.reconciliation_date, rules, exceptions
+            )
+            difference = item.actual_balance - expected_balance
 
-        # Create adjustment transaction if needed and requested
-        adjustment_transaction_id = None
-        if create_adjustment and difference != 0:
-            adjustment_transaction_id = await ReconciliationService._create_adjustment_transaction(
+            reconciliation = AccountReconciliation(
                 user_id=user_id,
-                account_id=account_id,
-                reconciliation_date=reconciliation_date,
+                account_id=account.id,
+                reconciliation_date=item.reconciliation_date,
+                expected_balance=expected_balance,
+                actual_balance=item.actual_balance,
                 difference=difference,
-                db=db,
+                note=item.note,
             )
 
-        # Create reconciliation record
-        reconciliation = AccountReconciliation(
-            user_id=user_id,
-            account_id=account_id,
-            reconciliation_date=reconciliation_date,
-            expected_balance=expected_balance,
-            actual_balance=actual_balance,
-            difference=difference,
-            adjustment_transaction_id=adjustment_transaction_id,
-            note=note,
-        )
+            # Create adjustment transaction if needed and requested
+            if item.create_adjustment and difference != 0:
+                if adjustment_category is None:
+                    adjustment_category = await ReconciliationService._get_adjustment_category(
+                        difference, db
+                    )
+                adjustment = ReconciliationService._build_adjustment_transaction(
+                    user_id, account.id, item.reconciliation_date, difference, adjustment_category
+                )
+                reconciliation.adjustment_transaction = adjustment
+                # Later rows see this adjustment, as they would in separate requests
+                rules.append(adjustment)
+
+            db.add(reconciliation)
+            reconciliations.append(reconciliation)
+            results.append(BulkReconciliationResult(account.id, reconciliation=reconciliation))
+
+        if not reconciliations:
+            return results
 
-        db.add(reconciliation)
+        await db.flush()
+        await ReconciliationDriftService.add(reconciliations, db)
+        from_date = min(r.reconciliation_date for r in reconciliations)
+        await BalanceRollupService.refresh(user_id, db, from_date=from_date)
+        await DataVersionService.bump(
+            user_id,
+            db,
+            account_ids={r.account_id for r in reconciliations},
+            from_date=from_date,
+        )
         await db.commit()
-        await db.refresh(reconciliation)
 
-        return reconciliation
+        # Load server-generated columns for all rows in one query
+        await db.execute(
+            select(AccountReconciliation)
+            .where(AccountReconciliation.id.in_([r.id for r in reconciliations]))
+            .execution_options(populate_existing=True)
+        )
+
+        return results
 
     @staticmethod
     async def _calculate_expected_balance(
@@ -104,7 +218,7 @@ class ReconciliationService:
         db: AsyncSession,
     ) -> Decimal:
         """
-        Calculate expected balance at target date using forecast.
+        Calculate expected balance at target date.
 
         Args:
             user_id: User ID
@@ -115,56 +229,142 @@ class ReconciliationService:
         Returns:
             Expected balance at target date
         """
-        # Get account to determine initial balance date
         account_result = await db.execute(select(Account).where(Account.id == account_id))
         account = account_result.scalar_one()
 
-        # Calculate forecast from initial balance date to target date
-        # This ensures all transactions up to target_date are included
-        from_date = min(account.initial_balance_date, target_date)
+        rules, exceptions = await ReconciliationService._load_rule_data(
+            user_id,
+            {account_id},
+            min(account.initial_balance_date, target_date),
+            target_date,
+            db,
+        )
+        return ReconciliationService._expected_balance(account, target_date, rules, exceptions)
 
-        forecasts = await ForecastService.calculate_forecast(
-            user_id=user_id,
-            from_date=from_date,
-            to_date=target_date,
-            db=db,
-            account_ids=[account_id],
+    @staticmethod
+    async def _load_rule_data(
+        user_id: int,
+        account_ids: set[int],
+        from_date: date,
+        to_date: date,
+        db: AsyncSession,
+    ) -> tuple[list[ScheduledTransaction], list[ScheduledTransactionException]]:
+        """
+        Load the rules and exceptions that can move the given accounts' balances.
+
+        That is the accounts' own rules, plus exceptions within the range that
+        are on those rules or move another rule's occurrence onto one of the
+        accounts (together with those other rules).
+
+        Returns:
+            Tuple of (rules, exceptions with at most one per occurrence)
+        """
+        exc_result = await db.execute(
+            select(ScheduledTransactionException)
+            .join(
+                ScheduledTransaction,
+                ScheduledTransactionException.scheduled_transaction_id == ScheduledTransaction.id,
+            )
+            .where(
+                ScheduledTransaction.user_id == user_id,
+                ScheduledTransactionException.exception_date >= from_date,
+                ScheduledTransactionException.exception_date <= to_date,
+                or_(
+                    ScheduledTransaction.account_id.in_(account_ids),
+                    ScheduledTransactionException.account_id.in_(account_ids),
+                ),
+            )
+        )
+        # One exception per occurrence, as in expansion
+        exceptions = list(
+            {
+                (exc.scheduled_transaction_id, exc.exception_date): exc
+                for exc in exc_result.scalars().all()
+            }.values()
         )
 
-        if not forecasts:
-            # No forecast data, return initial balance
+        rule_result = await db.execute(
+            select(ScheduledTransaction).where(
+                ScheduledTransaction.user_id == user_id,
+                or_(
+                    ScheduledTransaction.account_id.in_(account_ids),
+                    ScheduledTransaction.id.in_(
+                        {exc.scheduled_transaction_id for exc in exceptions}
+                    ),
+                ),
+            )
+        )
+        return list(rule_result.scalars().all()), exceptions
+
+    @staticmethod
+    def _expected_balance(
+        account: Account,
+        target_date: date,
+        rules: list[ScheduledTransaction],
+        exceptions: list[ScheduledTransactionException],
+    ) -> Decimal:
+        """
+        Compute an account's expected balance at target date from loaded rules.
+
+        Equals the forecast's balance on target_date, but in closed form: the
+        initial balance plus, per rule on the account, its occurrence count
+        times its amount, corrected by the exceptions in the window. No daily
+        series is built and other accounts' rules are never expanded.
+
+        Args:
+            account: The account
+            target_date: Date to calculate balance for
+            rules: Rules that can affect the account (others are ignored)
+            exceptions: Exceptions of those rules (at most one per occurrence)
+
+        Returns:
+            Expected balance at target date
+        """
+        if not account.is_active or account.type == AccountType.PLANNING:
+            # Not forecast: the balance stays at the initial balance
             return account.initial_balance
 
-        # Get balance for target date (last data point)
-        account_forecast = forecasts[0]
-        if account_forecast.data_points:
-            # Return the balance of the last data point (target_date)
-            return account_forecast.data_points[-1].balance
+        # Same window the forecast would cover
+        from_date = min(account.initial_balance_date, target_date)
 
-        return account_forecast.starting_balance
+        balance = account.initial_balance
+        for rule in rules:
+            if rule.account_id == account.id:
+                count = RecurrenceService.count_occurrences(rule, from_date, target_date)
+                balance += rule.amount * count
+
+        rules_by_id = {rule.id: rule for rule in rules if rule.id is not None}
+        for exc in exceptions:
+            if not from_date <= exc.exception_date <= target_date:
+                continue
+            rule = rules_by_id[exc.scheduled_transaction_id]
+            # Exceptions only apply on actual occurrence dates
+            if not RecurrenceService.is_occurrence(rule, exc.exception_date):
+                continue
+
+            # Replace the rule's default contribution with the exception's
+            if rule.account_id == account.id:
+                balance -= rule.amount
+            if exc.is_deleted:
+                continue
+            instance_account_id = exc.account_id if exc.account_id is not None else rule.account_id
+            if instance_account_id == account.id:
+                balance += exc.amount if exc.amount else rule.amount
+
+        return balance
 
     @staticmethod
-    async def _create_adjustment_transaction(
-        user_id: int,
-        account_id: int,
-        reconciliation_date: date,
-        difference: Decimal,
-        db: AsyncSession,
-    ) -> int:
+    async def _get_adjustment_category(difference: Decimal, db: AsyncSession) -> Category:
         """
-        Create adjustment transaction to correct balance difference.
+        Find or create the "Reconciliation Adjustment" system category.
 
         Args:
-            user_id: User ID
-            account_id: Account ID
-            reconciliation_date: Date of reconciliation
-            difference: Balance difference (positive = add money, negative = remove)
+            difference: Balance difference of the first adjustment (sets the type if created)
             db: Database session
 
         Returns:
-            ID of created adjustment transaction
+            The category
         """
-        # Find or create "Reconciliation Adjustment" category
         category_result = await db.execute(
             select(Category).where(
                 Category.name == "Reconciliation Adjustment",
@@ -185,10 +385,33 @@ class ReconciliationService:
             db.add(category)
             await db.flush()
 
+        return category
+
+    @staticmethod
+    def _build_adjustment_transaction(
+        user_id: int,
+        account_id: int,
+        reconciliation_date: date,
+        difference: Decimal,
+        category: Category,
+    ) -> ScheduledTransaction:
+        """
+        Build (but don't add) an adjustment transaction correcting a balance difference.
+
+        Args:
+            user_id: User ID
+            account_id: Account ID
+            reconciliation_date: Date of reconciliation
+            difference: Balance difference (positive = add money, negative = remove)
+            category: Adjustment category
+
+        Returns:
+            The adjustment transaction
+        """
         # Create one-time scheduled transaction for adjustment
         adjustment_name = f"Reconciliation Adjustment ({'+' if difference > 0 else ''}{difference})"
 
-        adjustment = ScheduledTransaction(
+        return ScheduledTransaction(
             user_id=user_id,
             account_id=account_id,
             category_id=category.id,
@@ -200,10 +423,97 @@ class ReconciliationService:
             note="Automatic adjustment from reconciliation",
         )
 
-        db.add(adjustment)
-        await db.flush()
+    @staticmethod
+    async def list_reconciliations(
+        user_id: int,
+        db: AsyncSession,
+        account_id: int | None = None,
+        from_date: date | None = None,
+        to_date: date | None = None,
+        has_adjustment: bool | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> ReconciliationPage:
+        """
+        Get a page of reconciliations with their account names, newest first.
+
+        Pages are keyed on (reconciliation_date, id) rather than an offset,
+        so each page is an index range scan however deep the history goes.
+
+        Args:
+            user_id: User ID
+            db: Database session
+            account_id: Only this account
+            from_date: Only reconciliations on or after this date
+            to_date: Only reconciliations on or before this date
+            has_adjustment: Only those with (True) or without (False) an adjustment
+            cursor: next_cursor of the previous page (None for the first page)
+            limit: Maximum rows per page (None returns every row as one page)
+
+        Returns:
+            The page, with next_cursor set if there are more rows
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = (
+            select(AccountReconciliation, Account.name)
+            .join(Account, AccountReconciliation.account_id == Account.id)
+            .where(AccountReconciliation.user_id == user_id)
+        )
 
-        return adjustment.id
+        if account_id is not None:
+            query = query.where(AccountReconciliation.account_id == account_id)
+        if from_date is not None:
+            query = query.where(AccountReconciliation.reconciliation_date >= from_date)
+        if to_date is not None:
+            query = query.where(AccountReconciliation.reconciliation_date <= to_date)
+        if has_adjustment is not None:
+            query = query.where(
+                AccountReconciliation.adjustment_transaction_id.is_not(None)
+                if has_adjustment
+                else AccountReconciliation.adjustment_transaction_id.is_(None)
+            )
+        if cursor is not None:
+            after_date, after_id = ReconciliationService._decode_cursor(cursor)
+            query = query.where(
+                tuple_(AccountReconciliation.reconciliation_date, AccountReconciliation.id)
+                < tuple_(after_date, after_id)
+            )
+
+        query = query.order_by(
+            AccountReconciliation.reconciliation_date.desc(),
+            AccountReconciliation.id.desc(),
+        )
+        if limit is not None:
+            # One extra row tells whether there is a next page
+            query = query.limit(limit + 1)
+        result = await db.execute(query)
+        items = [(reconciliation, name) for reconciliation, name in result.all()]
+
+        next_cursor = None
+        if limit is not None and len(items) > limit:
+            items = items[:limit]
+            last = items[-1][0]
+            next_cursor = ReconciliationService._encode_cursor(last.reconciliation_date, last.id)
+
+        return ReconciliationPage(items, next_cursor)
+
+    @staticmethod
+    def _encode_cursor(reconciliation_date: date, reconciliation_id: int) -> str:
+        """Encode a page position as an opaque cursor."""
+        raw = f"{reconciliation_date.isoformat()}:{reconciliation_id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[date, int]:
+        """Decode a cursor from _encode_cursor."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            date_part, id_part = raw.split(":")
+            return date.fromisoformat(date_part), int(id_part)
+        except (ValueError, UnicodeDecodeError):
+            raise ValueError("Invalid cursor") from None
 
     @staticmethod
     async def get_reconciliations(
@@ -267,6 +577,17 @@ class ReconciliationService:
             raise ValueError("Reconciliation not owned by user")
 
         await db.delete(reconciliation)
+        await db.flush()
+        await ReconciliationDriftService.remove(reconciliation, db)
+        await BalanceRollupService.refresh(
+            user_id, db, from_date=reconciliation.reconciliation_date
+        )
+        await DataVersionService.bump(
+            user_id,
+            db,
+            account_ids=[reconciliation.account_id],
+            from_date=reconciliation.reconciliation_date,
+        )
         await db.commit()
 
         return True
@@ -1,6 +1,8 @@
 """Service for handling recurring transaction expansion and calculation."""
 
 import calendar
+import heapq
+from collections.abc import Iterable, Iterator
 from datetime import date, timedelta
 
 from sqlalchemy import and_, select
@@ -12,6 +14,7 @@ from app.models.scheduled_transaction import (
     ScheduledTransactionException,
 )
 from app.schemas.scheduled_transaction import ScheduledTransactionInstance
+from app.services.rule_index_service import RuleIndexCache
 
 
 class RecurrenceService:
@@ -184,32 +187,123 @@ class RecurrenceService:
         Returns:
             List of transaction instances (sorted by date)
         """
-        # Fetch all scheduled transactions for this user
+        # Only the rules that can occur in the range, from the user's cached rule index
+        transactions = await RuleIndexCache.get_rules(user_id, from_date, to_date, db)
+
+        return await RecurrenceService._expand_with_exceptions(transactions, from_date, to_date, db)
+
+    @staticmethod
+    async def expand_rules(
+        user_id: int,
+        transaction_ids: Iterable[int],
+        from_date: date,
+        to_date: date,
+        db: AsyncSession,
+    ) -> list[ScheduledTransactionInstance]:
+        """
+        Expand only the given scheduled transactions of a user within a date range.
+
+        Only these rules and their own exceptions are loaded, so per-rule
+        operations cost the same however many other rules the user has.
+
+        Args:
+            user_id: User ID (rules of other users are ignored)
+            transaction_ids: Scheduled transaction IDs to expand
+            from_date: Start date of range
+            to_date: End date of range
+            db: Database session
+
+        Returns:
+            List of transaction instances (sorted by date)
+        """
+        transaction_ids = list(transaction_ids)
+        if not transaction_ids:
+            return []
+
         result = await db.execute(
-            select(ScheduledTransaction).where(ScheduledTransaction.user_id == user_id)
+            select(ScheduledTransaction).where(
+                ScheduledTransaction.user_id == user_id,
+                ScheduledTransaction.id.in_(transaction_ids),
+            )
         )
-        transactions = result.scalars().all()
+        transactions = list(result.scalars().all())
 
-        # Fetch all exceptions in the date range for these transactions
-        transaction_ids = [t.id for t in transactions]
-        exceptions_dict = {}
+        return await RecurrenceService._expand_with_exceptions(transactions, from_date, to_date, db)
+
+    @staticmethod
+    async def _expand_with_exceptions(
+        transactions: list[ScheduledTransaction],
+        from_date: date,
+        to_date: date,
+        db: AsyncSession,
+    ) -> list[ScheduledTransactionInstance]:
+        """Fetch the exceptions of loaded transactions in the range and expand them."""
+        exceptions = await RecurrenceService.fetch_exceptions(
+            [t.id for t in transactions], from_date, to_date, db
+        )
+
+        return RecurrenceService.expand_transactions(transactions, exceptions, from_date, to_date)
 
-        if transaction_ids:
-            exceptions_result = await db.execute(
-                select(ScheduledTransactionException).where(
-                    and_(
-                        ScheduledTransactionException.scheduled_transaction_id.in_(transaction_ids),
-                        ScheduledTransactionException.exception_date >= from_date,
-                        ScheduledTransactionException.exception_date <= to_date,
-                    )
+    @staticmethod
+    async def fetch_exceptions(
+        transaction_ids: list[int],
+        from_date: date,
+        to_date: date,
+        db: AsyncSession,
+    ) -> list[ScheduledTransactionException]:
+        """
+        Fetch exceptions for the given transactions within a date range.
+
+        Args:
+            transaction_ids: Scheduled transaction IDs
+            from_date: Start date of range
+            to_date: End date of range
+            db: Database session
+
+        Returns:
+            List of exceptions (empty if no transaction IDs given)
+        """
+        if not transaction_ids:
+            return []
+
+        result = await db.execute(
+            select(ScheduledTransactionException).where(
+                and_(
+                    ScheduledTransactionException.scheduled_transaction_id.in_(transaction_ids),
+                    ScheduledTransactionException.exception_date >= from_date,
+                    ScheduledTransactionException.exception_date <= to_date,
                 )
             )
-            exceptions = exceptions_result.scalars().all()
+        )
+        return list(result.scalars().all())
 
-            # Group exceptions by (transaction_id, date)
-            for exc in exceptions:
-                key = (exc.scheduled_transaction_id, exc.exception_date)
-                exceptions_dict[key] = exc
+    @staticmethod
+    def expand_transactions(
+        transactions: list[ScheduledTransaction],
+        exceptions: list[ScheduledTransactionException],
+        from_date: date,
+        to_date: date,
+    ) -> list[ScheduledTransactionInstance]:
+        """
+        Expand already-loaded transactions into instances within a date range.
+
+        Used by callers that load rules and exceptions once and expand them
+        several times (e.g. the dashboard), avoiding repeated queries.
+
+        Args:
+            transactions: Scheduled transactions to expand
+            exceptions: Exceptions for these transactions covering the range
+            from_date: Start date of range
+            to_date: End date of range
+
+        Returns:
+            List of transaction instances (sorted by date)
+        """
+        # Group exceptions by (transaction_id, date)
+        exceptions_dict = {}
+        for exc in exceptions:
+            key = (exc.scheduled_transaction_id, exc.exception_date)
+            exceptions_dict[key] = exc
 
         # Generate instances
         instances = []
@@ -257,58 +351,179 @@ class RecurrenceService:
         )
 
         for occurrence_date in occurrence_dates:
-            # Check for exception
-            exception_key = (transaction.id, occurrence_date)
-            exception = exceptions_dict.get(exception_key)
-
-            if exception and exception.is_deleted:
-                # Skip this occurrence
-                continue
-
-            # Determine account_id (exception overrides transaction)
-            account_id = (
-                exception.account_id
-                if (exception and exception.account_id is not None)
-                else transaction.account_id
+            instance = RecurrenceService._build_instance(
+                transaction,
+                occurrence_date,
+                exceptions_dict.get((transaction.id, occurrence_date)),
             )
+            if instance is not None:
+                instances.append(instance)
 
-            # Determine to_account_id (exception overrides transaction)
-            to_account_id = (
-                exception.to_account_id
-                if (exception and exception.to_account_id is not None)
-                else transaction.to_account_id
-            )
+        return instances
 
-            # Calculate status
-            status = RecurrenceService._calculate_instance_status(
-                occurrence_date, account_id, exception
-            )
+    @staticmethod
+    def _build_instance(
+        transaction: ScheduledTransaction,
+        occurrence_date: date,
+        exception: ScheduledTransactionException | None,
+    ) -> ScheduledTransactionInstance | None:
+        """
+        Build the instance of a transaction on one occurrence date.
+
+        Args:
+            transaction: The scheduled transaction
+            occurrence_date: The occurrence date
+            exception: The exception for this occurrence, if any
+
+        Returns:
+            The instance, or None if the occurrence is deleted
+        """
+        if exception and exception.is_deleted:
+            # Skip this occurrence
+            return None
 
-            # Create instance
-            instance = ScheduledTransactionInstance(
-                date=occurrence_date,
-                scheduled_transaction_id=transaction.id,
-                is_exception=exception is not None,
-                exception_id=exception.id if exception else None,
-                name=transaction.name,
-                amount=exception.amount if (exception and exception.amount) else transaction.amount,
-                currency=transaction.currency,
-                account_id=account_id,
-                to_account_id=to_account_id,
-                category_id=transaction.category_id,
-                note=(
-                    exception.note
-                    if (exception and exception.note is not None)
-                    else transaction.note
-                ),
-                is_deleted=False,  # Already filtered out deleted ones
-                is_recurring=transaction.is_recurring,
-                status=status,
+        # Determine account_id (exception overrides transaction)
+        account_id = (
+            exception.account_id
+            if (exception and exception.account_id is not None)
+            else transaction.account_id
+        )
+
+        # Determine to_account_id (exception overrides transaction)
+        to_account_id = (
+            exception.to_account_id
+            if (exception and exception.to_account_id is not None)
+            else transaction.to_account_id
+        )
+
+        # Calculate status
+        status = RecurrenceService._calculate_instance_status(
+            occurrence_date, account_id, exception
+        )
+
+        return ScheduledTransactionInstance(
+            date=occurrence_date,
+            scheduled_transaction_id=transaction.id,
+            is_exception=exception is not None,
+            exception_id=exception.id if exception else None,
+            name=transaction.name,
+            amount=exception.amount if (exception and exception.amount) else transaction.amount,
+            currency=transaction.currency,
+            account_id=account_id,
+            to_account_id=to_account_id,
+            category_id=transaction.category_id,
+            note=(
+                exception.note if (exception and exception.note is not None) else transaction.note
+            ),
+            is_deleted=False,  # Already filtered out deleted ones
+            is_recurring=transaction.is_recurring,
+            status=status,
+        )
+
+    @staticmethod
+    def next_instances(
+        transactions: list[ScheduledTransaction],
+        exceptions: list[ScheduledTransactionException],
+        from_date: date,
+        limit: int,
+        to_date: date | None = None,
+    ) -> list[ScheduledTransactionInstance]:
+        """
+        Get the next `limit` instances on or after from_date across all transactions.
+
+        Each transaction's occurrences are generated lazily and merged through a
+        min-heap keyed by next occurrence date, so only about `limit` occurrences
+        are ever produced: O(R + N log R) for R rules, rather than expanding and
+        sorting every instance in the window.
+
+        Args:
+            transactions: Scheduled transactions to draw from
+            exceptions: Exceptions for these transactions from from_date onwards
+            from_date: Earliest instance date
+            limit: Maximum number of instances to return
+            to_date: Optional latest instance date
+
+        Returns:
+            Up to `limit` instances, sorted by date (ties in transaction order)
+        """
+        exceptions_dict = {
+            (exc.scheduled_transaction_id, exc.exception_date): exc for exc in exceptions
+        }
+
+        # Heap entries are (next date, transaction index, occurrence iterator)
+        heap: list[tuple[date, int, Iterator[date]]] = []
+        for index, transaction in enumerate(transactions):
+            occurrences = RecurrenceService._iter_occurrences(transaction, from_date)
+            first = next(occurrences, None)
+            if first is not None:
+                heap.append((first, index, occurrences))
+        heapq.heapify(heap)
+
+        instances: list[ScheduledTransactionInstance] = []
+        while heap and len(instances) < limit:
+            occurrence_date, index, occurrences = heap[0]
+            if to_date is not None and occurrence_date > to_date:
+                break
+
+            transaction = transactions[index]
+            instance = RecurrenceService._build_instance(
+                transaction,
+                occurrence_date,
+                exceptions_dict.get((transaction.id, occurrence_date)),
             )
-            instances.append(instance)
+            if instance is not None:
+                instances.append(instance)
+
+            following = next(occurrences, None)
+            if following is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (following, index, occurrences))
 
         return instances
 
+    @staticmethod
+    def first_occurrence(transaction: ScheduledTransaction, from_date: date) -> date | None:
+        """
+        Get a transaction's first occurrence on or after a date.
+
+        Args:
+            transaction: The scheduled transaction
+            from_date: Earliest date
+
+        Returns:
+            The occurrence date, or None if the transaction has ended by then
+        """
+        return next(RecurrenceService._iter_occurrences(transaction, from_date), None)
+
+    @staticmethod
+    def _iter_occurrences(transaction: ScheduledTransaction, from_date: date) -> Iterator[date]:
+        """
+        Lazily yield occurrence dates of a transaction on or after from_date.
+
+        Args:
+            transaction: The scheduled transaction
+            from_date: Start date
+
+        Yields:
+            Occurrence dates in ascending order
+        """
+        if not transaction.is_recurring:
+            # One-time transaction
+            if transaction.recurrence_start_date >= from_date:
+                yield transaction.recurrence_start_date
+            return
+
+        current_date = max(from_date, transaction.recurrence_start_date) - timedelta(days=1)
+
+        # Safety limit to prevent infinite loops
+        for _ in range(10000):
+            next_date = RecurrenceService.calculate_next_occurrence(transaction, current_date)
+            if next_date is None:
+                return
+            yield next_date
+            current_date = next_date
+
     @staticmethod
     def _generate_occurrences(
         transaction: ScheduledTransaction,
@@ -365,6 +580,75 @@ class RecurrenceService:
 
         return dates
 
+    @staticmethod
+    def count_occurrences(
+        transaction: ScheduledTransaction,
+        from_date: date,
+        to_date: date,
+    ) -> int:
+        """
+        Count occurrence dates of a transaction within a range, without generating them.
+
+        A monthly rule occurs exactly once per month and a yearly rule once per
+        year, so the count is the number of periods whose occurrence falls
+        inside the range (intersected with the rule's own start and end).
+
+        Args:
+            transaction: The scheduled transaction
+            from_date: Start date
+            to_date: End date
+
+        Returns:
+            Number of occurrences (same dates _generate_occurrences would produce)
+        """
+        if not transaction.is_recurring:
+            return 1 if from_date <= transaction.recurrence_start_date <= to_date else 0
+
+        first = max(from_date, transaction.recurrence_start_date)
+        last = to_date
+        if transaction.recurrence_end_date and transaction.recurrence_end_date < last:
+            last = transaction.recurrence_end_date
+        if first > last:
+            return 0
+
+        day_of_month = transaction.recurrence_day_of_month
+
+        if transaction.recurrence_frequency == RecurrenceFrequency.MONTHLY:
+            # Periods are months, numbered year * 12 + month
+            first_period = first.year * 12 + first.month - 1
+            if RecurrenceService._get_monthly_date(first.year, first.month, day_of_month) < first:
+                first_period += 1
+            last_period = last.year * 12 + last.month - 1
+            if RecurrenceService._get_monthly_date(last.year, last.month, day_of_month) > last:
+                last_period -= 1
+            return max(0, last_period - first_period + 1)
+
+        if transaction.recurrence_frequency == RecurrenceFrequency.YEARLY:
+            month_of_year = transaction.recurrence_month_of_year
+            first_year = first.year
+            if RecurrenceService._get_monthly_date(first_year, month_of_year, day_of_month) < first:
+                first_year += 1
+            last_year = last.year
+            if RecurrenceService._get_monthly_date(last_year, month_of_year, day_of_month) > last:
+                last_year -= 1
+            return max(0, last_year - first_year + 1)
+
+        return 0
+
+    @staticmethod
+    def is_occurrence(transaction: ScheduledTransaction, on_date: date) -> bool:
+        """
+        Check whether a transaction occurs on a date.
+
+        Args:
+            transaction: The scheduled transaction
+            on_date: Date to check
+
+        Returns:
+            True if on_date is one of the transaction's occurrence dates
+        """
+        return RecurrenceService.count_occurrences(transaction, on_date, on_date) == 1
+
     @staticmethod
     def _calculate_instance_status(
         occurrence_date: date,
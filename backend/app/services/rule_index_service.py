@@ -0,0 +1,178 @@
+"""Per-user interval index over scheduled transaction lifetimes."""
+
+from collections import OrderedDict
+from datetime import date
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.scheduled_transaction import ScheduledTransaction
+from app.models.user import User
+from app.services.change_event_service import ChangeEventService
+
+
+class RuleIntervalIndex:
+    """
+    Static interval tree over rule lifetimes.
+
+    Rules are sorted by start date and viewed as a balanced binary tree (the
+    middle of each range is its root), each node annotated with the latest
+    end date in its subtree. A window query skips every subtree that ends
+    before the window or starts after it, so it costs O(log n + k) for k
+    overlapping rules instead of a scan of all n.
+    """
+
+    def __init__(self, rules: list[ScheduledTransaction]):
+        lifetimes = sorted(
+            ((*RuleIntervalIndex.lifetime(rule), rule) for rule in rules),
+            key=lambda item: (item[0], item[2].id),
+        )
+        self._starts = [start for start, _, _ in lifetimes]
+        self._ends = [end for _, end, _ in lifetimes]
+        self._rules = [rule for _, _, rule in lifetimes]
+        # Latest end within the subtree rooted at each position
+        self._max_ends = list(self._ends)
+        self._annotate(0, len(self._rules))
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    @staticmethod
+    def lifetime(rule: ScheduledTransaction) -> tuple[date, date]:
+        """First and last day a rule can occur on (date.max if it never ends)."""
+        start = rule.recurrence_start_date
+        if not rule.is_recurring:
+            return start, start
+        return start, rule.recurrence_end_date or date.max
+
+    def _annotate(self, lo: int, hi: int) -> date:
+        """Fill in the subtree maxima for positions lo..hi-1; return theirs."""
+        if lo >= hi:
+            return date.min
+        mid = (lo + hi) // 2
+        self._max_ends[mid] = max(
+            self._ends[mid], self._annotate(lo, mid), self._annotate(mid + 1, hi)
+        )
+        return self._max_ends[mid]
+
+    def overlapping(self, from_date: date, to_date: date) -> list[ScheduledTransaction]:
+        """
+        Get the rules whose lifetime overlaps a date range.
+
+        Args:
+            from_date: Start date of range
+            to_date: End date of range
+
+        Returns:
+            Rules that may occur within the range, by start date
+        """
+        found: list[tuple[int, ScheduledTransaction]] = []
+        stack = [(0, len(self._rules))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_ends[mid] < from_date:
+                # Everything below ended before the range
+                continue
+            stack.append((lo, mid))
+            if self._starts[mid] <= to_date:
+                if self._ends[mid] >= from_date:
+                    found.append((mid, self._rules[mid]))
+                stack.append((mid + 1, hi))
+
+        found.sort(key=lambda item: item[0])
+        return [rule for _, rule in found]
+
+
+class RuleIndexCache:
+    """
+    Per-process cache of each user's rule interval index.
+
+    An index is built from a snapshot of the user's rules and stays current
+    while the user's data version is unchanged; the data version bump of any
+    write makes the next read rebuild it. The snapshot holds transient
+    copies of the rules, never attached to a session, so sharing them
+    between requests is safe as long as they are only read. Bounded to
+    RULE_INDEX_MAX_USERS users, least recently used first out.
+    """
+
+    _entries: OrderedDict[int, tuple[int, RuleIntervalIndex]] = OrderedDict()
+
+    @staticmethod
+    async def get_rules(
+        user_id: int,
+        from_date: date,
+        to_date: date,
+        db: AsyncSession,
+    ) -> list[ScheduledTransaction]:
+        """
+        Get a user's rules that may occur within a date range.
+
+        Args:
+            user_id: User ID
+            from_date: Start date of range
+            to_date: End date of range
+            db: Database session
+
+        Returns:
+            Rules whose lifetime overlaps the range (read-only)
+        """
+        if ChangeEventService.has_pending(db, user_id):
+            # Uncommitted writes: their data version may yet be rolled back and reused
+            return await RuleIndexCache._load_overlapping(user_id, from_date, to_date, db)
+
+        # Read the version before the rules, so a snapshot is never newer than its label
+        version_result = await db.execute(select(User.data_version).where(User.id == user_id))
+        data_version = version_result.scalar_one()
+
+        entry = RuleIndexCache._entries.get(user_id)
+        if entry is not None and entry[0] == data_version:
+            RuleIndexCache._entries.move_to_end(user_id)
+            return entry[1].overlapping(from_date, to_date)
+
+        index = RuleIntervalIndex(await RuleIndexCache._load_snapshot(user_id, db))
+        entry = RuleIndexCache._entries.get(user_id)
+        # A concurrent request may have stored a newer snapshot meanwhile
+        if entry is None or entry[0] <= data_version:
+            RuleIndexCache._entries[user_id] = (data_version, index)
+            RuleIndexCache._entries.move_to_end(user_id)
+            while len(RuleIndexCache._entries) > settings.RULE_INDEX_MAX_USERS:
+                RuleIndexCache._entries.popitem(last=False)
+
+        return index.overlapping(from_date, to_date)
+
+    @staticmethod
+    def invalidate() -> None:
+        """Drop all cached indexes."""
+        RuleIndexCache._entries.clear()
+
+    @staticmethod
+    async def _load_snapshot(user_id: int, db: AsyncSession) -> list[ScheduledTransaction]:
+        """Load all of a user's rules as transient copies."""
+        columns = ScheduledTransaction.__table__.columns
+        result = await db.execute(select(*columns).where(ScheduledTransaction.user_id == user_id))
+        return [ScheduledTransaction(**row._mapping) for row in result]
+
+    @staticmethod
+    async def _load_overlapping(
+        user_id: int, from_date: date, to_date: date, db: AsyncSession
+    ) -> list[ScheduledTransaction]:
+        """Load the rules overlapping a range straight from the session."""
+        result = await db.execute(
+            select(ScheduledTransaction).where(
+                ScheduledTransaction.user_id == user_id,
+                ScheduledTransaction.recurrence_start_date <= to_date,
+                or_(
+                    ScheduledTransaction.recurrence_start_date >= from_date,
+                    ScheduledTransaction.is_recurring
+                    & or_(
+                        ScheduledTransaction.recurrence_end_date.is_(None),
+                        ScheduledTransaction.recurrence_end_date >= from_date,
+                    ),
+                ),
+            )
+        )
+        return list(result.scalars().all())
@@ -0,0 +1,428 @@
+"""Service for applying many scheduled transaction operations at once."""
+
+import logging
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account import Account
+from app.models.category import Category, CategoryType
+from app.models.scheduled_transaction import ScheduledTransaction, ScheduledTransactionException
+from app.schemas.scheduled_transaction import (
+    ScheduledTransactionBatchCreate,
+    ScheduledTransactionBatchOperation,
+    ScheduledTransactionBatchUpdate,
+)
+from app.services.data_version_service import DataVersionService
+
+logger = logging.getLogger(__name__)
+
+# Columns an update may not set to null
+_REQUIRED_FIELDS = (
+    "name",
+    "amount",
+    "currency",
+    "account_id",
+    "category_id",
+    "is_recurring",
+    "recurrence_start_date",
+)
+
+
+class BatchOperationResult:
+    """Result of one batch operation."""
+
+    def __init__(
+        self,
+        op: str,
+        transaction_id: int | None = None,
+        transaction: ScheduledTransaction | None = None,
+        error: str | None = None,
+        deleted_ids: list[int] | None = None,
+    ):
+        self.op = op
+        self.transaction_id = transaction_id
+        self.transaction = transaction
+        self.error = error
+        self.deleted_ids = deleted_ids or []
+
+
+class ScheduledTransactionBatchService:
+    """
+    Service for batches of scheduled transaction operations.
+
+    Every account, category and rule an operation refers to is loaded with
+    one IN query per kind, so validation costs the same for one operation or
+    hundreds. Operations that fail validation are reported and skipped; the
+    others are written together and committed once.
+    """
+
+    @staticmethod
+    async def apply(
+        user_id: int,
+        operations: list[ScheduledTransactionBatchOperation],
+        db: AsyncSession,
+    ) -> list[BatchOperationResult]:
+        """
+        Apply create, update and delete operations in order.
+
+        Updates and deletes apply to the whole series, like PUT and DELETE in
+        ALL mode. Creates may link to each other by ref (e.g. the two sides of
+        a transfer); a create whose link target fails fails too. Deleting a
+        rule also deletes the rules linked to or from it, as DELETE does; the
+        delete result lists them all, and an earlier update of one of them
+        is reported as not applied.
+
+        Args:
+            user_id: User ID
+            operations: Operations to apply
+            db: Database session
+
+        Returns:
+            One result per operation, in the same order
+        """
+        accounts, categories, rules = await ScheduledTransactionBatchService._load_references(
+            user_id, operations, db
+        )
+        # Link graph around every referenced rule, so deletes know what they cascade to
+        link_rows = await ScheduledTransactionBatchService._load_link_graph(user_id, set(rules), db)
+
+        results: list[BatchOperationResult] = []
+        created: dict[int, ScheduledTransaction] = {}
+        refs: dict[str, int] = {}
+        updated: dict[int, ScheduledTransaction] = {}
+        deleted_ids: set[int] = set()
+        affected_account_ids: set[int | None] = set()
+
+        def check_references(
+            account_id: int | None,
+            to_account_id: int | None,
+            category_id: int | None,
+            linked_transaction_id: int | None,
+        ) -> str | None:
+            if account_id is not None and account_id not in accounts:
+                return "Account not found"
+            if to_account_id is not None:
+                if to_account_id not in accounts:
+                    return "Destination account not found"
+                if to_account_id == account_id:
+                    return "Source and destination accounts must be different"
+            if category_id is not None and category_id not in categories:
+                return "Category not found"
+            if linked_transaction_id is not None and (
+                linked_transaction_id not in rules or linked_transaction_id in deleted_ids
+            ):
+                return "Linked transaction not found"
+            return None
+
+        for index, operation in enumerate(operations):
+            if isinstance(operation, ScheduledTransactionBatchCreate):
+                data = operation.data
+                error = check_references(
+                    data.account_id,
+                    data.to_account_id,
+                    data.category_id,
+                    data.linked_transaction_id,
+                )
+                if error is None and operation.ref is not None:
+                    if operation.ref in refs:
+                        error = f"Duplicate ref: {operation.ref}"
+                    elif operation.link_ref == operation.ref:
+                        error = "A transaction cannot link to itself"
+                if error is not None:
+                    results.append(BatchOperationResult("create", error=error))
+                    continue
+
+                transaction_dict = data.model_dump()
+                # Sign follows the category type, as in single creates
+                if categories[data.category_id].type == CategoryType.EXPENSE:
+                    transaction_dict["amount"] = -abs(data.amount)
+                else:
+                    transaction_dict["amount"] = abs(data.amount)
+
+                transaction = ScheduledTransaction(user_id=user_id, **transaction_dict)
+                db.add(transaction)
+                created[index] = transaction
+                if operation.ref is not None:
+                    refs[operation.ref] = index
+                affected_account_ids |= {transaction.account_id, transaction.to_account_id}
+                results.append(BatchOperationResult("create", transaction=transaction))
+
+            elif isinstance(operation, ScheduledTransactionBatchUpdate):
+                transaction = rules.get(operation.id)
+                if transaction is None or operation.id in deleted_ids:
+                    results.append(
+                        BatchOperationResult(
+                            "update", operation.id, error="Scheduled transaction not found"
+                        )
+                    )
+                    continue
+
+                update_data = operation.data.model_dump(exclude_unset=True)
+                error = next(
+                    (
+                        f"{field} cannot be null"
+                        for field in _REQUIRED_FIELDS
+                        if field in update_data and update_data[field] is None
+                    ),
+                    None,
+                )
+                account_id = update_data.get("account_id", transaction.account_id)
+                to_account_id = update_data.get("to_account_id", transaction.to_account_id)
+                start_date = update_data.get(
+                    "recurrence_start_date", transaction.recurrence_start_date
+                )
+                end_date = update_data.get("recurrence_end_date", transaction.recurrence_end_date)
+                error = error or check_references(
+                    update_data.get("account_id"),
+                    to_account_id if "to_account_id" in update_data else None,
+                    update_data.get("category_id"),
+                    update_data.get("linked_transaction_id"),
+                )
+                if error is None and to_account_id is not None and to_account_id == account_id:
+                    error = "Source and destination accounts must be different"
+                if error is None and end_date is not None and start_date and end_date < start_date:
+                    error = "recurrence_end_date must be on or after recurrence_start_date"
+                if error is not None:
+                    results.append(BatchOperationResult("update", operation.id, error=error))
+                    continue
+
+                affected_account_ids |= {transaction.account_id, transaction.to_account_id}
+                for field, value in update_data.items():
+                    setattr(transaction, field, value)
+                affected_account_ids |= {transaction.account_id, transaction.to_account_id}
+                updated[index] = transaction
+                results.append(
+                    BatchOperationResult("update", operation.id, transaction=transaction)
+                )
+
+            else:
+                transaction = rules.get(operation.id)
+                error = None
+                cascade: set[int] = set()
+                if transaction is None or operation.id in deleted_ids:
+                    error = "Scheduled transaction not found"
+                else:
+                    cascade = ScheduledTransactionBatchService._linked_set(
+                        operation.id, link_rows, rules, deleted_ids
+                    )
+                    if any(t.linked_transaction_id in cascade for t in created.values()):
+                        error = (
+                            "Scheduled transaction is linked by a transaction created in this batch"
+                        )
+                if error is not None:
+                    results.append(BatchOperationResult("delete", operation.id, error=error))
+                    continue
+
+                # Updates of rules this delete cascades to are not applied after all
+                for update_index, updated_transaction in list(updated.items()):
+                    if updated_transaction.id in cascade:
+                        del updated[update_index]
+                        results[update_index] = BatchOperationResult(
+                            "update",
+                            updated_transaction.id,
+                            error="Scheduled transaction deleted by a later operation",
+                        )
+                deleted_ids |= cascade
+                for rule_id in cascade:
+                    affected_account_ids |= ScheduledTransactionBatchService._accounts_of(
+                        rule_id, link_rows, rules
+                    )
+                results.append(
+                    BatchOperationResult("delete", operation.id, deleted_ids=sorted(cascade))
+                )
+
+        # A create linking to a ref that failed (or does not exist) fails too
+        links = {
+            index: operation.link_ref
+            for index, operation in enumerate(operations)
+            if index in created
+            and isinstance(operation, ScheduledTransactionBatchCreate)
+            and operation.link_ref is not None
+        }
+        changed = True
+        while changed:
+            changed = False
+            for index, link_ref in links.items():
+                if index in created and refs.get(link_ref) not in created:
+                    db.expunge(created.pop(index))
+                    results[index] = BatchOperationResult(
+                        "create", error=f"Linked ref not created: {link_ref}"
+                    )
+                    changed = True
+
+        if not created and not updated and not deleted_ids:
+            return results
+
+        # One flush writes all creates (as a multi-row insert) and updates
+        await db.flush()
+        for index, link_ref in links.items():
+            if index in created:
+                created[index].linked_transaction_id = created[refs[link_ref]].id
+        for index, transaction in created.items():
+            results[index].transaction_id = transaction.id
+
+        if deleted_ids:
+            await ScheduledTransactionBatchService._delete_rules(deleted_ids, db)
+
+        await DataVersionService.bump(user_id, db, account_ids=affected_account_ids)
+        await db.commit()
+
+        # Load server-generated columns for all written rows in one query
+        written_ids = [t.id for t in (*created.values(), *updated.values())]
+        if written_ids:
+            await db.execute(
+                select(ScheduledTransaction)
+                .where(ScheduledTransaction.id.in_(written_ids))
+                .execution_options(populate_existing=True)
+            )
+
+        logger.info(
+            "Scheduled transaction batch applied",
+            extra={
+                "user_id": user_id,
+                "created_count": len(created),
+                "updated_count": len(updated),
+                "deleted_count": len(deleted_ids),
+                "error_count": sum(1 for r in results if r.error is not None),
+            },
+        )
+
+        return results
+
+    @staticmethod
+    async def _load_references(
+        user_id: int,
+        operations: list[ScheduledTransactionBatchOperation],
+        db: AsyncSession,
+    ) -> tuple[dict[int, Account], dict[int, Category], dict[int, ScheduledTransaction]]:
+        """Load the accounts, categories and rules the operations refer to, one query each."""
+        account_ids: set[int] = set()
+        category_ids: set[int] = set()
+        rule_ids: set[int] = set()
+
+        for operation in operations:
+            if operation.op == "delete":
+                rule_ids.add(operation.id)
+                continue
+            if operation.op == "update":
+                rule_ids.add(operation.id)
+            data = operation.data
+            account_ids |= {data.account_id, data.to_account_id} - {None}
+            if data.category_id is not None:
+                category_ids.add(data.category_id)
+            if data.linked_transaction_id is not None:
+                rule_ids.add(data.linked_transaction_id)
+
+        accounts: dict[int, Account] = {}
+        if account_ids:
+            result = await db.execute(
+                select(Account).where(Account.id.in_(account_ids), Account.user_id == user_id)
+            )
+            accounts = {acc.id: acc for acc in result.scalars().all()}
+
+        categories: dict[int, Category] = {}
+        if category_ids:
+            # System categories or the user's own
+            result = await db.execute(
+                select(Category).where(
+                    Category.id.in_(category_ids),
+                    or_(Category.is_system, Category.user_id == user_id),
+                )
+            )
+            categories = {cat.id: cat for cat in result.scalars().all()}
+
+        rules: dict[int, ScheduledTransaction] = {}
+        if rule_ids:
+            result = await db.execute(
+                select(ScheduledTransaction).where(
+                    ScheduledTransaction.id.in_(rule_ids),
+                    ScheduledTransaction.user_id == user_id,
+                )
+            )
+            rules = {rule.id: rule for rule in result.scalars().all()}
+
+        return accounts, categories, rules
+
+    @staticmethod
+    async def _load_link_graph(
+        user_id: int, rule_ids: set[int], db: AsyncSession
+    ) -> dict[int, tuple[int | None, int, int | None]]:
+        """
+        Load every rule linked to or from the given rules, transitively.
+
+        Returns:
+            (linked_transaction_id, account_id, to_account_id) by rule ID
+        """
+        rows: dict[int, tuple[int | None, int, int | None]] = {}
+        searched: set[int] = set()
+        frontier = set(rule_ids)
+        while frontier:
+            searched |= frontier
+            result = await db.execute(
+                select(
+                    ScheduledTransaction.id,
+                    ScheduledTransaction.linked_transaction_id,
+                    ScheduledTransaction.account_id,
+                    ScheduledTransaction.to_account_id,
+                ).where(
+                    ScheduledTransaction.user_id == user_id,
+                    or_(
+                        ScheduledTransaction.id.in_(frontier),
+                        ScheduledTransaction.linked_transaction_id.in_(frontier),
+                    ),
+                )
+            )
+            reached: set[int] = set()
+            for rule_id, linked_id, account_id, to_account_id in result:
+                rows[rule_id] = (linked_id, account_id, to_account_id)
+                reached |= {rule_id, linked_id} - {None}
+            frontier = reached - searched
+        return rows
+
+    @staticmethod
+    def _linked_set(
+        rule_id: int,
+        link_rows: dict[int, tuple[int | None, int, int | None]],
+        rules: dict[int, ScheduledTransaction],
+        deleted_ids: set[int],
+    ) -> set[int]:
+        """Rules deleting rule_id removes, following links as earlier updates left them."""
+        neighbours: dict[int, set[int]] = {}
+        for other_id, (linked_id, _, _) in link_rows.items():
+            if other_id in rules:
+                linked_id = rules[other_id].linked_transaction_id
+            if linked_id is not None:
+                neighbours.setdefault(other_id, set()).add(linked_id)
+                neighbours.setdefault(linked_id, set()).add(other_id)
+
+        found = {rule_id}
+        frontier = [rule_id]
+        while frontier:
+            for other_id in neighbours.get(frontier.pop(), ()):
+                if other_id not in found and other_id not in deleted_ids:
+                    found.add(other_id)
+                    frontier.append(other_id)
+        return found
+
+    @staticmethod
+    def _accounts_of(
+        rule_id: int,
+        link_rows: dict[int, tuple[int | None, int, int | None]],
+        rules: dict[int, ScheduledTransaction],
+    ) -> set[int | None]:
+        """Accounts a rule touches, as loaded (or as updated earlier in the batch)."""
+        if rule_id in rules:
+            return {rules[rule_id].account_id, rules[rule_id].to_account_id}
+        _, account_id, to_account_id = link_rows[rule_id]
+        return {account_id, to_account_id}
+
+    @staticmethod
+    async def _delete_rules(rule_ids: set[int], db: AsyncSession) -> None:
+        """Delete rules and their exceptions."""
+        await db.execute(
+            delete(ScheduledTransactionException).where(
+                ScheduledTransactionException.scheduled_transaction_id.in_(rule_ids)
+            )
+        )
+        await db.execute(delete(ScheduledTransaction).where(ScheduledTransaction.id.in_(rule_ids)))
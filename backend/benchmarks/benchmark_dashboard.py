@@ -0,0 +1,202 @@
+"""
+Benchmark dashboard loading against a real database.
+
+Seeds a throwaway user with accounts, scheduled transactions and reconciliations,
+then times DashboardService.get_dashboard with sequential and concurrent loading.
+The seeded user is removed afterwards.
+
+Usage (from the backend directory, with migrations applied):
+    python -m benchmarks.benchmark_dashboard
+    python -m benchmarks.benchmark_dashboard --accounts 40 --rules 400 --iterations 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.models import (
+    Account,
+    AccountReconciliation,
+    AccountType,
+    Category,
+    DailyBalanceRollup,
+    RecurrenceFrequency,
+    ScheduledTransaction,
+    User,
+)
+from app.services.balance_rollup_service import BalanceRollupService
+from app.services.dashboard_service import DashboardService
+
+ACCOUNT_TYPES = [
+    AccountType.CHECKING,
+    AccountType.SAVINGS,
+    AccountType.INVESTMENT,
+    AccountType.CREDIT_CARD,
+]
+
+
+async def seed_user(
+    session_factory: async_sessionmaker[AsyncSession],
+    accounts: int,
+    rules: int,
+    reconciliations: int,
+) -> int:
+    """Create a benchmark user with generated data and return its ID."""
+    today = date.today()
+
+    async with session_factory() as db:
+        user = User(
+            email=f"bench-{uuid.uuid4().hex[:12]}@example.com",
+            hashed_password="not-a-real-hash",
+            full_name="Dashboard Benchmark",
+            currency="USD",
+            is_active=True,
+        )
+        category = Category(name="Benchmark", type="expense", is_system=False)
+        db.add_all([user, category])
+        await db.flush()
+        category.user_id = user.id
+
+        account_rows = [
+            Account(
+                user_id=user.id,
+                name=f"Account {i}",
+                type=ACCOUNT_TYPES[i % len(ACCOUNT_TYPES)],
+                currency="USD",
+                initial_balance=Decimal("1000.00"),
+                initial_balance_date=today - timedelta(days=365 * 2),
+            )
+            for i in range(accounts)
+        ]
+        db.add_all(account_rows)
+        await db.flush()
+
+        db.add_all(
+            ScheduledTransaction(
+                user_id=user.id,
+                account_id=account_rows[i % accounts].id,
+                category_id=category.id,
+                name=f"Rule {i}",
+                amount=Decimal("-25.00"),
+                currency="USD",
+                is_recurring=True,
+                recurrence_frequency=RecurrenceFrequency.MONTHLY,
+                recurrence_day_of_month=(i % 28) + 1,
+                recurrence_start_date=today - timedelta(days=365),
+            )
+            for i in range(rules)
+        )
+
+        db.add_all(
+            AccountReconciliation(
+                user_id=user.id,
+                account_id=account_rows[i % accounts].id,
+                reconciliation_date=today - timedelta(days=(i // accounts) * 7),
+                expected_balance=Decimal("1000.00"),
+                actual_balance=Decimal("1000.00") + i,
+                difference=Decimal(i),
+            )
+            for i in range(reconciliations)
+        )
+        await db.flush()
+        await BalanceRollupService.refresh(user.id, db)
+
+        await db.commit()
+        return user.id
+
+
+async def remove_user(session_factory: async_sessionmaker[AsyncSession], user_id: int) -> None:
+    """Delete the benchmark user and everything seeded for it."""
+    async with session_factory() as db:
+        await db.execute(delete(DailyBalanceRollup).where(DailyBalanceRollup.user_id == user_id))
+        await db.execute(
+            delete(AccountReconciliation).where(AccountReconciliation.user_id == user_id)
+        )
+        await db.execute(
+            delete(ScheduledTransaction).where(ScheduledTransaction.user_id == user_id)
+        )
+        await db.execute(delete(Account).where(Account.user_id == user_id))
+        await db.execute(delete(Category).where(Category.user_id == user_id))
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def time_dashboard(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: int,
+    parallel: bool,
+) -> float:
+    """Time one get_dashboard call, returning wall-clock milliseconds."""
+    settings.DASHBOARD_PARALLEL_LOAD = parallel
+
+    async with session_factory() as db:
+        # Mirror a request: the auth dependency has already used the session
+        await db.execute(select(User.id).where(User.id == user_id))
+
+        started = time.perf_counter()
+        await DashboardService.get_dashboard(user_id=user_id, db=db)
+        return (time.perf_counter() - started) * 1000
+
+
+def describe(label: str, timings: list[float]) -> str:
+    """Format timing statistics for one mode."""
+    return (
+        f"{label:<12} median {statistics.median(timings):8.2f} ms   "
+        f"min {min(timings):8.2f} ms   max {max(timings):8.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--rules", type=int, default=200)
+    parser.add_argument("--reconciliations", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="Connection pool size; concurrent loading needs several connections per request",
+    )
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.database_url, pool_size=args.pool_size)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    user_id = await seed_user(session_factory, args.accounts, args.rules, args.reconciliations)
+    try:
+        # Warm up connections and caches before measuring
+        for _ in range(3):
+            await time_dashboard(session_factory, user_id, parallel=True)
+
+        # Alternate modes so drift in machine load affects both equally
+        sequential, parallel = [], []
+        for _ in range(args.iterations):
+            sequential.append(await time_dashboard(session_factory, user_id, parallel=False))
+            parallel.append(await time_dashboard(session_factory, user_id, parallel=True))
+    finally:
+        await remove_user(session_factory, user_id)
+        await engine.dispose()
+
+    print(
+        f"Dashboard benchmark: {args.accounts} accounts, {args.rules} rules, "
+        f"{args.reconciliations} reconciliations, {args.iterations} iterations, "
+        f"pool size {args.pool_size}"
+    )
+    print(describe("sequential", sequential))
+    print(describe("concurrent", parallel))
+    speedup = statistics.median(sequential) / statistics.median(parallel)
+    print(f"Speedup (median): {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
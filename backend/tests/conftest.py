@@ -17,6 +17,9 @@ from app.main import app
 
 # Import all models so SQLAlchemy knows about them
 from app.models import Account, Category, RefreshToken, User  # noqa: F401
+from app.services.category_service import CategoryService
+from app.services.dashboard_service import DashboardCache
+from app.services.rule_index_service import RuleIndexCache
 
 # Test database URL (use file-based SQLite for tests to ensure persistence within test)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -87,6 +90,8 @@ async def test_db(test_session_factory) -> AsyncGenerator[AsyncSession, None]:
         try:
             # Delete in reverse dependency order to respect foreign keys
             # Children first, then parents
+            await cleanup_session.execute(text("DELETE FROM daily_balance_rollups"))
+            await cleanup_session.execute(text("DELETE FROM reconciliation_drift_stats"))
             await cleanup_session.execute(text("DELETE FROM account_reconciliations"))
             await cleanup_session.execute(text("DELETE FROM scheduled_transaction_exceptions"))
             await cleanup_session.execute(text("DELETE FROM scheduled_transactions"))
@@ -107,6 +112,11 @@ async def test_db(test_session_factory) -> AsyncGenerator[AsyncSession, None]:
         finally:
             await cleanup_session.close()
 
+    # IDs are reused after the reset, so drop the process-wide caches
+    CategoryService.invalidate_system_categories()
+    DashboardCache.invalidate()
+    RuleIndexCache.invalidate()
+
 
 @pytest_asyncio.fixture(scope="function")
 async def client(test_db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
@@ -105,6 +105,33 @@ class TestListAccounts:
         assert data[0]["name"] == test_account.name
         assert data[0]["type"] == test_account.type.value
 
+    async def test_list_accounts_not_modified(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_account_data: dict[str, Any],
+        test_login_data: dict[str, str],
+    ) -> None:
+        """Test listing accounts answers 304 until the user's data changes."""
+        headers = await get_auth_headers(client, test_login_data)
+        response = await client.get("/api/v1/accounts/", headers=headers)
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"')
+
+        response = await client.get("/api/v1/accounts/", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+        # Any write bumps the data version, so the old ETag no longer matches
+        await client.post("/api/v1/accounts/", json=test_account_data, headers=headers)
+
+        response = await client.get("/api/v1/accounts/", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert len(response.json()) == 2
+
     async def test_list_accounts_without_auth(self, client: AsyncClient) -> None:
         """Test listing accounts without authentication."""
         response = await client.get("/api/v1/accounts/")
@@ -427,3 +454,60 @@ class TestAccountSummary:
         assert Decimal(data["investments"]) == Decimal("10000")
         assert Decimal(data["credit_used"]) == Decimal("500")
         assert Decimal(data["net_worth"]) == Decimal("15500")  # 6000 + 10000 - 500
+
+    async def test_summary_credit_and_excluded_accounts(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_login_data: dict[str, str],
+        test_db: AsyncSession,
+    ) -> None:
+        """Test credit is summed per account as used, and inactive/planning accounts are skipped."""
+        accounts = [
+            Account(
+                user_id=test_user.id,
+                name="Card A",
+                type=AccountType.CREDIT_CARD,
+                currency="USD",
+                initial_balance=Decimal("-300"),
+                initial_balance_date=date.today(),
+            ),
+            Account(
+                user_id=test_user.id,
+                name="Card B",
+                type=AccountType.CREDIT_CARD,
+                currency="USD",
+                initial_balance=Decimal("200"),
+                initial_balance_date=date.today(),
+            ),
+            Account(
+                user_id=test_user.id,
+                name="Closed Checking",
+                type=AccountType.CHECKING,
+                currency="USD",
+                initial_balance=Decimal("1000"),
+                initial_balance_date=date.today(),
+                is_active=False,
+            ),
+            Account(
+                user_id=test_user.id,
+                name="Plan",
+                type=AccountType.PLANNING,
+                currency="USD",
+                initial_balance=Decimal("999"),
+                initial_balance_date=date.today(),
+            ),
+        ]
+        for account in accounts:
+            test_db.add(account)
+        await test_db.commit()
+
+        headers = await get_auth_headers(client, test_login_data)
+        response = await client.get("/api/v1/accounts/summary/totals", headers=headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        # Each card counts by its absolute balance, not by the netted sum
+        assert Decimal(data["credit_used"]) == Decimal("500")
+        assert Decimal(data["liquid_assets"]) == Decimal("0")
+        assert Decimal(data["net_worth"]) == Decimal("-500")
@@ -1,5 +1,6 @@
 """Tests for dashboard endpoint."""
 
+import asyncio
 from datetime import date, timedelta
 from decimal import Decimal
 
@@ -8,10 +9,15 @@ from httpx import AsyncClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.account import Account, AccountType
 from app.models.category import Category
+from app.models.reconciliation import AccountReconciliation
 from app.models.scheduled_transaction import ScheduledTransaction
 from app.models.user import User
+from app.services.balance_rollup_service import BalanceRollupService
+from app.services.dashboard_precompute_service import DashboardPrecomputeService
+from app.services.dashboard_service import DashboardCache, DashboardService
 
 
 @pytest_asyncio.fixture
@@ -232,6 +238,141 @@ class TestGetDashboard:
         assert "Tomorrow Payment" in tx_names
         assert "Weekly Subscription" in tx_names
 
+    async def test_dashboard_upcoming_transactions_limit(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test upcoming transactions are the earliest 50 instances of the window."""
+        today = date.today()
+        transactions = [
+            ScheduledTransaction(
+                user_id=test_user.id,
+                account_id=test_account.id,
+                category_id=test_category.id,
+                name=f"Bill {i}",
+                amount=Decimal("-10.00"),
+                currency="USD",
+                is_recurring=True,
+                recurrence_frequency="MONTHLY",
+                recurrence_day_of_month=(today + timedelta(days=i % 28)).day,
+                recurrence_start_date=today,
+            )
+            for i in range(60)
+        ]
+        transactions.append(
+            ScheduledTransaction(
+                user_id=test_user.id,
+                account_id=test_account.id,
+                category_id=test_category.id,
+                name="One-time",
+                amount=Decimal("-5.00"),
+                currency="USD",
+                is_recurring=False,
+                recurrence_start_date=today + timedelta(days=1),
+            )
+        )
+        test_db.add_all(transactions)
+        await test_db.commit()
+
+        # Login
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        # Delete the first occurrence of the first rule
+        deleted = await client.delete(
+            f"/api/v1/scheduled-transactions/{transactions[0].id}",
+            headers=headers,
+            params={"delete_mode": "THIS_ONLY", "instance_date": str(today)},
+        )
+        assert deleted.status_code == 204
+
+        response = await client.get("/api/v1/dashboard/", headers=headers)
+        assert response.status_code == 200
+        upcoming = response.json()["upcoming_transactions"]
+
+        instances = await client.get(
+            "/api/v1/scheduled-transactions/instances",
+            headers=headers,
+            params={"from_date": str(today), "to_date": str(today + timedelta(days=30))},
+        )
+        expected = [
+            (instance["date"], instance["scheduled_transaction_id"])
+            for instance in instances.json()[:50]
+        ]
+
+        assert len(upcoming) == 50
+        assert [(tx["date"], tx["scheduled_transaction_id"]) for tx in upcoming] == expected
+        assert (str(today), transactions[0].id) not in expected
+
+    async def test_dashboard_upcoming_category_names(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test upcoming transactions resolve system and own categories only."""
+        other_user = User(
+            email="other@example.com",
+            hashed_password="not-a-real-hash",
+            full_name="Other User",
+            currency="USD",
+            is_active=True,
+        )
+        test_db.add(other_user)
+        await test_db.commit()
+
+        own_category = Category(user_id=test_user.id, name="Own", type="expense", is_system=False)
+        other_category = Category(
+            user_id=other_user.id, name="Foreign", type="expense", is_system=False
+        )
+        test_db.add_all([own_category, other_category])
+        await test_db.commit()
+
+        tomorrow = date.today() + timedelta(days=1)
+        test_db.add_all(
+            ScheduledTransaction(
+                user_id=test_user.id,
+                account_id=test_account.id,
+                category_id=category_id,
+                name=name,
+                amount=Decimal("-10.00"),
+                currency="USD",
+                is_recurring=False,
+                recurrence_start_date=tomorrow,
+            )
+            for name, category_id in (
+                ("System", test_category.id),
+                ("Own", own_category.id),
+                ("Foreign", other_category.id),
+            )
+        )
+        await test_db.commit()
+
+        # Login
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        token = login_response.json()["access_token"]
+
+        response = await client.get(
+            "/api/v1/dashboard/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        names = {tx["name"]: tx["category_name"] for tx in response.json()["upcoming_transactions"]}
+        assert names == {"System": test_category.name, "Own": "Own", "Foreign": "Unknown"}
+
     async def test_dashboard_balance_trend(
         self,
         client: AsyncClient,
@@ -284,6 +425,474 @@ class TestGetDashboard:
         # Verify today_date is present
         assert "today_date" in data
 
+    async def test_dashboard_historical_trend_forward_fill(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_db: AsyncSession,
+    ):
+        """Test historical trend carries each account's last known balance forward."""
+        today = date.today()
+        checking = Account(
+            user_id=test_user.id,
+            name="Checking",
+            type=AccountType.CHECKING,
+            currency="USD",
+            initial_balance=Decimal("1000.00"),
+            initial_balance_date=today - timedelta(days=30),
+        )
+        credit_card = Account(
+            user_id=test_user.id,
+            name="Credit Card",
+            type=AccountType.CREDIT_CARD,
+            currency="USD",
+            initial_balance=Decimal("-200.00"),
+            initial_balance_date=today - timedelta(days=20),
+        )
+        test_db.add_all([checking, credit_card])
+        await test_db.commit()
+
+        # Checking is reconciled twice; only the later balance should survive
+        test_db.add_all(
+            [
+                AccountReconciliation(
+                    user_id=test_user.id,
+                    account_id=checking.id,
+                    reconciliation_date=today - timedelta(days=10),
+                    expected_balance=Decimal("1000.00"),
+                    actual_balance=Decimal("1200.00"),
+                    difference=Decimal("200.00"),
+                ),
+                AccountReconciliation(
+                    user_id=test_user.id,
+                    account_id=checking.id,
+                    reconciliation_date=today - timedelta(days=5),
+                    expected_balance=Decimal("1200.00"),
+                    actual_balance=Decimal("1100.00"),
+                    difference=Decimal("-100.00"),
+                ),
+            ]
+        )
+        await test_db.commit()
+
+        # Rows inserted directly bypass the write paths that maintain the rollup
+        await BalanceRollupService.refresh(test_user.id, test_db)
+        await test_db.commit()
+
+        # Login
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        token = login_response.json()["access_token"]
+
+        response = await client.get(
+            "/api/v1/dashboard/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        def points(trend: list[dict]) -> dict[str, Decimal]:
+            return {
+                point["date"]: Decimal(point["balance"])
+                for point in trend
+                if point["date"] < str(today)
+            }
+
+        history_dates = [str(today - timedelta(days=n)) for n in (30, 20, 10, 5)]
+        assert points(data["balance_trend"]) == dict(
+            zip(
+                history_dates,
+                [Decimal("1000"), Decimal("800"), Decimal("1000"), Decimal("900")],
+                strict=True,
+            )
+        )
+        assert points(data["liquid_trend"]) == dict(
+            zip(
+                history_dates,
+                [Decimal("1000"), Decimal("1000"), Decimal("1200"), Decimal("1100")],
+                strict=True,
+            )
+        )
+        assert points(data["credit_trend"]) == dict(
+            zip(
+                history_dates,
+                [Decimal("0"), Decimal("-200"), Decimal("-200"), Decimal("-200")],
+                strict=True,
+            )
+        )
+
+    async def test_dashboard_history_carries_balance_into_window(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_db: AsyncSession,
+    ):
+        """Test the balance before the history window is carried into it."""
+        today = date.today()
+        checking = Account(
+            user_id=test_user.id,
+            name="Checking",
+            type=AccountType.CHECKING,
+            currency="USD",
+            initial_balance=Decimal("1000.00"),
+            initial_balance_date=today - timedelta(days=400),
+        )
+        savings = Account(
+            user_id=test_user.id,
+            name="Savings",
+            type=AccountType.SAVINGS,
+            currency="USD",
+            initial_balance=Decimal("100.00"),
+            initial_balance_date=today - timedelta(days=20),
+        )
+        test_db.add_all([checking, savings])
+        await test_db.commit()
+
+        # Weekly reconciliations long before the 60-day history window
+        test_db.add_all(
+            AccountReconciliation(
+                user_id=test_user.id,
+                account_id=checking.id,
+                reconciliation_date=today - timedelta(days=days_ago),
+                expected_balance=Decimal("0"),
+                actual_balance=Decimal(days_ago),
+                difference=Decimal(days_ago),
+            )
+            for days_ago in range(350, 60, -7)
+        )
+        await test_db.commit()
+
+        # Rows inserted directly bypass the write paths that maintain the rollup
+        await BalanceRollupService.refresh(test_user.id, test_db)
+        await test_db.commit()
+
+        # Login
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        token = login_response.json()["access_token"]
+
+        response = await client.get(
+            "/api/v1/dashboard/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        history = {
+            point["date"]: Decimal(point["balance"])
+            for point in response.json()["balance_trend"]
+            if point["date"] < str(today)
+        }
+        # Checking carries its day -63 balance (63) into the window
+        assert history == {str(today - timedelta(days=20)): Decimal("163")}
+
+        # A longer window reaches back to the initial balance
+        response = await client.get(
+            "/api/v1/dashboard/?history_days=400",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == 200
+        history = {
+            point["date"]: Decimal(point["balance"])
+            for point in response.json()["balance_trend"]
+            if point["date"] < str(today)
+        }
+        assert len(history) == 44
+        assert history[str(today - timedelta(days=400))] == Decimal("1000")
+        assert history[str(today - timedelta(days=350))] == Decimal("350")
+
+    async def test_dashboard_history_follows_writes(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_db: AsyncSession,
+    ):
+        """Test account and reconciliation writes keep the history trend up to date."""
+        today = date.today()
+
+        # Login
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        async def history() -> dict[str, Decimal]:
+            response = await client.get("/api/v1/dashboard/", headers=headers)
+            assert response.status_code == 200
+            return {
+                point["date"]: Decimal(point["balance"])
+                for point in response.json()["balance_trend"]
+                if point["date"] < str(today)
+            }
+
+        day = {n: str(today - timedelta(days=n)) for n in (30, 20, 10, 5)}
+
+        checking = await client.post(
+            "/api/v1/accounts/",
+            headers=headers,
+            json={
+                "name": "Checking",
+                "type": "checking",
+                "currency": "USD",
+                "initial_balance": "1000.00",
+                "initial_balance_date": day[30],
+            },
+        )
+        savings = await client.post(
+            "/api/v1/accounts/",
+            headers=headers,
+            json={
+                "name": "Savings",
+                "type": "savings",
+                "currency": "USD",
+                "initial_balance": "500.00",
+                "initial_balance_date": day[20],
+            },
+        )
+        checking_id = checking.json()["id"]
+        savings_id = savings.json()["id"]
+        assert await history() == {day[30]: Decimal("1000"), day[20]: Decimal("1500")}
+
+        reconciliation = await client.post(
+            "/api/v1/reconciliations/",
+            headers=headers,
+            json={
+                "account_id": checking_id,
+                "reconciliation_date": day[10],
+                "actual_balance": "1200.00",
+                "create_adjustment": False,
+            },
+        )
+        assert reconciliation.status_code == 201
+        assert await history() == {
+            day[30]: Decimal("1000"),
+            day[20]: Decimal("1500"),
+            day[10]: Decimal("1700"),
+        }
+
+        # Moving the savings initial balance later only rewrites rows from day -20 on
+        await client.put(
+            f"/api/v1/accounts/{savings_id}",
+            headers=headers,
+            json={"initial_balance": "300.00", "initial_balance_date": day[5]},
+        )
+        assert await history() == {
+            day[30]: Decimal("1000"),
+            day[10]: Decimal("1200"),
+            day[5]: Decimal("1500"),
+        }
+
+        await client.delete(
+            f"/api/v1/reconciliations/{reconciliation.json()['id']}", headers=headers
+        )
+        assert await history() == {day[30]: Decimal("1000"), day[5]: Decimal("1300")}
+
+        await client.delete(f"/api/v1/accounts/{checking_id}", headers=headers)
+        assert await history() == {day[5]: Decimal("300")}
+
+    async def test_dashboard_parallel_load_matches_sequential(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+        monkeypatch,
+    ):
+        """Test concurrent loading returns the same dashboard as sequential loading."""
+        transaction = ScheduledTransaction(
+            user_id=test_user.id,
+            account_id=test_account.id,
+            category_id=test_category.id,
+            name="Monthly Bill",
+            amount=Decimal("-100.00"),
+            currency="USD",
+            is_recurring=True,
+            recurrence_frequency="MONTHLY",
+            recurrence_day_of_month=(date.today() + timedelta(days=3)).day,
+            recurrence_start_date=date.today(),
+        )
+        test_db.add(transaction)
+        await test_db.commit()
+
+        # Login
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        token = login_response.json()["access_token"]
+
+        monkeypatch.setattr(settings, "DASHBOARD_PARALLEL_LOAD", False)
+        sequential = await client.get(
+            "/api/v1/dashboard/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        monkeypatch.setattr(settings, "DASHBOARD_PARALLEL_LOAD", True)
+        parallel = await client.get(
+            "/api/v1/dashboard/",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert sequential.status_code == 200
+        assert parallel.status_code == 200
+        assert parallel.json() == sequential.json()
+        assert len(parallel.json()["upcoming_transactions"]) == 1
+
+    async def test_dashboard_not_modified(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+    ):
+        """Test dashboard ETags follow the data version and the query."""
+        # Login
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        response = await client.get("/api/v1/dashboard/", headers=headers)
+        etag = response.headers["ETag"]
+
+        response = await client.get(
+            "/api/v1/dashboard/", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+        # A different history window is a different representation
+        response = await client.get(
+            "/api/v1/dashboard/?history_days=365", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
+        # Writes through other routes invalidate it too
+        await client.post(
+            "/api/v1/reconciliations/",
+            headers=headers,
+            json={
+                "account_id": test_account.id,
+                "reconciliation_date": str(date.today()),
+                "actual_balance": "1500.00",
+                "create_adjustment": False,
+            },
+        )
+        response = await client.get(
+            "/api/v1/dashboard/", headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 200
+
+    async def test_dashboard_stale_while_revalidate(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        monkeypatch,
+    ):
+        """Test a write serves the previous dashboard as stale, then the recomputed one."""
+        monkeypatch.setattr(settings, "DASHBOARD_STALE_WHILE_REVALIDATE", True)
+
+        # Login
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        first = await client.get("/api/v1/dashboard/", headers=headers)
+        assert first.status_code == 200
+        assert first.json()["is_stale"] is False
+        assert first.json()["financial_summary"]["account_count"] == 1
+
+        await client.post(
+            "/api/v1/accounts/",
+            headers=headers,
+            json={
+                "name": "Savings",
+                "type": "savings",
+                "currency": "USD",
+                "initial_balance": "500.00",
+                "initial_balance_date": str(date.today()),
+            },
+        )
+
+        stale = await client.get("/api/v1/dashboard/", headers=headers)
+        assert stale.status_code == 200
+        assert stale.json()["is_stale"] is True
+        assert stale.json()["data_version"] == first.json()["data_version"]
+        assert stale.json()["financial_summary"]["account_count"] == 1
+        assert "ETag" not in stale.headers
+
+        # The background recomputation replaces the entry
+        for _ in range(100):
+            fresh = await client.get("/api/v1/dashboard/", headers=headers)
+            if not fresh.json()["is_stale"]:
+                break
+            await asyncio.sleep(0.05)
+
+        assert fresh.json()["is_stale"] is False
+        assert fresh.json()["data_version"] > first.json()["data_version"]
+        assert fresh.json()["financial_summary"]["account_count"] == 2
+        assert "ETag" in fresh.headers
+
+    async def test_dashboard_cache_single_flight(
+        self,
+        test_user: User,
+        test_account: Account,
+        test_db: AsyncSession,
+        monkeypatch,
+    ):
+        """Test concurrent requests for one user share a single computation."""
+        calls = 0
+        get_dashboard = DashboardService.get_dashboard
+
+        async def counting_get_dashboard(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return await get_dashboard(*args, **kwargs)
+
+        monkeypatch.setattr(DashboardService, "get_dashboard", counting_get_dashboard)
+
+        results = await asyncio.gather(
+            *(DashboardCache.get(test_user.id, 0, test_db) for _ in range(5))
+        )
+
+        assert calls == 1
+        assert all(entry is results[0][0] for entry, _ in results)
+        assert not any(is_stale for _, is_stale in results)
+
+    async def test_dashboard_precompute_pass(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_db: AsyncSession,
+    ):
+        """Test a precompute pass warms the cache for users who signed in recently."""
+        # Signing in issues a refresh token, which is what marks the user active
+        response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        assert response.status_code == 200
+
+        warmed = await DashboardPrecomputeService.run_pass(
+            concurrency=2, priority="cost", bind=test_db.bind
+        )
+
+        assert warmed == 1
+        entry, is_stale = await DashboardCache.get(test_user.id, test_user.data_version, test_db)
+        assert not is_stale
+        assert entry.today == date.today()
+        assert entry.compute_seconds > 0
+
     async def test_dashboard_without_auth(self, client: AsyncClient):
         """Test dashboard without authentication."""
         response = await client.get(
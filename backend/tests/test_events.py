@@ -0,0 +1,147 @@
+"""Tests for change events."""
+
+import asyncio
+import json
+from contextlib import AsyncExitStack
+from datetime import date, timedelta
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.routes.events import change_event_stream
+from app.models.user import User
+from app.services.change_event_service import (
+    ChangeEvent,
+    ChangeEventService,
+    InMemoryChangeBroker,
+)
+from app.services.data_version_service import DataVersionService
+
+
+async def get_auth_headers(client: AsyncClient, test_user: User) -> dict[str, str]:
+    """Log in and return authorization headers."""
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": test_user.email, "password": "testpass123"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+class TestChangeEvents:
+    """Tests for change events published on commit."""
+
+    async def test_write_publishes_change(
+        self, client: AsyncClient, test_user: User, test_db: AsyncSession
+    ):
+        """Test a committed write reaches the user's subscribers with what it affected."""
+        headers = await get_auth_headers(client, test_user)
+        balance_date = date.today() - timedelta(days=10)
+
+        async with ChangeEventService.broker.subscribe(test_user.id) as queue:
+            response = await client.post(
+                "/api/v1/accounts/",
+                json={
+                    "name": "Checking",
+                    "type": "checking",
+                    "currency": "USD",
+                    "initial_balance": "100.00",
+                    "initial_balance_date": str(balance_date),
+                },
+                headers=headers,
+            )
+            assert response.status_code == 201
+
+            change = await asyncio.wait_for(queue.get(), timeout=1)
+
+        assert change.user_id == test_user.id
+        assert change.data_version == 1
+        assert change.account_ids == {response.json()["id"]}
+        assert change.from_date == balance_date
+        assert change.to_date is None
+
+    async def test_rollback_publishes_nothing(self, test_user: User, test_db: AsyncSession):
+        """Test a change recorded in a rolled back transaction is dropped."""
+        async with ChangeEventService.broker.subscribe(test_user.id) as queue:
+            await DataVersionService.bump(test_user.id, test_db, account_ids=[1])
+            await test_db.rollback()
+            await test_db.commit()
+            await asyncio.sleep(0)
+
+            assert queue.empty()
+
+    async def test_changes_in_one_transaction_are_merged(
+        self, test_user: User, test_db: AsyncSession
+    ):
+        """Test several writes in one transaction publish a single covering event."""
+        async with ChangeEventService.broker.subscribe(test_user.id) as queue:
+            await DataVersionService.bump(
+                test_user.id, test_db, account_ids=[1], from_date=date(2024, 3, 1)
+            )
+            await DataVersionService.bump(
+                test_user.id,
+                test_db,
+                account_ids=[2, None],
+                from_date=date(2024, 1, 1),
+                to_date=date(2024, 2, 1),
+            )
+            await test_db.commit()
+
+            change = await asyncio.wait_for(queue.get(), timeout=1)
+            assert queue.empty()
+
+        assert change.data_version == 2
+        assert change.account_ids == {1, 2}
+        assert change.from_date == date(2024, 1, 1)
+        # One of the writes is open-ended, so the merged range is too
+        assert change.to_date is None
+
+    async def test_slow_subscriber_backlog_collapses(self):
+        """Test a full queue is replaced by one catch-all event at the latest version."""
+        broker = InMemoryChangeBroker(queue_size=2)
+
+        async with broker.subscribe(1) as queue:
+            for version in range(1, 4):
+                await broker.publish(ChangeEvent(1, version, {version}, date(2024, 1, version)))
+
+            change = queue.get_nowait()
+            assert queue.empty()
+
+        assert change.data_version == 3
+        assert change.account_ids is None
+        assert change.from_date is None
+        assert broker.subscriber_count(1) == 0
+
+
+class TestChangeEventStream:
+    """Tests for the Server-Sent Events stream."""
+
+    async def test_stream_sends_version_then_changes(self):
+        """Test the stream opens with the current version and skips outdated changes."""
+        queue: asyncio.Queue[ChangeEvent] = asyncio.Queue()
+        stream = change_event_stream(queue, 5, AsyncExitStack(), heartbeat_seconds=0.05)
+
+        first = await anext(stream)
+        assert first.startswith("id: 5\nevent: version\n")
+
+        # Already covered by the version the stream opened with
+        queue.put_nowait(ChangeEvent(1, 5, {1}))
+        queue.put_nowait(ChangeEvent(1, 6, {2}, date(2024, 1, 1)))
+        message = await anext(stream)
+        assert message.startswith("id: 6\nevent: change\n")
+        data = json.loads(message.split("data: ", 1)[1])
+        assert data == {
+            "data_version": 6,
+            "account_ids": [2],
+            "from_date": "2024-01-01",
+            "to_date": None,
+        }
+
+        # Idle streams get keep-alive comments
+        assert await anext(stream) == ": keep-alive\n\n"
+        await stream.aclose()
+
+    async def test_stream_requires_auth(self, client: AsyncClient):
+        """Test the stream endpoint rejects unauthenticated requests."""
+        response = await client.get("/api/v1/events/stream")
+
+        assert response.status_code == 401
@@ -0,0 +1,157 @@
+"""Tests for data export endpoints."""
+
+import csv
+import io
+import json
+import zipfile
+from datetime import date
+from decimal import Decimal
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.account import Account, AccountType
+from app.models.category import Category
+from app.models.scheduled_transaction import (
+    RecurrenceFrequency,
+    ScheduledTransaction,
+    ScheduledTransactionException,
+)
+from app.models.user import User
+
+
+async def get_auth_headers(client: AsyncClient, test_user: User) -> dict[str, str]:
+    """Log in and return authorization headers."""
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={"email": test_user.email, "password": "testpass123"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest_asyncio.fixture
+async def monthly_rule(test_db: AsyncSession, test_user: User) -> ScheduledTransaction:
+    """Create a monthly rule from January 2025 with February skipped."""
+    account = Account(
+        user_id=test_user.id,
+        name="Checking",
+        type=AccountType.CHECKING,
+        currency="USD",
+        initial_balance=Decimal("1000.00"),
+        initial_balance_date=date(2025, 1, 1),
+    )
+    category = Category(name="Export Rent", type="expense", is_system=True)
+    test_db.add_all([account, category])
+    await test_db.flush()
+
+    rule = ScheduledTransaction(
+        user_id=test_user.id,
+        account_id=account.id,
+        category_id=category.id,
+        name="Rent",
+        amount=Decimal("-900.00"),
+        currency="USD",
+        is_recurring=True,
+        recurrence_frequency=RecurrenceFrequency.MONTHLY,
+        recurrence_day_of_month=1,
+        recurrence_start_date=date(2025, 1, 1),
+    )
+    test_db.add(rule)
+    await test_db.flush()
+    test_db.add(
+        ScheduledTransactionException(
+            scheduled_transaction_id=rule.id,
+            exception_date=date(2025, 2, 1),
+            is_deleted=True,
+        )
+    )
+    await test_db.commit()
+    return rule
+
+
+class TestExport:
+    """Tests for GET /api/v1/export/{entity}."""
+
+    async def test_export_rules_csv(
+        self, client: AsyncClient, test_user: User, monthly_rule: ScheduledTransaction
+    ):
+        """Test rules export as CSV with a header row and a download file name."""
+        headers = await get_auth_headers(client, test_user)
+
+        response = await client.get("/api/v1/export/scheduled_transactions", headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="scheduled_transactions.csv"' in response.headers["content-disposition"]
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["id"] == str(monthly_rule.id)
+        assert rows[0]["name"] == "Rent"
+        assert rows[0]["amount"] == "-900.00"
+
+    async def test_export_instances_zipped_jsonl(
+        self, client: AsyncClient, test_user: User, monthly_rule: ScheduledTransaction
+    ):
+        """Test instances are expanded over the range with exceptions applied, and zipped."""
+        headers = await get_auth_headers(client, test_user)
+
+        response = await client.get(
+            "/api/v1/export/instances",
+            headers=headers,
+            params={
+                "format": "jsonl",
+                "compress": "true",
+                "from_date": "2025-01-01",
+                "to_date": "2025-04-30",
+            },
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert archive.namelist() == ["instances.jsonl"]
+            lines = archive.read("instances.jsonl").decode().splitlines()
+
+        instances = [json.loads(line) for line in lines]
+        # The skipped February occurrence is left out
+        assert [i["date"] for i in instances] == ["2025-01-01", "2025-03-01", "2025-04-01"]
+        assert all(i["scheduled_transaction_id"] == monthly_rule.id for i in instances)
+
+    async def test_export_filters_and_validation(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        monthly_rule: ScheduledTransaction,
+        test_db: AsyncSession,
+    ):
+        """Test exceptions are filtered by date, and instances need a bounded range."""
+        headers = await get_auth_headers(client, test_user)
+
+        response = await client.get(
+            "/api/v1/export/exceptions",
+            headers=headers,
+            params={"format": "jsonl", "from_date": "2025-02-01", "to_date": "2025-02-28"},
+        )
+        assert response.status_code == 200
+        exceptions = [json.loads(line) for line in response.text.splitlines()]
+        result = await test_db.execute(select(ScheduledTransactionException.id))
+        assert [e["id"] for e in exceptions] == list(result.scalars().all())
+
+        response = await client.get(
+            "/api/v1/export/exceptions",
+            headers=headers,
+            params={"format": "jsonl", "from_date": "2025-03-01"},
+        )
+        assert response.text == ""
+
+        response = await client.get("/api/v1/export/instances", headers=headers)
+        assert response.status_code == 400
+
+        response = await client.get(
+            "/api/v1/export/instances",
+            headers=headers,
+            params={"from_date": "2000-01-01", "to_date": "2025-01-01"},
+        )
+        assert response.status_code == 400
@@ -10,8 +10,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.account import Account, AccountType
 from app.models.category import Category
-from app.models.scheduled_transaction import ScheduledTransaction
+from app.models.reconciliation import AccountReconciliation
+from app.models.scheduled_transaction import (
+    RecurrenceFrequency,
+    ScheduledTransaction,
+    ScheduledTransactionException,
+)
 from app.models.user import User
+from app.services.forecast_service import ForecastService
+from app.services.reconciliation_service import ReconciliationService
+from app.services.recurrence_service import RecurrenceService
 
 
 @pytest_asyncio.fixture
@@ -239,6 +247,331 @@ class TestCreateReconciliation:
         assert "not found" in response.json()["detail"].lower()
 
 
+class TestExpectedBalance:
+    """Tests for the closed-form expected balance."""
+
+    async def test_expected_balance_matches_forecast(
+        self,
+        test_user: User,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test the expected balance equals the forecast's balance on the same date."""
+        today = date.today()
+        account = Account(
+            user_id=test_user.id,
+            name="Old Checking",
+            type=AccountType.CHECKING,
+            currency="USD",
+            initial_balance=Decimal("500.00"),
+            initial_balance_date=today - timedelta(days=5 * 365),
+        )
+        other = Account(
+            user_id=test_user.id,
+            name="Savings",
+            type=AccountType.SAVINGS,
+            currency="USD",
+            initial_balance=Decimal("0.00"),
+            initial_balance_date=today - timedelta(days=5 * 365),
+        )
+        test_db.add_all([account, other])
+        await test_db.flush()
+
+        def rule(name: str, amount: str, account_id: int, **recurrence) -> ScheduledTransaction:
+            return ScheduledTransaction(
+                user_id=test_user.id,
+                account_id=account_id,
+                category_id=test_category.id,
+                name=name,
+                amount=Decimal(amount),
+                currency="USD",
+                **recurrence,
+            )
+
+        rules = [
+            rule(
+                "Month end",
+                "-20.00",
+                account.id,
+                is_recurring=True,
+                recurrence_frequency=RecurrenceFrequency.MONTHLY,
+                recurrence_day_of_month=-1,
+                recurrence_start_date=today - timedelta(days=4 * 365),
+            ),
+            rule(
+                "Day 31",
+                "100.00",
+                account.id,
+                is_recurring=True,
+                recurrence_frequency=RecurrenceFrequency.MONTHLY,
+                recurrence_day_of_month=31,
+                recurrence_start_date=today - timedelta(days=1000),
+                recurrence_end_date=today + timedelta(days=200),
+            ),
+            rule(
+                "Leap day",
+                "-75.00",
+                account.id,
+                is_recurring=True,
+                recurrence_frequency=RecurrenceFrequency.YEARLY,
+                recurrence_day_of_month=29,
+                recurrence_month_of_year=2,
+                recurrence_start_date=today - timedelta(days=6 * 365),
+            ),
+            rule("One-off", "-12.34", account.id, recurrence_start_date=today - timedelta(days=3)),
+            rule(
+                "Elsewhere",
+                "40.00",
+                other.id,
+                is_recurring=True,
+                recurrence_frequency=RecurrenceFrequency.MONTHLY,
+                recurrence_day_of_month=15,
+                recurrence_start_date=today - timedelta(days=400),
+            ),
+        ]
+        test_db.add_all(rules)
+        await test_db.flush()
+        month_end, day_31, _, _, elsewhere = rules
+
+        def occurrence(transaction: ScheduledTransaction, index: int) -> date:
+            return RecurrenceService.next_instances(
+                [transaction], [], transaction.recurrence_start_date, limit=index + 1
+            )[index].date
+
+        test_db.add_all(
+            [
+                # Skipped, changed amount, moved away, moved in, and not an occurrence
+                ScheduledTransactionException(
+                    scheduled_transaction_id=month_end.id,
+                    exception_date=occurrence(month_end, 2),
+                    is_deleted=True,
+                ),
+                ScheduledTransactionException(
+                    scheduled_transaction_id=day_31.id,
+                    exception_date=occurrence(day_31, 1),
+                    amount=Decimal("250.00"),
+                ),
+                ScheduledTransactionException(
+                    scheduled_transaction_id=day_31.id,
+                    exception_date=occurrence(day_31, 3),
+                    account_id=other.id,
+                ),
+                ScheduledTransactionException(
+                    scheduled_transaction_id=elsewhere.id,
+                    exception_date=occurrence(elsewhere, 4),
+                    account_id=account.id,
+                    amount=Decimal("7.00"),
+                ),
+                ScheduledTransactionException(
+                    scheduled_transaction_id=elsewhere.id,
+                    exception_date=occurrence(elsewhere, 5) + timedelta(days=1),
+                    account_id=account.id,
+                ),
+            ]
+        )
+        await test_db.commit()
+
+        targets = [
+            account.initial_balance_date - timedelta(days=10),
+            account.initial_balance_date,
+            today - timedelta(days=700),
+            today - timedelta(days=3),
+            today,
+            today + timedelta(days=400),
+        ]
+        for target in targets:
+            forecasts = await ForecastService.calculate_forecast(
+                test_user.id,
+                min(account.initial_balance_date, target),
+                target,
+                test_db,
+                account_ids=[account.id],
+            )
+            expected = await ReconciliationService._calculate_expected_balance(
+                test_user.id, account.id, target, test_db
+            )
+            assert expected == forecasts[0].data_points[-1].balance, target
+
+
+class TestBulkReconciliation:
+    """Tests for POST /api/v1/reconciliations/bulk and /bulk/csv."""
+
+    async def test_bulk_create(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_db: AsyncSession,
+    ):
+        """Test rows commit together, see earlier rows' adjustments, and report bad rows."""
+        savings = Account(
+            user_id=test_user.id,
+            name="Savings",
+            type=AccountType.SAVINGS,
+            currency="USD",
+            initial_balance=Decimal("200.00"),
+            initial_balance_date=date.today() - timedelta(days=30),
+        )
+        test_db.add(savings)
+        await test_db.commit()
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        response = await client.post(
+            "/api/v1/reconciliations/bulk",
+            headers=headers,
+            json={
+                "items": [
+                    {
+                        "account_id": test_account.id,
+                        "reconciliation_date": str(date.today() - timedelta(days=3)),
+                        "actual_balance": "900.00",
+                    },
+                    {
+                        "account_id": 999999,
+                        "reconciliation_date": str(date.today()),
+                        "actual_balance": "1.00",
+                    },
+                    {
+                        "account_id": savings.id,
+                        "reconciliation_date": str(date.today()),
+                        "actual_balance": "200.00",
+                    },
+                    {
+                        "account_id": test_account.id,
+                        "reconciliation_date": str(date.today()),
+                        "actual_balance": "900.00",
+                        "create_adjustment": False,
+                    },
+                ]
+            },
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created_count"] == 3
+        assert data["error_count"] == 1
+        assert [r["row"] for r in data["results"]] == [1, 2, 3, 4]
+
+        first, missing, matched, later = data["results"]
+        assert "not found" in missing["error"].lower()
+        assert missing["reconciliation"] is None
+
+        assert Decimal(first["reconciliation"]["expected_balance"]) == Decimal("1000.00")
+        adjustment_id = first["reconciliation"]["adjustment_transaction_id"]
+        assert adjustment_id is not None
+
+        assert Decimal(matched["reconciliation"]["difference"]) == Decimal("0.00")
+        assert matched["reconciliation"]["adjustment_transaction_id"] is None
+
+        # The later row of the same account includes the first row's adjustment
+        adjustment = await test_db.get(ScheduledTransaction, adjustment_id)
+        assert Decimal(later["reconciliation"]["expected_balance"]) == (
+            Decimal("1000.00") + adjustment.amount
+        )
+        assert later["reconciliation"]["adjustment_transaction_id"] is None
+
+    async def test_bulk_csv_import(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+    ):
+        """Test CSV rows resolve accounts by ID or name and report bad lines."""
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        today = date.today()
+        content = (
+            "Account,Date,Balance,Note\n"
+            f"{test_account.id},{today},1000.00,by id\n"
+            f'test checking,{today},"1,000.00",by name\n'
+            f"Nope,{today},5.00,\n"
+            f"{test_account.id},yesterday,5.00,\n"
+            "\n"
+            f"{test_account.id},{today},abc,\n"
+        )
+        response = await client.post(
+            "/api/v1/reconciliations/bulk/csv?create_adjustment=false",
+            headers=headers,
+            files={"file": ("statement.csv", content.encode(), "text/csv")},
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created_count"] == 2
+        assert data["error_count"] == 3
+
+        results = {r["row"]: r for r in data["results"]}
+        assert results[2]["reconciliation"]["note"] == "by id"
+        assert results[3]["reconciliation"]["account_id"] == test_account.id
+        assert Decimal(results[3]["reconciliation"]["difference"]) == Decimal("0.00")
+        assert "not found" in results[4]["error"]
+        assert "Invalid date" in results[5]["error"]
+        assert "Invalid balance" in results[7]["error"]
+
+    async def test_bulk_all_rows_rejected(
+        self, client: AsyncClient, test_user: User, test_account: Account
+    ):
+        """Test a batch in which no row is created answers 422 with the row errors."""
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        response = await client.post(
+            "/api/v1/reconciliations/bulk",
+            headers=headers,
+            json={
+                "items": [
+                    {
+                        "account_id": 999999,
+                        "reconciliation_date": str(date.today()),
+                        "actual_balance": "1.00",
+                    }
+                ]
+            },
+        )
+        assert response.status_code == 422
+        assert response.json()["created_count"] == 0
+        assert "not found" in response.json()["results"][0]["error"].lower()
+
+        response = await client.post(
+            "/api/v1/reconciliations/bulk/csv",
+            headers=headers,
+            files={"file": ("statement.csv", b"account,date,balance\nNope,2025-01-01,5\n")},
+        )
+        assert response.status_code == 422
+        assert response.json()["error_count"] == 1
+
+    async def test_bulk_csv_missing_columns(
+        self, client: AsyncClient, test_user: User, test_account: Account
+    ):
+        """Test a CSV without the required columns is rejected."""
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        response = await client.post(
+            "/api/v1/reconciliations/bulk/csv",
+            headers=headers,
+            files={"file": ("statement.csv", b"account,amount\n1,2\n", "text/csv")},
+        )
+
+        assert response.status_code == 400
+        assert "date, balance" in response.json()["detail"]
+
+
 class TestListReconciliations:
     """Tests for GET /api/v1/reconciliations/."""
 
@@ -301,6 +634,172 @@ class TestListReconciliations:
         assert "reconciliation" in data[0]
         assert "has_adjustment" in data[0]
 
+    async def test_list_paginated_and_filtered(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_db: AsyncSession,
+    ):
+        """Test keyset pages cover every row once, and filters narrow the rows."""
+        today = date.today()
+        # Two rows share each date, so the ID breaks ties between pages
+        test_db.add_all(
+            [
+                AccountReconciliation(
+                    user_id=test_user.id,
+                    account_id=test_account.id,
+                    reconciliation_date=today - timedelta(days=i // 2),
+                    expected_balance=Decimal("1000.00"),
+                    actual_balance=Decimal("1000.00"),
+                    difference=Decimal("0.00"),
+                )
+                for i in range(7)
+            ]
+        )
+        await test_db.commit()
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        seen = []
+        cursor = None
+        for _ in range(4):
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/api/v1/reconciliations/", headers=headers, params=params)
+            assert response.status_code == 200
+            seen.extend(r["reconciliation"] for r in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert len(seen) == 7
+        assert len({r["id"] for r in seen}) == 7
+        keys = [(r["reconciliation_date"], r["id"]) for r in seen]
+        assert keys == sorted(keys, reverse=True)
+        assert all(r["account_id"] == test_account.id for r in seen)
+
+        response = await client.get(
+            "/api/v1/reconciliations/",
+            headers=headers,
+            params={
+                "from_date": str(today - timedelta(days=1)),
+                "to_date": str(today),
+                "has_adjustment": "false",
+            },
+        )
+        assert response.status_code == 200
+        assert len(response.json()) == 4
+        assert "X-Next-Cursor" not in response.headers
+
+        # Unpaginated unless asked for
+        response = await client.get("/api/v1/reconciliations/", headers=headers)
+        assert len(response.json()) == 7
+        assert "X-Next-Cursor" not in response.headers
+
+        response = await client.get(
+            "/api/v1/reconciliations/", headers=headers, params={"has_adjustment": "true"}
+        )
+        assert response.json() == []
+
+        response = await client.get(
+            "/api/v1/reconciliations/", headers=headers, params={"cursor": "not-a-cursor"}
+        )
+        assert response.status_code == 400
+
+
+class TestReconciliationDrift:
+    """Tests for GET /api/v1/reconciliations/analytics/drift."""
+
+    async def test_drift_tracks_creates_and_deletes(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_db: AsyncSession,
+    ):
+        """Test the running statistics match the reconciliations as they change."""
+        today = date.today()
+        account = Account(
+            user_id=test_user.id,
+            name="Drifting",
+            type=AccountType.CHECKING,
+            currency="USD",
+            initial_balance=Decimal("1000.00"),
+            initial_balance_date=today - timedelta(days=150),
+        )
+        test_db.add(account)
+        await test_db.commit()
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        actuals = ["1010.00", "1025.50", "990.00", "1100.00", "1040.00"]
+        response = await client.post(
+            "/api/v1/reconciliations/bulk",
+            headers=headers,
+            json={
+                "items": [
+                    {
+                        "account_id": account.id,
+                        "reconciliation_date": str(today - timedelta(days=120 - 25 * i)),
+                        "actual_balance": actual,
+                        "create_adjustment": False,
+                    }
+                    for i, actual in enumerate(actuals)
+                ]
+            },
+        )
+        assert response.status_code == 201
+        created = [r["reconciliation"] for r in response.json()["results"]]
+
+        async def check(rows: list[dict]) -> dict:
+            differences = [Decimal(r["difference"]) for r in rows]
+            response = await client.get("/api/v1/reconciliations/analytics/drift", headers=headers)
+            assert response.status_code == 200
+            (drift,) = response.json()
+            assert drift["account_id"] == account.id
+            assert drift["count"] == len(rows)
+            mean = sum(differences) / len(differences)
+            assert Decimal(drift["mean_difference"]) == mean.quantize(Decimal("0.01"))
+            variance = sum((d - mean) ** 2 for d in differences) / (len(differences) - 1)
+            assert Decimal(drift["stddev_difference"]) == variance.sqrt().quantize(Decimal("0.01"))
+            assert Decimal(drift["min_difference"]) == min(differences)
+            assert Decimal(drift["max_difference"]) == max(differences)
+            worst = drift["worst_months"][0]
+            assert Decimal(worst["max_abs_difference"]) == max(abs(d) for d in differences)
+            assert drift["trend_per_month"] is not None
+            return drift
+
+        await check(created)
+
+        # Deleting the largest difference must rescan that month's max
+        largest = max(created, key=lambda r: Decimal(r["difference"]))
+        response = await client.delete(f"/api/v1/reconciliations/{largest['id']}", headers=headers)
+        assert response.status_code == 204
+        remaining = [r for r in created if r["id"] != largest["id"]]
+        await check(remaining)
+
+        # Date filter narrows to whole months
+        month_start = date.fromisoformat(remaining[-1]["reconciliation_date"]).replace(day=1)
+        response = await client.get(
+            "/api/v1/reconciliations/analytics/drift",
+            headers=headers,
+            params={"from_date": str(month_start + timedelta(days=3)), "worst_months": 1},
+        )
+        (drift,) = response.json()
+        assert drift["count"] == sum(
+            1 for r in remaining if r["reconciliation_date"] >= str(month_start)
+        )
+        assert len(drift["worst_months"]) == 1
+
 
 class TestGetReconciliation:
     """Tests for GET /api/v1/reconciliations/{id}."""
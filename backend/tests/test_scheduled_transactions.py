@@ -1,16 +1,25 @@
 """Tests for scheduled transaction endpoints."""
 
-from datetime import date
+import io
+import random
+from datetime import date, timedelta
+from decimal import Decimal
 
 import pytest_asyncio
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.account import Account
 from app.models.category import Category
 from app.models.scheduled_transaction import ScheduledTransaction, ScheduledTransactionException
 from app.models.user import User
+from app.services import import_parsers
+from app.services.data_version_service import DataVersionService
+from app.services.exception_compaction_service import ExceptionCompactionService
+from app.services.next_occurrence_service import NextOccurrenceService
+from app.services.recurrence_service import RecurrenceService
+from app.services.rule_index_service import RuleIndexCache, RuleIntervalIndex
 
 
 @pytest_asyncio.fixture
@@ -254,6 +263,332 @@ class TestCreateScheduledTransaction:
         assert response.status_code == 422
 
 
+class TestBatchScheduledTransactions:
+    """Tests for POST /api/v1/scheduled-transactions/batch."""
+
+    async def test_batch_partial_failure(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test valid operations commit together, invalid ones are reported per item."""
+        savings = Account(
+            user_id=test_user.id,
+            name="Savings",
+            type="savings",
+            currency="USD",
+            initial_balance=0,
+            initial_balance_date=date.today(),
+        )
+        existing, doomed = (
+            ScheduledTransaction(
+                user_id=test_user.id,
+                account_id=test_account.id,
+                category_id=test_category.id,
+                name=name,
+                amount=-10.00,
+                currency="USD",
+                recurrence_start_date=date(2025, 1, 1),
+            )
+            for name in ("Existing", "Doomed")
+        )
+        test_db.add_all([savings, existing, doomed])
+        await test_db.commit()
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        def rule(name: str, account_id: int, **extra) -> dict:
+            return {
+                "name": name,
+                "amount": "25.00",
+                "currency": "usd",
+                "account_id": account_id,
+                "category_id": test_category.id,
+                "is_recurring": True,
+                "recurrence_frequency": "MONTHLY",
+                "recurrence_day_of_month": 5,
+                "recurrence_start_date": "2025-01-05",
+                **extra,
+            }
+
+        response = await client.post(
+            "/api/v1/scheduled-transactions/batch",
+            headers=headers,
+            json={
+                "operations": [
+                    # Transfer pair linking both ways
+                    {
+                        "op": "create",
+                        "ref": "out",
+                        "link_ref": "in",
+                        "data": rule("Out", test_account.id, to_account_id=savings.id),
+                    },
+                    {
+                        "op": "create",
+                        "ref": "in",
+                        "link_ref": "out",
+                        "data": rule("In", savings.id),
+                    },
+                    {"op": "create", "data": rule("Bad account", 999999)},
+                    # Fails because its link target failed
+                    {
+                        "op": "create",
+                        "ref": "orphan",
+                        "link_ref": "missing",
+                        "data": rule("Orphan", test_account.id),
+                    },
+                    {"op": "update", "id": existing.id, "data": {"name": "Renamed"}},
+                    {"op": "update", "id": 999999, "data": {"name": "Nobody"}},
+                    {"op": "delete", "id": doomed.id},
+                    {"op": "delete", "id": doomed.id},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["applied_count"] == 4
+        assert body["error_count"] == 4
+
+        results = body["results"]
+        assert [r["error"] is None for r in results] == [
+            True,
+            True,
+            False,
+            False,
+            True,
+            False,
+            True,
+            False,
+        ]
+        assert results[2]["error"] == "Account not found"
+        assert results[3]["error"] == "Linked ref not created: missing"
+        assert results[4]["transaction"]["name"] == "Renamed"
+
+        out_tx, in_tx = results[0]["transaction"], results[1]["transaction"]
+        assert out_tx["amount"] == "-25.00"  # Expense category
+        assert out_tx["currency"] == "USD"
+        assert out_tx["linked_transaction_id"] == in_tx["id"]
+        assert in_tx["linked_transaction_id"] == out_tx["id"]
+
+        result = await test_db.execute(
+            select(ScheduledTransaction.name)
+            .where(ScheduledTransaction.user_id == test_user.id)
+            .order_by(ScheduledTransaction.name)
+        )
+        assert list(result.scalars().all()) == ["In", "Out", "Renamed"]
+
+    async def test_batch_delete_cascades_to_linked_update(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test deleting a rule linked to an updated one reports the update as not applied."""
+        source, destination, other = (
+            ScheduledTransaction(
+                user_id=test_user.id,
+                account_id=test_account.id,
+                category_id=test_category.id,
+                name=name,
+                amount=-10.00,
+                currency="USD",
+                recurrence_start_date=date(2025, 1, 1),
+            )
+            for name in ("Source", "Destination", "Other")
+        )
+        test_db.add_all([source, destination, other])
+        await test_db.flush()
+        destination.linked_transaction_id = source.id
+        await test_db.commit()
+        source_id, destination_id, other_id = source.id, destination.id, other.id
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        response = await client.post(
+            "/api/v1/scheduled-transactions/batch",
+            headers=headers,
+            json={
+                "operations": [
+                    {"op": "update", "id": source_id, "data": {"name": "Renamed"}},
+                    {"op": "update", "id": other_id, "data": {"name": "Kept"}},
+                    {"op": "delete", "id": destination_id},
+                    {"op": "update", "id": source_id, "data": {"name": "Too late"}},
+                ]
+            },
+        )
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0]["error"] == "Scheduled transaction deleted by a later operation"
+        assert results[1]["transaction"]["name"] == "Kept"
+        assert results[2]["error"] is None
+        assert results[2]["deleted_ids"] == sorted([source_id, destination_id])
+        assert results[3]["error"] == "Scheduled transaction not found"
+
+        result = await test_db.execute(
+            select(ScheduledTransaction.name).where(ScheduledTransaction.user_id == test_user.id)
+        )
+        assert list(result.scalars().all()) == ["Kept"]
+
+
+class TestImportTransactions:
+    """Tests for POST /api/v1/scheduled-transactions/import."""
+
+    async def test_import_csv_detects_recurring(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test regular series become rules, one-offs stay, and bad rows are reported."""
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        content = (
+            "Date,Description,Amount,Category\n"
+            + "".join(
+                f'2025-{month:02d}-15,Rent,"(1,200.00)",{test_category.name}\n'
+                for month in range(1, 5)
+            )
+            + f"2025-02-03,Coffee,-4.50,{test_category.name}\n"
+            + f"2025-03-03,Coffee,-4.50,{test_category.name}\n"
+            + f"2025-13-40,Broken,-1.00,{test_category.name}\n"
+        )
+        response = await client.post(
+            f"/api/v1/scheduled-transactions/import?account_id={test_account.id}",
+            headers=headers,
+            files={"file": ("export.csv", content.encode(), "text/csv")},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["rows_read"] == 7
+        assert data["imported_count"] == 6
+        assert data["recurring_count"] == 1
+        assert data["consolidated_count"] == 4
+        assert data["error_count"] == 1
+        assert data["errors"][0]["line"] == 8
+
+        result = await test_db.execute(
+            select(ScheduledTransaction)
+            .where(ScheduledTransaction.user_id == test_user.id)
+            .order_by(ScheduledTransaction.recurrence_start_date)
+        )
+        transactions = result.scalars().all()
+        assert [(t.name, t.is_recurring) for t in transactions] == [
+            ("Rent", True),
+            ("Coffee", False),
+            ("Coffee", False),
+        ]
+        rent = transactions[0]
+        assert rent.amount == -1200
+        assert rent.recurrence_frequency == "MONTHLY"
+        assert rent.recurrence_day_of_month == 15
+        assert rent.recurrence_end_date == date(2025, 4, 15)
+
+    async def test_import_qif_and_unknown_format(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+    ):
+        """Test QIF records land on the named account, and unknown formats are rejected."""
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        content = (
+            "!Account\nNTest Account\nTBank\n^\n!Type:Bank\n"
+            f"D1/ 5'25\nT-12.00\nPLunch\nL{test_category.name}\n^\n"
+            "D1/ 6'25\nT-3.00\nPSnack\nL[Savings]\n^\n"
+        )
+        response = await client.post(
+            "/api/v1/scheduled-transactions/import",
+            headers=headers,
+            files={"file": ("export.qif", content.encode(), "text/plain")},
+        )
+        assert response.status_code == 200
+        assert response.json()["imported_count"] == 2
+
+        response = await client.post(
+            "/api/v1/scheduled-transactions/import",
+            headers=headers,
+            files={"file": ("export.txt", b"whatever", "text/plain")},
+        )
+        assert response.status_code == 400
+
+    async def test_import_amount_sign_follows_category(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test an expense exported with a positive amount is stored negative."""
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        content = (
+            f"Date,Description,Amount,Category\n2025-02-03,Groceries,42.10,{test_category.name}\n"
+        )
+        response = await client.post(
+            f"/api/v1/scheduled-transactions/import?account_id={test_account.id}",
+            headers=headers,
+            files={"file": ("export.csv", content.encode(), "text/csv")},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["imported_count"] == 1
+        result = await test_db.execute(
+            select(ScheduledTransaction.amount).where(ScheduledTransaction.user_id == test_user.id)
+        )
+        assert result.scalar_one() == Decimal("-42.10")
+
+    def test_ofx_read_in_chunks(self, monkeypatch):
+        """Test a single-line OFX file parses the same when read in small fixed-size chunks."""
+        monkeypatch.setattr(import_parsers, "OFX_READ_CHARS", 7)
+        content = (
+            "<OFX><BANKACCTFROM><ACCTID>Test Account</BANKACCTFROM><BANKTRANLIST>"
+            "<STMTTRN><DTPOSTED>20250105<TRNAMT>-12.00<NAME>Lunch</STMTTRN>"
+            "<STMTTRN><DTPOSTED>20250106<TRNAMT>-3.50<NAME>Snack</STMTTRN>"
+            "</BANKTRANLIST></OFX>"
+        )
+
+        chunks = list(import_parsers.read_text(io.StringIO(content), "ofx"))
+        records = list(import_parsers.parse_ofx(chunks))
+
+        assert max(len(chunk) for chunk in chunks) == 7
+        assert [(r.transaction_date, r.amount, r.description, r.account) for r in records] == [
+            (date(2025, 1, 5), Decimal("-12.00"), "Lunch", "Test Account"),
+            (date(2025, 1, 6), Decimal("-3.50"), "Snack", "Test Account"),
+        ]
+
+
 class TestGetInstances:
     """Tests for getting transaction instances (calendar expansion)."""
 
@@ -351,6 +686,63 @@ class TestGetInstances:
         ]
         assert len(transaction_instances) == 2  # Only Jan and Feb
 
+    async def test_instances_of_one_transaction(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test expanding a single transaction ignores the user's other rules."""
+        rent, other = (
+            ScheduledTransaction(
+                user_id=test_user.id,
+                account_id=test_account.id,
+                category_id=test_category.id,
+                name=name,
+                amount=100.00,
+                currency="USD",
+                is_recurring=True,
+                recurrence_frequency="MONTHLY",
+                recurrence_day_of_month=day,
+                recurrence_start_date=date(2025, 1, day),
+            )
+            for name, day in (("Rent", 1), ("Other", 10))
+        )
+        test_db.add_all([rent, other])
+        await test_db.flush()
+        test_db.add(
+            ScheduledTransactionException(
+                scheduled_transaction_id=rent.id,
+                exception_date=date(2025, 2, 1),
+                is_deleted=True,
+            )
+        )
+        await test_db.commit()
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        response = await client.get(
+            f"/api/v1/scheduled-transactions/{rent.id}/instances",
+            headers=headers,
+            params={"from_date": "2025-01-01", "to_date": "2025-04-30"},
+        )
+        assert response.status_code == 200
+        assert [i["date"] for i in response.json()] == ["2025-01-01", "2025-03-01", "2025-04-01"]
+        assert all(i["scheduled_transaction_id"] == rent.id for i in response.json())
+
+        response = await client.get(
+            "/api/v1/scheduled-transactions/999999/instances",
+            headers=headers,
+            params={"from_date": "2025-01-01", "to_date": "2025-04-30"},
+        )
+        assert response.status_code == 404
+
 
 class TestUpdateScheduledTransaction:
     """Tests for updating scheduled transactions with different modes."""
@@ -590,3 +982,501 @@ class TestDeleteScheduledTransaction:
         # Verify end_date was set
         await test_db.refresh(transaction)
         assert transaction.recurrence_end_date == date(2025, 3, 4)  # Day before instance_date
+
+
+class TestPendingConfirmations:
+    """Tests for GET /api/v1/scheduled-transactions/instances/pending-confirmation."""
+
+    async def test_pending_list_and_count(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test exceptions confirm, delete, and move instances on and off PLANNING."""
+        today = date.today()
+        start = (today - timedelta(days=150)).replace(day=1)
+        planning = Account(
+            user_id=test_user.id,
+            name="Planning",
+            type="planning",
+            currency="USD",
+            initial_balance=0,
+            initial_balance_date=start,
+        )
+        test_db.add(planning)
+        await test_db.flush()
+
+        planned, booked = (
+            ScheduledTransaction(
+                user_id=test_user.id,
+                account_id=account_id,
+                category_id=test_category.id,
+                name=name,
+                amount=-20.00,
+                currency="USD",
+                is_recurring=True,
+                recurrence_frequency="MONTHLY",
+                recurrence_day_of_month=1,
+                recurrence_start_date=start,
+            )
+            for name, account_id in (("Planned", planning.id), ("Booked", test_account.id))
+        )
+        test_db.add_all([planned, booked])
+        await test_db.flush()
+
+        dates = RecurrenceService._generate_occurrences(planned, start, today)
+        test_db.add_all(
+            [
+                # Off the pending list: confirmed, skipped, moved to a real account
+                ScheduledTransactionException(
+                    scheduled_transaction_id=planned.id,
+                    exception_date=dates[0],
+                    status="confirmed",
+                ),
+                ScheduledTransactionException(
+                    scheduled_transaction_id=planned.id,
+                    exception_date=dates[1],
+                    is_deleted=True,
+                ),
+                ScheduledTransactionException(
+                    scheduled_transaction_id=planned.id,
+                    exception_date=dates[2],
+                    account_id=test_account.id,
+                ),
+                # Onto the pending list: another rule's occurrence moved to PLANNING
+                ScheduledTransactionException(
+                    scheduled_transaction_id=booked.id,
+                    exception_date=dates[0],
+                    account_id=planning.id,
+                    note="Not sure yet",
+                ),
+            ]
+        )
+        await test_db.commit()
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        response = await client.get(
+            "/api/v1/scheduled-transactions/instances/pending-confirmation", headers=headers
+        )
+        assert response.status_code == 200
+        pending = [(i["scheduled_transaction_id"], i["date"]) for i in response.json()]
+        expected = [(booked.id, str(dates[0]))] + [(planned.id, str(d)) for d in dates[3:]]
+        assert sorted(pending) == sorted(expected)
+
+        response = await client.get(
+            "/api/v1/scheduled-transactions/instances/pending-confirmation/count",
+            headers=headers,
+        )
+        assert response.status_code == 200
+        assert response.json() == {"count": len(expected)}
+
+        # The badge is answered from the ETag until something changes
+        response = await client.get(
+            "/api/v1/scheduled-transactions/instances/pending-confirmation/count",
+            headers={**headers, "If-None-Match": response.headers["ETag"]},
+        )
+        assert response.status_code == 304
+
+
+class TestBulkConfirmInstances:
+    """Tests for PATCH /api/v1/scheduled-transactions/instances/bulk-confirm."""
+
+    async def test_bulk_confirm_past_and_specific_dates(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test existing exceptions are updated in place and missing ones created once."""
+        today = date.today()
+        start = (today - timedelta(days=200)).replace(day=1)
+        transaction = ScheduledTransaction(
+            user_id=test_user.id,
+            account_id=test_account.id,
+            category_id=test_category.id,
+            name="Monthly Bill",
+            amount=50.00,
+            currency="USD",
+            is_recurring=True,
+            recurrence_frequency="MONTHLY",
+            recurrence_day_of_month=1,
+            recurrence_start_date=start,
+        )
+        test_db.add(transaction)
+        await test_db.flush()
+        existing = ScheduledTransactionException(
+            scheduled_transaction_id=transaction.id,
+            exception_date=start,
+            note="Kept",
+        )
+        test_db.add(existing)
+        await test_db.commit()
+        past_dates = RecurrenceService._generate_occurrences(
+            transaction, today - timedelta(days=365), today
+        )
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+        response = await client.patch(
+            "/api/v1/scheduled-transactions/instances/bulk-confirm",
+            headers=headers,
+            params={
+                "scheduled_transaction_id": transaction.id,
+                "account_id": test_account.id,
+                "apply_to": "past",
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["message"] == f"Updated {len(past_dates)} past instances"
+
+        async def confirmed_exceptions() -> list[ScheduledTransactionException]:
+            result = await test_db.execute(
+                select(ScheduledTransactionException)
+                .where(ScheduledTransactionException.scheduled_transaction_id == transaction.id)
+                .order_by(ScheduledTransactionException.exception_date)
+                .execution_options(populate_existing=True)
+            )
+            exceptions = list(result.scalars().all())
+            assert all(e.status == "confirmed" for e in exceptions)
+            assert all(e.account_id == test_account.id for e in exceptions)
+            return exceptions
+
+        exceptions = await confirmed_exceptions()
+        assert [e.exception_date for e in exceptions] == sorted(past_dates)
+        assert exceptions[0].id == existing.id
+        assert exceptions[0].note == "Kept"
+
+        # Duplicated and already confirmed dates do not create rows
+        future = RecurrenceService.calculate_next_occurrence(transaction, today)
+        response = await client.patch(
+            "/api/v1/scheduled-transactions/instances/bulk-confirm",
+            headers=headers,
+            params={
+                "scheduled_transaction_id": transaction.id,
+                "account_id": test_account.id,
+                "apply_to": "specific_dates",
+                "specific_dates": [str(future), str(future), str(start)],
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["message"] == "Updated 2 instances"
+
+        exceptions = await confirmed_exceptions()
+        assert [e.exception_date for e in exceptions] == sorted(past_dates) + [future]
+
+
+class TestCompactExceptions:
+    """Tests for ExceptionCompactionService."""
+
+    async def test_compact_removes_unreachable_exceptions(
+        self,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test exceptions the rule no longer generates are deleted, others are kept."""
+        rule = ScheduledTransaction(
+            user_id=test_user.id,
+            account_id=test_account.id,
+            category_id=test_category.id,
+            name="Gym",
+            amount=-30.00,
+            currency="USD",
+            is_recurring=True,
+            recurrence_frequency="MONTHLY",
+            recurrence_day_of_month=10,
+            recurrence_start_date=date(2025, 1, 10),
+            # Ended by a THIS_AND_FUTURE split
+            recurrence_end_date=date(2025, 3, 9),
+        )
+        test_db.add(rule)
+        await test_db.flush()
+        test_db.add_all(
+            ScheduledTransactionException(
+                scheduled_transaction_id=rule.id, exception_date=exception_date, is_deleted=True
+            )
+            for exception_date in (
+                date(2025, 2, 10),  # Still an occurrence
+                date(2025, 2, 11),  # Schedule was changed since
+                date(2025, 4, 10),  # Past the end date
+            )
+        )
+        await test_db.commit()
+
+        result = await ExceptionCompactionService.compact(test_db, dry_run=True)
+        assert (result.rule_count, result.unreachable_count, result.duplicate_count) == (1, 2, 0)
+
+        result = await ExceptionCompactionService.compact(
+            test_db, user_id=test_user.id, batch_size=1
+        )
+        assert result.unreachable_count == 2
+
+        exc_result = await test_db.execute(select(ScheduledTransactionException.exception_date))
+        assert list(exc_result.scalars().all()) == [date(2025, 2, 10)]
+
+
+class TestRuleIndex:
+    """Tests for RuleIntervalIndex and RuleIndexCache."""
+
+    def test_overlapping_matches_scan(self):
+        """Test window queries return exactly the rules a full scan would."""
+        rng = random.Random(42)
+        base = date(2020, 1, 1)
+        rules = []
+        for rule_id in range(1, 301):
+            start = base + timedelta(days=rng.randrange(2000))
+            kind = rng.choice(["one-time", "ended", "open"])
+            rules.append(
+                ScheduledTransaction(
+                    id=rule_id,
+                    is_recurring=kind != "one-time",
+                    recurrence_start_date=start,
+                    recurrence_end_date=(
+                        start + timedelta(days=rng.randrange(400)) if kind == "ended" else None
+                    ),
+                )
+            )
+        index = RuleIntervalIndex(rules)
+
+        for _ in range(200):
+            from_date = base + timedelta(days=rng.randrange(-30, 2100))
+            to_date = from_date + timedelta(days=rng.choice([0, 6, 30, 365]))
+            expected = {
+                rule.id
+                for rule in rules
+                if RuleIntervalIndex.lifetime(rule)[0] <= to_date
+                and RuleIntervalIndex.lifetime(rule)[1] >= from_date
+            }
+            assert {rule.id for rule in index.overlapping(from_date, to_date)} == expected
+
+    async def test_cache_follows_data_version(
+        self,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test the index is reused until a write bumps the version, and bypassed mid-write."""
+        # Read before the rollback below expires the fixtures
+        user_id = test_user.id
+        test_db.add_all(
+            ScheduledTransaction(
+                user_id=user_id,
+                account_id=test_account.id,
+                category_id=test_category.id,
+                name=name,
+                amount=-10.00,
+                currency="USD",
+                recurrence_start_date=start,
+            )
+            for name, start in (("January", date(2025, 1, 15)), ("March", date(2025, 3, 15)))
+        )
+        await test_db.commit()
+
+        rules = await RuleIndexCache.get_rules(
+            user_id, date(2025, 1, 1), date(2025, 1, 31), test_db
+        )
+        assert [r.name for r in rules] == ["January"]
+        cached = await RuleIndexCache.get_rules(
+            user_id, date(2025, 1, 1), date(2025, 1, 31), test_db
+        )
+        assert cached[0] is rules[0]
+
+        test_db.add(
+            ScheduledTransaction(
+                user_id=user_id,
+                account_id=test_account.id,
+                category_id=test_category.id,
+                name="Also January",
+                amount=-10.00,
+                currency="USD",
+                recurrence_start_date=date(2025, 1, 20),
+            )
+        )
+        await test_db.flush()
+        await DataVersionService.bump(user_id, test_db)
+        # Not committed yet: read from the session, not from (or into) the cache
+        rules = await RuleIndexCache.get_rules(
+            user_id, date(2025, 1, 1), date(2025, 1, 31), test_db
+        )
+        assert sorted(r.name for r in rules) == ["Also January", "January"]
+
+        await test_db.rollback()
+        rules = await RuleIndexCache.get_rules(
+            user_id, date(2025, 1, 1), date(2025, 1, 31), test_db
+        )
+        assert [r.name for r in rules] == ["January"]
+
+        # A committed write makes the next read rebuild the index
+        january = await test_db.get(ScheduledTransaction, rules[0].id)
+        january.recurrence_start_date = date(2025, 2, 15)
+        await DataVersionService.bump(user_id, test_db)
+        await test_db.commit()
+        rules = await RuleIndexCache.get_rules(
+            user_id, date(2025, 1, 1), date(2025, 1, 31), test_db
+        )
+        assert rules == []
+
+
+class TestNextOccurrence:
+    """Tests for NextOccurrenceService and the upcoming instances endpoint."""
+
+    async def test_next_occurrence_set_on_write_and_refreshed(
+        self,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test the column is set on insert and update, and refresh advances passed dates."""
+        today = date.today()
+        rule = ScheduledTransaction(
+            user_id=test_user.id,
+            account_id=test_account.id,
+            category_id=test_category.id,
+            name="Gym",
+            amount=-30.00,
+            currency="USD",
+            is_recurring=True,
+            recurrence_frequency="MONTHLY",
+            recurrence_day_of_month=10,
+            recurrence_start_date=date(2025, 1, 10),
+        )
+        test_db.add(rule)
+        await test_db.commit()
+        expected = RecurrenceService.first_occurrence(rule, today)
+        assert rule.next_occurrence_date == expected >= today
+
+        rule.recurrence_end_date = today - timedelta(days=1)
+        await test_db.commit()
+        assert rule.next_occurrence_date is None
+
+        # As if the date had passed while nothing was written
+        rule.recurrence_end_date = None
+        await test_db.commit()
+        await test_db.execute(
+            update(ScheduledTransaction)
+            .where(ScheduledTransaction.id == rule.id)
+            .values(next_occurrence_date=date(2025, 1, 10))
+        )
+        await test_db.commit()
+
+        assert await NextOccurrenceService.refresh(test_db, batch_size=1) == 1
+        assert await NextOccurrenceService.refresh(test_db) == 0
+        result = await test_db.execute(
+            select(ScheduledTransaction.next_occurrence_date).where(
+                ScheduledTransaction.id == rule.id
+            )
+        )
+        assert result.scalar_one() == expected
+
+        # Written without the ORM (e.g. a Core insert): filled in unless the rule has ended
+        ended = ScheduledTransaction(
+            user_id=test_user.id,
+            account_id=test_account.id,
+            category_id=test_category.id,
+            name="Ended",
+            amount=-30.00,
+            currency="USD",
+            recurrence_start_date=today - timedelta(days=1),
+        )
+        test_db.add(ended)
+        await test_db.commit()
+        await test_db.execute(update(ScheduledTransaction).values(next_occurrence_date=None))
+        await test_db.commit()
+
+        assert await NextOccurrenceService.refresh(test_db) == 1
+        result = await test_db.execute(
+            select(ScheduledTransaction.id, ScheduledTransaction.next_occurrence_date)
+        )
+        assert dict(result.all()) == {rule.id: expected, ended.id: None}
+
+    async def test_get_upcoming_matches_all_rules(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_account: Account,
+        test_category: Category,
+        test_db: AsyncSession,
+    ):
+        """Test reading only the next rules gives the same instances as reading all of them."""
+        user_id = test_user.id
+        today = date.today()
+        rng = random.Random(7)
+        rules = []
+        for index in range(40):
+            start = today + timedelta(days=rng.randrange(-400, 200))
+            recurring = index % 4 != 0
+            rules.append(
+                ScheduledTransaction(
+                    user_id=user_id,
+                    account_id=test_account.id,
+                    category_id=test_category.id,
+                    name=f"Rule {index}",
+                    amount=-10.00,
+                    currency="USD",
+                    is_recurring=recurring,
+                    recurrence_frequency="MONTHLY" if recurring else None,
+                    recurrence_day_of_month=start.day if recurring else None,
+                    recurrence_start_date=start,
+                )
+            )
+        test_db.add_all(rules)
+        await test_db.flush()
+        # Skip the next occurrence of the earliest rules, so k has to grow
+        soonest = sorted(
+            (r for r in rules if r.next_occurrence_date is not None),
+            key=lambda r: r.next_occurrence_date,
+        )[:5]
+        test_db.add_all(
+            ScheduledTransactionException(
+                scheduled_transaction_id=rule.id,
+                exception_date=rule.next_occurrence_date,
+                is_deleted=True,
+            )
+            for rule in soonest
+        )
+        await test_db.commit()
+
+        exceptions = await RecurrenceService.fetch_exceptions(
+            [r.id for r in rules], today, date.max, test_db
+        )
+        for limit in (1, 10, 60):
+            expected = RecurrenceService.next_instances(rules, exceptions, today, limit)
+            upcoming = await NextOccurrenceService.get_upcoming(user_id, test_db, limit)
+            assert [i.date for i in upcoming] == [i.date for i in expected]
+            # Same-day instances may come in a different rule order, and be cut
+            # differently on the last day
+            last = expected[-1].date
+            assert {(i.date, i.scheduled_transaction_id) for i in upcoming if i.date < last} == {
+                (i.date, i.scheduled_transaction_id) for i in expected if i.date < last
+            }
+
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            json={"email": test_user.email, "password": "testpass123"},
+        )
+        token = login_response.json()["access_token"]
+        response = await client.get(
+            "/api/v1/scheduled-transactions/upcoming",
+            headers={"Authorization": f"Bearer {token}"},
+            params={"limit": 5, "days": 0},
+        )
+
+        assert response.status_code == 200
+        assert all(item["date"] == today.isoformat() for item in response.json())